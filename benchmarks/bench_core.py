@@ -0,0 +1,265 @@
+"""
+Measure the in-process steps of a migration and catch their regressions.
+
+Run with ``python benchmarks/bench_core.py``. The conversion of tasks, their
+parent resolution and ordering and the type mappings are timed on generated
+workspaces, along with the peak memory they allocate. ``--save`` stores the
+results as baselines and later runs fail when a step becomes slower or
+allocates more than ``--threshold`` beyond its baseline, or when its time
+per task grows more than ``--max-growth`` times from the smallest to the
+largest workspace, as a step turning quadratic would.
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from pyclickup.models import Task
+from workspace import generate_workspace
+
+from clickup_to_jira.comment import Comment
+from clickup_to_jira.converter import ClickUpToJIRAConverter
+from clickup_to_jira.handlers.clickup import ClickUpHandler
+from clickup_to_jira.handlers.jira import JIRAHandler
+from clickup_to_jira.user_directory import UserDirectory
+
+SIZES = (1_000, 10_000, 200_000)
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+ISSUE_TYPES = ("Story", "Bug", "Task", "Subtask")
+# Shorter timings are too noisy to compare
+MIN_SECONDS = 0.01
+
+
+def get_tasks(workspace):
+    """
+    Get the ClickUp tasks of a workspace as the ClickUp handler returns them.
+
+    :param Workspace workspace: The workspace
+    :return: The tasks with their comments
+    :rtype: list(Task)
+    """
+    tasks = []
+    for raw_task in workspace.tasks:
+        task = Task(raw_task)
+        task.comments = [
+            Comment(
+                id=raw_comment["id"],
+                text=raw_comment["comment_text"],
+                commenter=raw_comment["user"]["email"],
+            )
+            for raw_comment in workspace.comments[task.id]
+        ]
+        tasks.append(task)
+    return tasks
+
+
+def get_converter(workspace):
+    """
+    Get a converter resolving the mentions of a workspace without JIRA.
+
+    :param Workspace workspace: The workspace
+    :return: The converter
+    :rtype: ClickUpToJIRAConverter
+    """
+    user_directory = UserDirectory(None)
+    user_directory._account_ids.update(
+        {user["email"]: f"account-{user['id']}" for user in workspace.users}
+    )
+    return ClickUpToJIRAConverter(
+        None, SimpleNamespace(user_directory=user_directory)
+    )
+
+
+def get_jira_handler():
+    """
+    Get a JIRA handler with the issue types of a JIRA project and no
+    connection.
+
+    :return: The JIRA handler
+    :rtype: JIRAHandler
+    """
+    handler = JIRAHandler.__new__(JIRAHandler)
+    handler.issue_types = lambda: [
+        SimpleNamespace(name=name) for name in ISSUE_TYPES
+    ]
+    return handler
+
+
+def create_type_mappings(handler, tickets):
+    """
+    Create the default type mappings, as if confirmed by the user.
+
+    :param JIRAHandler handler: The JIRA handler
+    :param list(Ticket) tickets: The tickets to create
+    :return: The type mappings
+    :rtype: dict
+    """
+    with patch.object(builtins, "input", return_value="Y"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return handler.create_type_mappings(tickets)
+
+
+def get_steps(workspace):
+    """
+    Get the benchmarked steps of a workspace.
+
+    Every step is a setup, run once per measurement outside of it, and the
+    measured call taking what the setup returns.
+
+    :param Workspace workspace: The workspace
+    :return: The setup and call of every step by name
+    :rtype: dict
+    """
+    converter = get_converter(workspace)
+    jira = get_jira_handler()
+
+    def get_resolved_tasks():
+        return ClickUpHandler.add_parent_to_tasks(get_tasks(workspace))
+
+    tickets = converter.convert(get_resolved_tasks())
+    return {
+        "add_parent_to_tasks": (
+            lambda: get_tasks(workspace),
+            ClickUpHandler.add_parent_to_tasks,
+        ),
+        "get_sorted_tasks": (
+            get_resolved_tasks,
+            ClickUpHandler.get_sorted_tasks,
+        ),
+        "convert": (get_resolved_tasks, converter.convert),
+        "create_type_mappings": (
+            lambda: tickets,
+            lambda tickets: create_type_mappings(jira, tickets),
+        ),
+    }
+
+
+def measure(setup, call, repeat):
+    """
+    Measure the time and peak memory of a call.
+
+    :param callable setup: Returns the argument of the call
+    :param callable call: The measured call
+    :param int repeat: The number of timed calls, the fastest of which counts
+    :return: The seconds and the peak allocated kilobytes
+    :rtype: dict
+    """
+    seconds = min(
+        timeit.repeat(
+            "call(argument)",
+            setup="argument = setup()",
+            number=1,
+            repeat=repeat,
+            globals={"setup": setup, "call": call},
+        )
+    )
+
+    argument = setup()
+    tracemalloc.start()
+    try:
+        call(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_kb": peak / 1024}
+
+
+def get_regressions(results, baselines, threshold, max_growth):
+    """
+    Get the steps that regressed.
+
+    :param dict results: The measurements by step and size
+    :param dict baselines: The baseline measurements by step and size
+    :param float threshold: The allowed relative increase over a baseline
+    :param float max_growth: The allowed growth of the time per task from
+        the smallest to the largest workspace
+    :return: The description of every regression
+    :rtype: list(str)
+    """
+    regressions = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        for metric in ("seconds", "peak_kb"):
+            if metric == "seconds" and baseline[metric] < MIN_SECONDS:
+                continue
+            if result[metric] > baseline[metric] * (1 + threshold):
+                regressions.append(
+                    f"{key} {metric}: {result[metric]:.4g} over the "
+                    f"baseline {baseline[metric]:.4g}"
+                )
+
+    steps = {}
+    for key, result in results.items():
+        if result["seconds"] < MIN_SECONDS:
+            continue
+        step, _, size = key.rpartition("/")
+        steps.setdefault(step, []).append(
+            (int(size), result["seconds"] / int(size))
+        )
+    for step, per_task in steps.items():
+        (smallest, first), (largest, last) = min(per_task), max(per_task)
+        if smallest < largest and last > first * max_growth:
+            regressions.append(
+                f"{step} time per task grows {last / first:.1f} times "
+                f"from {smallest} to {largest} tasks"
+            )
+    return regressions
+
+
+def main():
+    """
+    Benchmark the in-process steps and compare them to their baselines.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--max-growth", type=float, default=4.0)
+    args = parser.parse_args()
+
+    results = {}
+    for size in sorted(args.sizes):
+        workspace = generate_workspace(size, depth=3, comments=1)
+        for step, (setup, call) in get_steps(workspace).items():
+            result = measure(setup, call, args.repeat)
+            results[f"{step}/{size}"] = result
+            print(
+                f"{step:<21} {size:>7} tasks: "
+                f"{result['seconds'] * 1000:9.2f} ms, "
+                f"{result['seconds'] * 1_000_000 / size:6.2f} us/task, "
+                f"peak {result['peak_kb']:10.0f} KB"
+            )
+
+    if args.save:
+        with open(args.baselines, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved the baselines to {args.baselines}")
+        return
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+    regressions = get_regressions(
+        results, baselines, args.threshold, args.max_growth
+    )
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
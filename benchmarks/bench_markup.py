@@ -0,0 +1,75 @@
+"""
+Measure the Markdown to JIRA markup conversion on large descriptions.
+
+Run with ``python benchmarks/bench_markup.py``. The time per kilobyte should
+stay flat as the descriptions grow, since the conversion is linear.
+"""
+
+import argparse
+import timeit
+
+from clickup_to_jira.markup import MarkupConverter
+
+SAMPLE = """# Release notes
+
+Some **bold** text, some *italic* text and a [link](https://example.com).
+Mentions like @user@mail.com, `inline code` and ~~stale~~ words, [WIP].
+
+- First item with __strong__ words
+  1. Nested *ordered* item
+  2. Another one with ![an image](https://example.com/image.png)
+- Second item <https://example.com>
+
+> A quoted line with _emphasis_
+
+| Name | Value |
+|------|-------|
+| **a** | 1 |
+
+```python
+def f(x):
+    return x * 2
+```
+
+---
+"""
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def get_description(size):
+    """
+    Get a Markdown description of a given size.
+
+    :param int size: The size in characters
+    :return: The description
+    :rtype: str
+    """
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+
+
+def main():
+    """
+    Time the conversion of descriptions of growing sizes.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    converter = MarkupConverter(resolve_mention=lambda user: "account-id")
+    for size in SIZES:
+        description = get_description(size)
+        seconds = min(
+            timeit.repeat(
+                lambda description=description: converter.convert(description),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(
+            f"{size // 1000:>5} KB: {seconds * 1000:8.2f} ms, "
+            f"{seconds * 1_000_000 / (size / 1000):6.1f} us/KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
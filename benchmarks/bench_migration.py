@@ -0,0 +1,185 @@
+"""
+Measure headless migrations end to end against local API stand-ins.
+
+Run with ``python benchmarks/bench_migration.py --tasks 1000 10000``. Every
+run generates a synthetic workspace, serves it through the ClickUp and JIRA
+stand-ins and runs ``migrate_to_jira`` in a child process, so its peak
+memory is measured apart from the stand-ins. Settings of the migration,
+e.g. ``JIRA_BULK_CREATE`` or ``JIRA_FOLLOW_UP_WORKERS``, are taken from the
+environment.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from stand_ins import ClickUpStandIn, JIRAStandIn
+from workspace import generate_workspace
+
+CONFIG = """[clickup]
+team = "{team}"
+space = "{space}"
+project = "{project}"
+
+[jira]
+project = "PROJ"
+
+[types]
+bug = "Bug"
+feature = "Story"
+chore = "Task"
+
+[statuses]
+"to do" = "To Do"
+"in progress" = "In Progress"
+"done" = "Done"
+"""
+MIGRATE = "from clickup_to_jira.scripts.migrate import main; main()"
+# The stand-ins announce their own budget through rate limit headers
+CLIENT_REQUESTS_PER_MINUTE = "1000000"
+
+
+def run_migration(workspace, args):
+    """
+    Migrate a workspace through fresh stand-ins.
+
+    :param Workspace workspace: The workspace to migrate
+    :param argparse.Namespace args: The benchmark options
+    :return: The measurements of the run
+    :rtype: dict
+    """
+    options = {
+        "latency": args.latency / 1000,
+        "rate_limited_share": args.rate_limited_share,
+        "retry_after": args.retry_after,
+    }
+    click_up = ClickUpStandIn(
+        workspace, rate_limit=args.clickup_rate_limit, **options
+    ).start()
+    jira = JIRAStandIn(
+        users=workspace.users, rate_limit=args.jira_rate_limit, **options
+    ).start()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, "migration.toml")
+        with open(config_path, "w") as f:
+            f.write(
+                CONFIG.format(
+                    team=workspace.team["name"],
+                    space=workspace.space["name"],
+                    project=workspace.project["name"],
+                )
+            )
+
+        env = {
+            "CLICKUP_REQUESTS_PER_MINUTE": CLIENT_REQUESTS_PER_MINUTE,
+            "JIRA_REQUESTS_PER_MINUTE": CLIENT_REQUESTS_PER_MINUTE,
+            "LOGGING_LEVEL": "WARNING",
+            **os.environ,
+            "CLICKUP_API_KEY": "stand-in",
+            "CLICKUP_API_URL": click_up.api_url,
+            "JIRA_URL": jira.url,
+            "JIRA_USER": "stand-in@example.com",
+            "JIRA_API_KEY": "stand-in",
+            "MIGRATION_CONFIG": config_path,
+        }
+        start = time.monotonic()
+        process = subprocess.Popen(
+            [sys.executable, "-c", MIGRATE],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.monotonic() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    click_up.stop()
+    jira.stop()
+    return {
+        "tasks": len(workspace.tasks),
+        "comments": sum(map(len, workspace.comments.values())),
+        "exit_code": process.returncode,
+        "seconds": seconds,
+        "tasks_per_second": len(workspace.tasks) / seconds,
+        # Linux reports the peak resident set size in kilobytes
+        "peak_rss_mb": usage.ru_maxrss / 1024,
+        "issues": len(jira.issues),
+        "clickup_calls": dict(click_up.calls),
+        "clickup_rate_limited": click_up.rate_limited,
+        "jira_calls": dict(jira.calls),
+        "jira_rate_limited": jira.rate_limited,
+    }
+
+
+def report(result):
+    """
+    Print the measurements of a run.
+
+    :param dict result: The measurements
+    """
+    print(
+        f"{result['tasks']} tasks, {result['comments']} comments: "
+        f"{result['seconds']:.1f}s, {result['tasks_per_second']:.1f} tasks/s, "
+        f"peak RSS {result['peak_rss_mb']:.0f} MB, "
+        f"{result['issues']} issues created, exit code {result['exit_code']}"
+    )
+    for api in ("clickup", "jira"):
+        calls = result[f"{api}_calls"]
+        print(
+            f"  {api}: {sum(calls.values())} calls, "
+            f"{result[f'{api}_rate_limited']} rate limited"
+        )
+        for endpoint, number in sorted(calls.items()):
+            print(f"    {endpoint:<16} {number}")
+
+
+def main():
+    """
+    Benchmark migrations of growing synthetic workspaces.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000])
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--comments", type=int, default=2)
+    parser.add_argument("--subtask-share", type=float, default=0.5)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="in milliseconds"
+    )
+    parser.add_argument(
+        "--clickup-rate-limit", type=int, help="requests per minute"
+    )
+    parser.add_argument(
+        "--jira-rate-limit", type=int, help="requests per minute"
+    )
+    parser.add_argument("--rate-limited-share", type=float, default=0.0)
+    parser.add_argument(
+        "--retry-after", type=float, default=0.1, help="in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results = []
+    for tasks in args.tasks:
+        workspace = generate_workspace(
+            tasks,
+            depth=args.depth,
+            comments=args.comments,
+            subtask_share=args.subtask_share,
+            seed=args.seed,
+        )
+        result = run_migration(workspace, args)
+        report(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
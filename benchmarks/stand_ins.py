@@ -0,0 +1,571 @@
+"""
+Serve local stand-ins of the ClickUp and JIRA APIs for the benchmarks.
+
+Only the endpoints the handlers call are served, from an in-memory
+workspace. Every server can add latency to its responses, enforce a request
+budget per window with the rate limit headers of the real API and reject a
+share of the requests with 429 to exercise the retries.
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+
+RATE_LIMITED_STATUS = 429
+PAGE_SIZE = 100
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Class responsible for passing requests to their stand-in server.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written apart, which delayed ACKs would stall
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.dispatch(self, "GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.server.dispatch(self, "POST")
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        self.server.dispatch(self, "PUT")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Class responsible for serving the routes of a stand-in API.
+
+    Subclasses list their routes as ``(method, pattern, name)`` tuples and
+    implement a ``handle_<name>`` method per route, which gets the path
+    match, the query and the decoded body and returns a status and payload.
+    """
+
+    daemon_threads = True
+    routes = ()
+
+    def __init__(
+        self,
+        latency=0.0,
+        rate_limit=None,
+        window=60.0,
+        rate_limited_share=0.0,
+        retry_after=1.0,
+        seed=0,
+    ):
+        """
+        Initialize the server on a free local port.
+
+        :param float latency: The delay of every response in seconds
+        :param int rate_limit: The requests allowed per window, if limited
+        :param float window: The rate limit window in seconds
+        :param float rate_limited_share: The share of requests rejected with
+            429 regardless of the budget
+        :param float retry_after: The ``Retry-After`` of injected 429s in
+            seconds
+        :param int seed: The seed of the 429 injection
+        """
+        super().__init__(("127.0.0.1", 0), StandInRequestHandler)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.window = window
+        self.rate_limited_share = rate_limited_share
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._window_start = time.time()
+        self._window_calls = 0
+        self._lock = threading.Lock()
+        self._routes = [
+            (method, re.compile(pattern), name)
+            for method, pattern, name in self.routes
+        ]
+
+    @property
+    def url(self):
+        """
+        Get the base URL of the server.
+
+        :return: The URL
+        :rtype: str
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Serve requests in a background thread.
+
+        :return: The server
+        :rtype: StandInServer
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving requests.
+        """
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address):
+        # Clients drop their keep-alive connections when they exit
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def dispatch(self, request, method):
+        """
+        Answer a request through its route.
+
+        :param StandInRequestHandler request: The request
+        :param str method: The HTTP method
+        """
+        url = urllib.parse.urlsplit(request.path)
+        query = urllib.parse.parse_qs(url.query)
+        length = int(request.headers.get("Content-Length") or 0)
+        raw_body = request.rfile.read(length) if length else b""
+        if self.latency:
+            time.sleep(self.latency)
+
+        for route_method, pattern, name in self._routes:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match:
+                break
+        else:
+            with self._lock:
+                self.calls[f"{method} unknown"] += 1
+            self._respond(request, 404, {"error": f"No route {url.path}"})
+            return
+
+        headers, retry_after = self._admit()
+        with self._lock:
+            self.calls[name] += 1
+            if retry_after is not None:
+                self.rate_limited += 1
+        if retry_after is not None:
+            headers["Retry-After"] = f"{retry_after:.3f}"
+            self._respond(request, RATE_LIMITED_STATUS, {}, headers)
+            return
+
+        body = None
+        if raw_body and raw_body.lstrip()[:1] in (b"{", b"["):
+            body = json.loads(raw_body)
+        status, payload = getattr(self, f"handle_{name}")(match, query, body)
+        self._respond(request, status, payload, headers)
+
+    def _admit(self):
+        """
+        Count a request against the rate limit.
+
+        :return: The rate limit headers, and the delay to retry after if
+            the request is rejected
+        :rtype: tuple
+        """
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._window_calls = 0
+            reset = self._window_start + self.window
+            self._window_calls += 1
+            calls = self._window_calls
+            injected = self._random.random() < self.rate_limited_share
+
+        if self.rate_limit is None:
+            headers = {}
+            over_budget = False
+        else:
+            remaining = max(0, self.rate_limit - calls)
+            headers = self.get_rate_limit_headers(remaining, reset)
+            over_budget = calls > self.rate_limit
+
+        if over_budget:
+            return headers, max(0.0, reset - now)
+        if injected:
+            return headers, self.retry_after
+        return headers, None
+
+    def get_rate_limit_headers(self, remaining, reset):
+        """
+        Get the rate limit headers of a response, with the reset in epoch
+        seconds like ClickUp sends it.
+
+        :param int remaining: The requests left in the window
+        :param float reset: The POSIX time the window resets
+        :return: The headers
+        :rtype: dict
+        """
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(reset)),
+        }
+
+    @staticmethod
+    def _respond(request, status, payload, headers=None):
+        """
+        Send a JSON response.
+
+        :param StandInRequestHandler request: The request
+        :param int status: The status code
+        :param payload: The JSON serializable payload
+        :param dict headers: The extra headers
+        """
+        data = b"" if payload is None else json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(data)
+
+
+class ClickUpStandIn(StandInServer):
+    """
+    Class responsible for serving a workspace through the ClickUp API v1 and
+    v2 endpoints the ClickUp handler calls.
+    """
+
+    routes = (
+        ("GET", r"/api/v1/team", "team"),
+        ("GET", r"/api/v1/team/[^/]+/space", "spaces"),
+        ("GET", r"/api/v1/space/[^/]+/project", "projects"),
+        ("GET", r"/api/v1/team/[^/]+/task", "tasks"),
+        ("GET", r"/api/v2/task/(?P<task_id>[^/]+)/comment/?", "comments"),
+        ("GET", r"/api/v2/task/(?P<task_id>[^/]+)", "task"),
+        ("GET", r"/api/v2/space/[^/]+/tag", "tags"),
+    )
+
+    def __init__(self, workspace, **kwargs):
+        """
+        Initialize the server.
+
+        :param Workspace workspace: The workspace to serve
+        """
+        super().__init__(**kwargs)
+        self.workspace = workspace
+        self._tasks = {task["id"]: task for task in workspace.tasks}
+
+    @property
+    def api_url(self):
+        """
+        Get the base URL of the API v1.
+
+        :return: The URL
+        :rtype: str
+        """
+        return f"{self.url}/api/v1/"
+
+    def handle_team(self, match, query, body):
+        return 200, {"teams": [self.workspace.team]}
+
+    def handle_spaces(self, match, query, body):
+        return 200, {"spaces": [self.workspace.space]}
+
+    def handle_projects(self, match, query, body):
+        return 200, {"projects": [self.workspace.project]}
+
+    def handle_tasks(self, match, query, body):
+        page = int(query.get("page", ["0"])[0])
+        since = int(query.get("date_updated_gt", ["0"])[0])
+        tasks = self.workspace.tasks
+        if since:
+            tasks = [
+                task for task in tasks if int(task["date_updated"]) > since
+            ]
+        return 200, {"tasks": tasks[page * PAGE_SIZE : (page + 1) * PAGE_SIZE]}
+
+    def handle_comments(self, match, query, body):
+        return 200, {
+            "comments": self.workspace.comments.get(match.group("task_id"), [])
+        }
+
+    def handle_task(self, match, query, body):
+        task = self._tasks.get(match.group("task_id"))
+        if task is None:
+            return 404, {"err": "Task not found"}
+        return 200, {**task, "attachments": []}
+
+    def handle_tags(self, match, query, body):
+        return 200, {"tags": [{"name": tag} for tag in self.workspace.tags]}
+
+
+class JIRAStandIn(StandInServer):
+    """
+    Class responsible for serving a JIRA project through the REST endpoints
+    the JIRA handler calls.
+
+    Issues are kept in memory and follow a To Do, In Progress and Done
+    workflow.
+    """
+
+    statuses = ("To Do", "In Progress", "Done")
+    issue_types = ("Story", "Bug", "Task", "Subtask")
+    transitions = {
+        "To Do": (("11", "In Progress"), ("31", "Done")),
+        "In Progress": (("21", "Done"), ("41", "To Do")),
+        "Done": (("51", "To Do"),),
+    }
+    routes = (
+        ("GET", r"/rest/api/\w+/serverInfo", "server_info"),
+        ("GET", r"/rest/api/\w+/myself", "myself"),
+        ("GET", r"/rest/api/\w+/project", "projects"),
+        ("GET", r"/rest/api/\w+/issuetype", "issue_types"),
+        ("GET", r"/rest/api/\w+/status", "statuses"),
+        ("GET", r"/rest/api/\w+/field", "fields"),
+        ("GET", r"/rest/api/\w+/search", "search"),
+        ("POST", r"/rest/api/\w+/search", "search"),
+        ("GET", r"/rest/api/\w+/users?/search", "users"),
+        ("GET", r"/rest/api/\w+/issue/createmeta", "createmeta"),
+        ("POST", r"/rest/api/\w+/issue", "create"),
+        ("POST", r"/rest/api/\w+/issue/bulk", "bulk_create"),
+        ("GET", r"/rest/api/\w+/issue/(?P<key>[^/]+)", "issue"),
+        ("PUT", r"/rest/api/\w+/issue/(?P<key>[^/]+)", "update"),
+        ("PUT", r"/rest/api/\w+/issue/(?P<key>[^/]+)/assignee", "assign"),
+        (
+            "GET",
+            r"/rest/api/\w+/issue/(?P<key>[^/]+)/transitions",
+            "transitions",
+        ),
+        (
+            "POST",
+            r"/rest/api/\w+/issue/(?P<key>[^/]+)/transitions",
+            "transition",
+        ),
+        ("POST", r"/rest/api/\w+/issue/(?P<key>[^/]+)/comment", "comment"),
+        ("POST", r"/rest/api/\w+/issue/(?P<key>[^/]+)/remotelink", "link"),
+        (
+            "POST",
+            r"/rest/api/\w+/issue/(?P<key>[^/]+)/attachments",
+            "attachment",
+        ),
+    )
+
+    def __init__(self, project="PROJ", users=(), **kwargs):
+        """
+        Initialize the server.
+
+        :param str project: The key of the served project
+        :param list(dict) users: The ClickUp users, which exist in JIRA with
+            the same email
+        """
+        super().__init__(**kwargs)
+        self.project = project
+        self.users = {user["email"]: f"account-{user['id']}" for user in users}
+        self.issues = {}
+        self._summaries = {}
+        self._ids = count(10000)
+        self._issues_lock = threading.Lock()
+
+    def get_rate_limit_headers(self, remaining, reset):
+        # JIRA sends the reset as an ISO 8601 timestamp
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": datetime.fromtimestamp(
+                reset, tz=timezone.utc
+            ).isoformat(),
+        }
+
+    def _get_issue(self, issue):
+        """
+        Get the JSON representation of an issue.
+
+        :param dict issue: The stored issue
+        :return: The issue as returned by JIRA
+        :rtype: dict
+        """
+        return {
+            "id": issue["id"],
+            "key": issue["key"],
+            "self": f"{self.url}/rest/api/2/issue/{issue['id']}",
+            "fields": {
+                "summary": issue["summary"],
+                "status": {"name": issue["status"]},
+                "issuetype": {"name": issue["type"]},
+                "parent": (
+                    {"key": issue["parent"]} if issue["parent"] else None
+                ),
+            },
+        }
+
+    def _create(self, fields):
+        """
+        Store a new issue.
+
+        :param dict fields: The fields of the issue
+        :return: The created issue
+        :rtype: dict
+        """
+        with self._issues_lock:
+            issue_id = str(next(self._ids))
+            issue = {
+                "id": issue_id,
+                "key": f"{self.project}-{issue_id}",
+                "summary": fields.get("summary"),
+                "type": fields.get("issuetype", {}).get("name"),
+                "parent": (fields.get("parent") or {}).get("key"),
+                "status": self.statuses[0],
+            }
+            self.issues[issue["key"]] = issue
+            self._summaries.setdefault(issue["summary"], []).append(issue)
+        return {"id": issue_id, "key": issue["key"], "self": ""}
+
+    def handle_server_info(self, match, query, body):
+        return 200, {
+            "baseUrl": self.url,
+            "version": "1001.0.0",
+            "versionNumbers": [1001, 0, 0],
+            "deploymentType": "Cloud",
+            "serverTitle": "JIRA stand-in",
+        }
+
+    def handle_myself(self, match, query, body):
+        return 200, {"accountId": "account-0", "displayName": "Migrator"}
+
+    def handle_projects(self, match, query, body):
+        return 200, [{"id": "1", "key": self.project, "name": self.project}]
+
+    def handle_issue_types(self, match, query, body):
+        return 200, [
+            {"id": str(index), "name": name, "subtask": name == "Subtask"}
+            for index, name in enumerate(self.issue_types, start=1)
+        ]
+
+    def handle_createmeta(self, match, query, body):
+        fields = {"summary": {}, "description": {}, "labels": {}}
+        return 200, {
+            "projects": [
+                {
+                    "key": self.project,
+                    "issuetypes": [
+                        {"id": str(index), "name": name, "fields": fields}
+                        for index, name in enumerate(self.issue_types, start=1)
+                    ],
+                }
+            ]
+        }
+
+    def handle_statuses(self, match, query, body):
+        return 200, [
+            {"id": str(index), "name": name}
+            for index, name in enumerate(self.statuses, start=1)
+        ]
+
+    def handle_fields(self, match, query, body):
+        return 200, [
+            {"id": field, "name": field.capitalize(), "custom": False}
+            for field in ("summary", "status", "issuetype", "parent")
+        ]
+
+    def handle_search(self, match, query, body):
+        params = body or {key: values[0] for key, values in query.items()}
+        jql = params.get("jql", "")
+        start = int(params.get("startAt", 0))
+        limit = int(params.get("maxResults", 50))
+        summary = re.search(r'summary ~ "((?:[^"\\]|\\.)*)"', jql)
+        with self._issues_lock:
+            if summary:
+                text = summary.group(1).replace('\\"', '"')
+                issues = list(self._summaries.get(text, ()))
+            else:
+                issues = list(self.issues.values())
+        return 200, {
+            "startAt": start,
+            "maxResults": limit,
+            "total": len(issues),
+            "issues": [
+                self._get_issue(issue)
+                for issue in issues[start : start + limit]
+            ],
+        }
+
+    def handle_users(self, match, query, body):
+        email = (query.get("query") or query.get("username") or [None])[0]
+        if email is None:
+            start = int(query.get("startAt", ["0"])[0])
+            limit = int(query.get("maxResults", ["50"])[0])
+            users = list(self.users.items())[start : start + limit]
+        else:
+            users = [(email, self.users[email])] if email in self.users else []
+        return 200, [
+            {
+                "self": f"{self.url}/rest/api/2/user?accountId={account_id}",
+                "accountId": account_id,
+                "emailAddress": user,
+            }
+            for user, account_id in users
+        ]
+
+    def handle_create(self, match, query, body):
+        return 201, self._create(body["fields"])
+
+    def handle_bulk_create(self, match, query, body):
+        return 201, {
+            "issues": [
+                self._create(update["fields"])
+                for update in body["issueUpdates"]
+            ],
+            "errors": [],
+        }
+
+    def handle_issue(self, match, query, body):
+        issue = self.issues.get(match.group("key"))
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist"]}
+        return 200, self._get_issue(issue)
+
+    def handle_update(self, match, query, body):
+        if match.group("key") not in self.issues:
+            return 404, {"errorMessages": ["Issue does not exist"]}
+        return 204, None
+
+    def handle_assign(self, match, query, body):
+        return 204, None
+
+    def handle_transitions(self, match, query, body):
+        issue = self.issues.get(match.group("key"))
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist"]}
+        return 200, {
+            "transitions": [
+                {"id": transition_id, "name": status, "to": {"name": status}}
+                for transition_id, status in self.transitions[issue["status"]]
+            ]
+        }
+
+    def handle_transition(self, match, query, body):
+        issue = self.issues.get(match.group("key"))
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist"]}
+        targets = dict(self.transitions[issue["status"]])
+        target = targets.get(str(body["transition"]["id"]))
+        if target is None:
+            return 400, {"errorMessages": ["Transition is not available"]}
+        issue["status"] = target
+        return 204, None
+
+    def handle_comment(self, match, query, body):
+        return 201, {"id": str(next(self._ids)), "body": body["body"]}
+
+    def handle_link(self, match, query, body):
+        return 201, {"id": next(self._ids)}
+
+    def handle_attachment(self, match, query, body):
+        return 200, [{"id": str(next(self._ids))}]
@@ -0,0 +1,164 @@
+"""
+Generate synthetic ClickUp workspaces for the benchmarks.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+STATUSES = ("to do", "in progress", "done")
+TAGS = ("bug", "feature", "chore")
+DESCRIPTION = """## Context
+
+The **{name}** task of the *{tag}* kind, see [the docs](https://example.com).
+
+- First step with `code`
+- Second step mentioning @{email}
+"""
+
+
+@dataclass
+class Workspace:
+    """
+    Class responsible for hosting a synthetic ClickUp workspace
+    """
+
+    team: dict
+    space: dict
+    project: dict
+    users: list
+    tasks: list = field(default_factory=list)
+    comments: dict = field(default_factory=dict)
+
+    @property
+    def statuses(self):
+        """
+        Get the statuses of the tasks.
+
+        :return: The status names
+        :rtype: tuple(str)
+        """
+        return STATUSES
+
+    @property
+    def tags(self):
+        """
+        Get the tags of the tasks.
+
+        :return: The tag names
+        :rtype: tuple(str)
+        """
+        return TAGS
+
+
+def get_user(index):
+    """
+    Get a ClickUp user.
+
+    :param int index: The user number
+    :return: The user as returned by ClickUp
+    :rtype: dict
+    """
+    return {
+        "id": index,
+        "username": f"user{index}",
+        "email": f"user{index}@example.com",
+        "color": "#000000",
+        "profilePicture": None,
+    }
+
+
+def generate_workspace(
+    tasks, depth=1, comments=2, users=50, subtask_share=0.5, seed=0
+):
+    """
+    Generate a ClickUp workspace with a single project of random tasks.
+
+    Subtasks pick a random parent among the tasks that are not yet at the
+    maximum depth, so a high depth with a high subtask share grows deep
+    trees. Every task gets between zero and twice the mean comments.
+
+    :param int tasks: The number of tasks
+    :param int depth: The maximum nesting depth of subtasks
+    :param int comments: The mean number of comments per task
+    :param int users: The number of users tasks are created by and
+        assigned to
+    :param float subtask_share: The share of tasks that are subtasks
+    :param int seed: The seed of the random generator
+    :return: The workspace
+    :rtype: Workspace
+    """
+    rng = random.Random(seed)
+    members = [get_user(index) for index in range(1, users + 1)]
+    workspace = Workspace(
+        team={"id": "1", "name": "Team", "members": []},
+        space={
+            "id": "10",
+            "name": "Space",
+            "private": False,
+            "statuses": [
+                {"status": status, "type": "custom", "orderindex": index}
+                for index, status in enumerate(STATUSES)
+            ],
+        },
+        project={
+            "id": "100",
+            "name": "Project",
+            "override_statuses": False,
+            "statuses": [],
+            "lists": [{"id": "1000", "name": "List"}],
+        },
+        users=members,
+    )
+
+    depths = {}
+    parents = []
+    for index in range(tasks):
+        task_id = f"t{index}"
+        parent = None
+        if parents and rng.random() < subtask_share:
+            parent = rng.choice(parents)
+        depths[task_id] = depths[parent] + 1 if parent else 0
+        if depths[task_id] < depth:
+            parents.append(task_id)
+
+        creator = rng.choice(members)
+        assignee = rng.choice(members)
+        tag = rng.choice(TAGS)
+        name = f"Task {index}"
+        updated = 1_600_000_000_000 + index * 1000
+        workspace.tasks.append(
+            {
+                "id": task_id,
+                "name": name,
+                "description": DESCRIPTION.format(
+                    name=name, tag=tag, email=assignee["email"]
+                ),
+                "status": {
+                    "status": rng.choice(STATUSES),
+                    "type": "custom",
+                    "orderindex": 0,
+                    "color": "#000000",
+                },
+                "tags": [{"name": tag}],
+                "creator": creator,
+                "assignees": [assignee] if rng.random() < 0.8 else [],
+                "parent": parent,
+                "linked_tasks": [],
+                "url": f"https://app.clickup.com/t/{task_id}",
+                "date_created": str(updated),
+                "date_updated": str(updated),
+                "date_closed": None,
+                "due_date": None,
+                "start_date": None,
+            }
+        )
+        workspace.comments[task_id] = [
+            {
+                "id": f"{task_id}-c{number}",
+                "comment_text": f"Comment {number} on **{name}**",
+                "user": rng.choice(members),
+                "date": str(updated),
+            }
+            for number in range(rng.randint(0, 2 * comments))
+        ]
+    return workspace
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Attachment:
+    """
+    Class responsible for hosting attachments of all JIRA and ClickUp
+    """
+
+    id: str
+    title: str
+    url: str
+    size: int = None
@@ -0,0 +1,183 @@
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import getLogger
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = getLogger(__name__)
+
+ATTACHMENT_WORKERS = 4
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 30
+
+
+class AttachmentTransfer:
+    """
+    Class responsible for moving ClickUp attachments to JIRA issues.
+
+    Files are streamed in chunks to a spool directory on disk and from there
+    into the JIRA upload, so no file is ever held in memory. Every file is
+    downloaded once while transfers of it are pending, however many tasks
+    it is attached to: attachments are matched by URL and by the SHA-256 of
+    their content. A spooled file is removed as soon as no pending transfer
+    needs it.
+    """
+
+    def __init__(self, workers=ATTACHMENT_WORKERS, timeout=TIMEOUT):
+        """
+        Initialize the transfer.
+
+        :param int workers: The number of files transferred in parallel
+        :param float timeout: The timeout of downloads in seconds
+        """
+        # ClickUp credentials are never sent to the file hosts
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="attachment"
+        )
+        self._directory = TemporaryDirectory(prefix="clickup-to-jira-")
+        self._downloads = {}
+        self._digests = {}
+        # Pending transfers by URL, and URLs sharing every spooled file
+        self._pending = Counter()
+        self._paths = {}
+        self._path_urls = Counter()
+        self._path_digests = {}
+        self._lock = Lock()
+
+    def submit(self, jira, issue, attachment):
+        """
+        Schedule the transfer of an attachment to a JIRA issue.
+
+        :param JIRA jira: The JIRA client
+        :param jira.issue issue: The JIRA issue
+        :param Attachment attachment: The ClickUp attachment
+        :return: The transfer, resolving to the JIRA attachment
+        :rtype: concurrent.futures.Future
+        """
+        with self._lock:
+            self._pending[attachment.url] += 1
+        return self._executor.submit(self.transfer, jira, issue, attachment)
+
+    def transfer(self, jira, issue, attachment):
+        """
+        Transfer an attachment to a JIRA issue.
+
+        :param JIRA jira: The JIRA client
+        :param jira.issue issue: The JIRA issue
+        :param Attachment attachment: The ClickUp attachment
+        :return: The JIRA attachment
+        :rtype: jira.resources.Attachment
+        """
+        try:
+            path = self.fetch(attachment)
+            with open(path, "rb") as f:
+                jira_attachment = jira.add_attachment(
+                    issue, f, filename=attachment.title
+                )
+        finally:
+            self._release(attachment.url)
+        logger.info(f"Attached {attachment.title} to {issue}")
+        return jira_attachment
+
+    def _release(self, url):
+        """
+        Release a transfer of a URL, removing its spooled file once no
+        pending transfer needs it.
+
+        :param str url: The URL of the transferred attachment
+        """
+        with self._lock:
+            self._pending[url] -= 1
+            if self._pending[url] > 0:
+                return
+            del self._pending[url]
+            path = self._paths.pop(url, None)
+            if path is None:
+                return
+            # The download is not reused once its file is gone
+            self._downloads.pop(url, None)
+            self._path_urls[path] -= 1
+            if self._path_urls[path] > 0:
+                return
+            del self._path_urls[path]
+            self._digests.pop(self._path_digests.pop(path), None)
+        os.remove(path)
+
+    def fetch(self, attachment):
+        """
+        Get the spooled file of an attachment, downloading it if needed.
+
+        Concurrent requests for the same URL wait for a single download.
+
+        :param Attachment attachment: The ClickUp attachment
+        :return: The path of the spooled file
+        :rtype: str
+        """
+        with self._lock:
+            download = self._downloads.get(attachment.url)
+            if download is None:
+                download = self._downloads[attachment.url] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return download.result()
+
+        try:
+            path = self._download(attachment)
+        except Exception as error:
+            # Let a later request retry the download
+            with self._lock:
+                del self._downloads[attachment.url]
+            download.set_exception(error)
+            raise
+        download.set_result(path)
+        return path
+
+    def _download(self, attachment):
+        """
+        Stream an attachment to the spool directory.
+
+        :param Attachment attachment: The ClickUp attachment
+        :return: The path of the spooled file
+        :rtype: str
+        """
+        with self.session.get(
+            attachment.url, stream=True, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            with NamedTemporaryFile(
+                dir=self._directory.name, delete=False
+            ) as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+
+        with self._lock:
+            path = self._digests.setdefault(digest.hexdigest(), f.name)
+            self._path_digests.setdefault(path, digest.hexdigest())
+            self._paths[attachment.url] = path
+            self._path_urls[path] += 1
+        if path != f.name:
+            os.remove(f.name)
+        logger.info(f"Downloaded {attachment.title}")
+        return path
+
+    def close(self):
+        """
+        Wait for scheduled transfers and remove the spooled files.
+        """
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        self._directory.cleanup()
@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    import tomli as tomllib
+
+
+class ConfigError(ValueError):
+    """
+    Raised when the migration config is invalid.
+    """
+
+
+@dataclass
+class MigrationConfig:
+    """
+    Class responsible for hosting the settings of a headless migration
+    """
+
+    team: str
+    jira_project: str
+    space: str = None
+    project: str = None
+    list: str = None
+    jira_projects: dict = field(default_factory=dict)
+    type_mappings: dict = field(default_factory=dict)
+    status_mappings: dict = field(default_factory=dict)
+    default_type: str = None
+    default_status: str = None
+
+
+def load_config(path):
+    """
+    Load a migration config from a TOML file.
+
+    The file selects the ClickUp hierarchy and the JIRA project, and maps
+    ClickUp labels and statuses, e.g.::
+
+        [clickup]
+        team = "Team"
+        space = "Space"
+        project = "Project"
+        list = "List"
+
+        [jira]
+        project = "PROJ"
+
+        [jira.projects]
+        "Space/Project" = "OTHER"
+
+        [types]
+        bug = "Bug"
+
+        [statuses]
+        "in progress" = "In Progress"
+
+        [defaults]
+        type = "Story"
+        status = "To Do"
+
+    The list and every section after ``jira`` are optional. The space and
+    project are only optional when migrating the whole team, where
+    ``jira.projects`` routes spaces, projects or lists to other JIRA projects.
+
+    :param str path: The config file
+    :return: The config
+    :rtype: MigrationConfig
+    """
+    with open(path, "rb") as f:
+        try:
+            data = tomllib.load(f)
+        except tomllib.TOMLDecodeError as error:
+            raise ConfigError(f"Cannot parse {path}: {error}") from error
+
+    clickup = data.get("clickup", {})
+    jira = data.get("jira", {})
+    defaults = data.get("defaults", {})
+    try:
+        return MigrationConfig(
+            team=clickup["team"],
+            space=clickup.get("space"),
+            project=clickup.get("project"),
+            list=clickup.get("list"),
+            jira_project=jira["project"],
+            jira_projects=dict(jira.get("projects", {})),
+            type_mappings=dict(data.get("types", {})),
+            status_mappings=dict(data.get("statuses", {})),
+            default_type=defaults.get("type"),
+            default_status=defaults.get("status"),
+        )
+    except KeyError as error:
+        raise ConfigError(f"Missing {error.args[0]} in {path}") from error
@@ -1,6 +1,9 @@
 import os
+from dataclasses import replace
 from logging import getLogger
 
+from clickup_to_jira.attachment import Attachment
+from clickup_to_jira.markup import MarkupConverter
 from clickup_to_jira.ticket import Ticket
 
 logger = getLogger(__name__)
@@ -20,6 +23,9 @@ class ClickUpToJIRAConverter:
         """
         self.click_up = click_up_handler
         self.jira = jira_handler
+        self.markup = MarkupConverter(
+            resolve_mention=self._get_mentioned_account_id
+        )
 
     def convert(self, tickets):
         """
@@ -51,6 +57,11 @@ class ClickUpToJIRAConverter:
         )
         ticket_status = ticket.status.status
         subtasks = self._get_converted_subtasks(ticket.linked_tasks)
+        attachments = []
+        if os.getenv("MIGRATION_ATTACHMENT_WORKERS"):
+            attachments = self._get_converted_attachments(
+                self.click_up.get_task_attachments(ticket)
+            )
 
         # Handle assignees
         if ticket.assignees:
@@ -69,13 +80,14 @@ class ClickUpToJIRAConverter:
             status=ticket_status,
             assignee=ticket_assignee,
             creator=ticket.creator,
-            comments=ticket.comments,
+            comments=self._get_converted_comments(ticket.comments),
             parent=ticket.parent,
             url=ticket.url,
+            parent_id=getattr(ticket, "parent_id", None),
+            attachments=attachments,
         )
 
-    @staticmethod
-    def _get_converted_description(description):
+    def _get_converted_description(self, description):
         """
         Get the converted description.
 
@@ -83,8 +95,56 @@ class ClickUpToJIRAConverter:
         :return: The edited description
         :rtype: str
         """
-        # todo Transform ClickUp Markdown to JIRA Markdown
-        return description
+        return self.markup.convert(description)
+
+    def _get_converted_comments(self, comments):
+        """
+        Get the comments with their text converted.
+
+        :param list(Comment) comments: The ClickUp comments
+        :return: The edited comments
+        :rtype: list(Comment)
+        """
+        return [
+            replace(comment, text=self.markup.convert(comment.text))
+            for comment in comments
+        ]
+
+    @staticmethod
+    def _get_converted_attachments(raw_attachments):
+        """
+        Get converted attachments.
+
+        :param list(dict) raw_attachments: The attachments as returned by
+            ClickUp
+        :return: The attachments
+        :rtype: list(Attachment)
+        """
+        return [
+            Attachment(
+                id=raw_attachment["id"],
+                title=raw_attachment.get("title") or raw_attachment["id"],
+                url=raw_attachment["url"],
+                size=raw_attachment.get("size"),
+            )
+            for raw_attachment in raw_attachments
+        ]
+
+    def _get_mentioned_account_id(self, user):
+        """
+        Get the JIRA account id of a mentioned user.
+
+        Only email addresses and usernames of ClickUp team members are
+        looked up, other words starting with an @ are kept as they are.
+
+        :param str user: The mentioned email or ClickUp username
+        :return: The account id if the user exists in JIRA
+        :rtype: str
+        """
+        email = user if "@" in user else self.click_up.get_member_email(user)
+        if email is None:
+            return None
+        return self.jira.user_directory.get_account_id(email)
 
     def _get_converted_subtasks(self, subtasks):
         """
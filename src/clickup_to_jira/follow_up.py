@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from logging import getLogger
+from threading import Lock
+
+logger = getLogger(__name__)
+
+FOLLOW_UP_STEPS = ("assign", "transition", "comments", "attachments", "link")
+
+
+@dataclass
+class FollowUpFailure:
+    """
+    Class responsible for hosting a failed follow-up step of a JIRA issue
+    """
+
+    step: str
+    issue: str
+    ticket: str
+    error: str
+
+
+@dataclass
+class FollowUpReport:
+    """
+    Class responsible for hosting the outcome of all follow-up steps
+    """
+
+    completed: int = 0
+    failures: list = field(default_factory=list)
+
+    def log(self):
+        """
+        Log the outcome of the follow-up steps.
+        """
+        logger.info(
+            f"Completed {self.completed} follow-up steps with "
+            f"{len(self.failures)} failures."
+        )
+        for failure in self.failures:
+            logger.warning(
+                f"Failed to {failure.step} {failure.issue} created from "
+                f"{failure.ticket}: {failure.error}"
+            )
+
+
+def parse_workers(config):
+    """
+    Parse the number of threads of every follow-up step type.
+
+    :param str config: Either a number of threads for every step type or
+        comma separated ``step=threads`` pairs, e.g.
+        ``assign=4,transition=2,comments=4,link=1``
+    :return: The number of threads per configured step type
+    :rtype: dict
+    """
+    if "=" not in config:
+        return {step: int(config) for step in FOLLOW_UP_STEPS}
+
+    workers = {}
+    for pair in config.split(","):
+        (step, _, threads) = pair.partition("=")
+        if step.strip() not in FOLLOW_UP_STEPS:
+            raise ValueError(f"Unknown follow-up step {step.strip()}")
+        workers[step.strip()] = int(threads)
+    return workers
+
+
+class FollowUpExecutor:
+    """
+    Class responsible for running the follow-up steps of created JIRA issues
+    in the background.
+
+    Every step type has its own thread pool, so a slow step does not hold back
+    the others, while the caller keeps creating issues.
+    """
+
+    def __init__(self, workers):
+        """
+        Initialize the executor.
+
+        :param dict workers: The number of threads per step type
+        """
+        self._executors = {
+            step: ThreadPoolExecutor(
+                max_workers=workers.get(step, 1),
+                thread_name_prefix=f"follow-up-{step}",
+            )
+            for step in FOLLOW_UP_STEPS
+        }
+        self._futures = []
+        self._lock = Lock()
+        self.report = FollowUpReport()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create an executor from a worker configuration.
+
+        :param str config: Either a number of threads for every step type or
+            comma separated ``step=threads`` pairs, e.g.
+            ``assign=4,transition=2,comments=4,link=1``
+        :return: The executor
+        :rtype: FollowUpExecutor
+        """
+        return cls(parse_workers(config))
+
+    def submit(self, step, issue, ticket, function, *args):
+        """
+        Schedule a follow-up step.
+
+        The step fails when it raises or returns False.
+
+        :param str step: The step type
+        :param jira.issue issue: The created JIRA issue
+        :param Ticket ticket: The ticket the issue was created from
+        :param callable function: The step to run
+        """
+        future = self._executors[step].submit(function, *args)
+        future.add_done_callback(
+            partial(self._record, step, str(issue), ticket.title)
+        )
+        with self._lock:
+            self._futures.append(future)
+
+    def _record(self, step, issue, ticket, future):
+        """
+        Record the outcome of a follow-up step.
+
+        :param str step: The step type
+        :param str issue: The created JIRA issue
+        :param str ticket: The title of the ticket
+        :param concurrent.futures.Future future: The finished step
+        """
+        error = future.exception()
+        if error is None and future.result() is False:
+            error = "step did not succeed"
+
+        with self._lock:
+            if error is None:
+                self.report.completed += 1
+            else:
+                self.report.failures.append(
+                    FollowUpFailure(
+                        step=step, issue=issue, ticket=ticket, error=str(error)
+                    )
+                )
+
+    def shutdown(self):
+        """
+        Wait for all scheduled steps to finish.
+
+        :return: The report of all follow-up steps
+        :rtype: FollowUpReport
+        """
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        return self.report
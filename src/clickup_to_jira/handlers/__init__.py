@@ -1,2 +1,4 @@
+from .async_clickup import AsyncClickUpHandler
+from .async_jira import AsyncJIRAHandler
 from .clickup import ClickUpHandler
 from .jira import JIRAHandler
@@ -0,0 +1,281 @@
+import asyncio
+import urllib.parse
+from contextlib import asynccontextmanager
+from logging import getLogger
+from time import monotonic
+
+from pyclickup.models import List, Task
+from pyclickup.models.error import RateLimited
+
+from clickup_to_jira.rate_limit import (
+    MAX_RATE_LIMITED_RETRIES,
+    RATE_LIMITED_STATUS,
+    SERVER_ERROR_STATUSES,
+)
+from clickup_to_jira.retry import HTTPX_TRANSPORT_ERRORS
+from clickup_to_jira.task_graph import TaskGraph
+
+logger = getLogger(__name__)
+
+PAGE_WINDOW = 4
+
+
+class AsyncClickUpHandler:
+    """
+    Class responsible for retrieving info from ClickUp concurrently.
+
+    Pages and comments are requested concurrently over one pooled connection.
+    The selection of the tasks, the credentials and the rate limiter come
+    from a :class:`ClickUpHandler`, so both share the same budget. Requires
+    the optional ``httpx`` package.
+    """
+
+    def __init__(self, click_up_handler, client=None):
+        """
+        Initialize the handler.
+
+        :param ClickUpHandler click_up_handler: The synchronous ClickUp handler
+        :param httpx.AsyncClient client: The HTTP client, created on demand
+            if not given
+        """
+        self.click_up = click_up_handler
+        self.client = client
+        self.max_connections = click_up_handler.max_connections
+        self._semaphore = None
+
+    def _create_client(self):
+        """
+        Create a pooled keep-alive HTTP client.
+
+        :return: The HTTP client
+        :rtype: httpx.AsyncClient
+        """
+        try:
+            import httpx
+        except ImportError as error:  # pragma: no cover
+            raise ImportError(
+                "The async ClickUp client requires httpx to be installed"
+            ) from error
+
+        return httpx.AsyncClient(
+            headers=self.click_up.headers,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=self.click_up.timeout,
+        )
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Open the HTTP client for the duration of a block.
+
+        A client given on initialization is left open.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        if self.client is not None:
+            yield self.client
+            return
+
+        self.client = self._create_client()
+        try:
+            yield self.client
+        finally:
+            await self.client.aclose()
+            self.client = None
+
+    async def get(self, path):
+        """
+        Perform a GET request under the shared rate budget.
+
+        Requests rejected with 429 are retried once the budget allows it.
+        Server errors, connection errors and timeouts are retried following
+        the retry policy of the ClickUp handler and count towards the circuit
+        breaker of its session.
+
+        :param str path: The path relative to the API URL, or a full URL
+        :return: The decoded response
+        :rtype: dict
+        :raises CircuitOpenError: If ClickUp failed too often
+        """
+        url = urllib.parse.urljoin(self.click_up.api_url, path)
+        retry_policy = self.click_up.retry_policy
+        circuit_breaker = self.click_up.session.get_adapter(
+            url
+        ).get_circuit_breaker(url)
+        retries = 0
+        waited = 0.0
+        start = monotonic()
+        response = None
+        try:
+            async with self._semaphore:
+                while True:
+                    circuit_breaker.before_request()
+                    delay = self.click_up.rate_limiter.reserve()
+                    waited += delay
+                    await asyncio.sleep(delay)
+                    try:
+                        response = await self.client.get(url)
+                    except HTTPX_TRANSPORT_ERRORS as error:
+                        circuit_breaker.record_failure()
+                        if not retry_policy.can_retry(retries, start):
+                            raise
+                        logger.warning(f"{error!r}. Retrying {url}")
+                        await asyncio.sleep(retry_policy.get_delay(retries))
+                        retries += 1
+                        continue
+                    self.click_up.rate_limiter.update(response)
+                    if response.status_code in SERVER_ERROR_STATUSES:
+                        circuit_breaker.record_failure()
+                    else:
+                        circuit_breaker.record_success()
+                    if response.status_code == RATE_LIMITED_STATUS:
+                        if retries >= MAX_RATE_LIMITED_RETRIES:
+                            raise RateLimited()
+                    elif (
+                        response.status_code in SERVER_ERROR_STATUSES
+                        and retry_policy.can_retry(retries, start)
+                    ):
+                        await asyncio.sleep(retry_policy.get_delay(retries))
+                    else:
+                        if response.status_code >= 500:
+                            response.raise_for_status()
+                        return response.json()
+                    retries += 1
+        finally:
+            if self.click_up.metrics is not None:
+                self.click_up.metrics.observe_request(
+                    "clickup",
+                    "GET",
+                    url,
+                    response,
+                    monotonic() - start - waited,
+                    waited=waited,
+                    retries=retries,
+                )
+
+    async def get_click_up_tickets(self):
+        """
+        Get all ClickUp tickets.
+
+        :return: The list of tickets
+        :rtype: list(Ticket)
+        """
+        logger.info("get clickup tickets")
+
+        _, container = self.click_up.select_task_container()
+        async with self.session():
+            tasks = self.click_up.get_snapshot_tasks(container)
+            if tasks is None:
+                tasks = await self.get_tasks_from_click_up(container)
+                self.click_up.put_snapshot_tasks(container, tasks)
+            tasks_with_comments = await self.add_comments_to_tasks(tasks)
+
+        graph = TaskGraph(tasks_with_comments)
+        graph.resolve_parents()
+        return graph.ordered()
+
+    async def get_tasks_from_click_up(self, container):
+        """
+        Get the tasks of a ClickUp project or list.
+
+        Pages are requested a few at a time until an empty one is found.
+
+        :param container: The ClickUp project or list
+        :return: The list of ClickUp tasks
+        :rtype: list(Task)
+        """
+        tasks = []
+        page = 0
+        while True:
+            task_pages = await asyncio.gather(
+                *(
+                    self.get_task_page(container, page + offset)
+                    for offset in range(PAGE_WINDOW)
+                )
+            )
+            for task_page in task_pages:
+                if not task_page:
+                    return tasks
+                tasks.extend(task_page)
+            page += PAGE_WINDOW
+
+    async def get_task_page(self, container, page):
+        """
+        Get a page of the tasks of a ClickUp project or list.
+
+        :param container: The ClickUp project or list
+        :param int page: The page number
+        :return: The ClickUp tasks of the page
+        :rtype: list(Task)
+        """
+        if isinstance(container, List):
+            team_id = container.project.space.team.id
+            selection = f"list_ids[]={container.id}"
+        else:
+            team_id = container.space.team.id
+            selection = f"project_ids[]={container.id}"
+
+        task_list = await self.get(
+            f"team/{team_id}/task?page={page}&{selection}"
+            f"&subtasks=true&include_closed=true"
+        )
+        if not isinstance(task_list, dict):
+            return []
+        return [
+            Task(task, client=self.click_up) for task in task_list["tasks"]
+        ]
+
+    async def add_comments_to_tasks(self, tasks):
+        """
+        Add comments, and attachments if they are transferred, to tasks.
+
+        :param list(Task) tasks: The tasks on which comments are added
+        :return: The updated tasks
+        :rtype: list(Task)
+        """
+        requests = [self.get_task_comments(task) for task in tasks]
+        # Attachments are fetched along with the comments when transferred
+        if self.click_up.fetch_attachments:
+            requests += [self.get_task_attachments(task) for task in tasks]
+        results = await asyncio.gather(*requests)
+
+        for task, comments in zip(tasks, results):
+            task.comments = comments
+        for task, raw_attachments in zip(tasks, results[len(tasks) :]):
+            task.raw_attachments = raw_attachments
+        logger.info(f"Retrieved comments for {len(tasks)} tasks")
+        return tasks
+
+    async def get_task_comments(self, task):
+        """
+        Get task comments.
+
+        :param Task task: The task whose comments are to be retrieved
+        :return: The list of task comments
+        :rtype: list(Comment)
+        """
+        raw_comment_dict = self.click_up.get_snapshot_comments(task)
+        if raw_comment_dict is None:
+            raw_comment_dict = await self.get(
+                f"{self.click_up.api_v2_url}task/{task.id}/comment/"
+            )
+            self.click_up.put_snapshot_comments(task, raw_comment_dict)
+        return self.click_up.parse_comments(raw_comment_dict)
+
+    async def get_task_attachments(self, task):
+        """
+        Get task attachments.
+
+        :param Task task: The task whose attachments are to be retrieved
+        :return: The attachments as returned by ClickUp
+        :rtype: list(dict)
+        """
+        raw_attachments = self.click_up.get_snapshot_attachments(task)
+        if raw_attachments is None:
+            raw_attachments = self.click_up.parse_attachments(
+                await self.get(f"{self.click_up.api_v2_url}task/{task.id}")
+            )
+            self.click_up.put_snapshot_attachments(task, raw_attachments)
+        return raw_attachments
@@ -0,0 +1,647 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+from logging import getLogger
+from time import monotonic
+
+from jira.exceptions import JIRAError
+from jira.resources import Issue
+
+from clickup_to_jira.handlers.jira import ITEM_STEPS, MAX_TRANSITION_HOPS
+from clickup_to_jira.rate_limit import (
+    MAX_RATE_LIMITED_RETRIES,
+    RATE_LIMITED_STATUS,
+    SERVER_ERROR_STATUSES,
+)
+from clickup_to_jira.retry import (
+    HTTPX_TRANSPORT_ERRORS,
+    IDEMPOTENT_METHODS,
+    is_transient,
+    is_unsent,
+)
+from clickup_to_jira.task_graph import TaskGraph
+
+logger = getLogger(__name__)
+
+MAX_CONNECTIONS = 10
+TIMEOUT = 30
+
+
+class AsyncJIRAHandler:
+    """
+    Class responsible for writing issues to JIRA concurrently.
+
+    Issues of the same nesting level are created concurrently over one pooled
+    connection, with the same per ticket steps as
+    :meth:`JIRAHandler.create_jira_issue`. Mappings, users, workflows and the
+    rate limiter come from a :class:`JIRAHandler`. Requires the optional
+    ``httpx`` package.
+    """
+
+    def __init__(self, jira_handler, client=None):
+        """
+        Initialize the handler.
+
+        :param JIRAHandler jira_handler: The synchronous JIRA handler
+        :param httpx.AsyncClient client: The HTTP client, created on demand
+            if not given
+        """
+        self.jira = jira_handler
+        self.client = client
+        self.max_connections = int(
+            os.getenv("JIRA_MAX_CONNECTIONS", MAX_CONNECTIONS)
+        )
+        self._semaphore = None
+        self._created = {}
+
+    def _create_client(self):
+        """
+        Create a pooled keep-alive HTTP client.
+
+        :return: The HTTP client
+        :rtype: httpx.AsyncClient
+        """
+        try:
+            import httpx
+        except ImportError as error:  # pragma: no cover
+            raise ImportError(
+                "The async JIRA writer requires httpx to be installed"
+            ) from error
+
+        return httpx.AsyncClient(
+            auth=self.jira._session.auth,
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=float(os.getenv("JIRA_TIMEOUT", TIMEOUT)),
+        )
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Open the HTTP client for the duration of a block.
+
+        A client given on initialization is left open.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        if self.client is not None:
+            yield self.client
+            return
+
+        self.client = self._create_client()
+        try:
+            yield self.client
+        finally:
+            await self.client.aclose()
+            self.client = None
+
+    async def request(self, method, path, **kwargs):
+        """
+        Perform a request to the JIRA REST API under the shared rate budget.
+
+        Requests rejected with 429 are retried once the budget allows it.
+        Server errors, lost connections and timeouts are retried following
+        the retry policy of the JIRA handler when the request is idempotent,
+        or never reached JIRA, and count towards the circuit breaker of its
+        session.
+
+        :param str method: The HTTP method
+        :param str path: The path relative to the REST API
+        :return: The decoded response, if any
+        :rtype: dict
+        :raises JIRAError: If JIRA rejects the request
+        :raises httpx.TransportError: If JIRA kept being unreachable
+        :raises CircuitOpenError: If JIRA failed too often
+        """
+        url = self.jira._get_url(path)
+        retry_policy = self.jira.retry_policy
+        circuit_breaker = self.jira._session.get_adapter(
+            url
+        ).get_circuit_breaker(url)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retries = 0
+        waited = 0.0
+        start = monotonic()
+        response = None
+        try:
+            async with self._semaphore:
+                while True:
+                    circuit_breaker.before_request()
+                    delay = self.jira.rate_limiter.reserve()
+                    waited += delay
+                    await asyncio.sleep(delay)
+                    try:
+                        response = await self.client.request(
+                            method, url, **kwargs
+                        )
+                    except HTTPX_TRANSPORT_ERRORS as error:
+                        circuit_breaker.record_failure()
+                        if not (
+                            idempotent or is_unsent(error)
+                        ) or not retry_policy.can_retry(retries, start):
+                            raise
+                        logger.warning(f"{error!r}. Retrying {url}")
+                        await asyncio.sleep(retry_policy.get_delay(retries))
+                        retries += 1
+                        continue
+                    self.jira.rate_limiter.update(response)
+                    if response.status_code in SERVER_ERROR_STATUSES:
+                        circuit_breaker.record_failure()
+                    else:
+                        circuit_breaker.record_success()
+                    if response.status_code == RATE_LIMITED_STATUS:
+                        if retries >= MAX_RATE_LIMITED_RETRIES:
+                            break
+                    elif (
+                        response.status_code in SERVER_ERROR_STATUSES
+                        and idempotent
+                        and retry_policy.can_retry(retries, start)
+                    ):
+                        await asyncio.sleep(retry_policy.get_delay(retries))
+                    else:
+                        break
+                    retries += 1
+        finally:
+            if self.jira.metrics is not None:
+                self.jira.metrics.observe_request(
+                    "jira",
+                    method,
+                    url,
+                    response,
+                    monotonic() - start - waited,
+                    waited=waited,
+                    retries=retries,
+                    body=(
+                        response.request.content
+                        if response is not None
+                        else None
+                    ),
+                )
+
+        if response.status_code >= 400:
+            raise JIRAError(
+                text=response.text,
+                status_code=response.status_code,
+                url=url,
+            )
+        return response.json() if response.content else None
+
+    @staticmethod
+    async def _run_sync(function, *args):
+        """
+        Run a blocking call of the synchronous handler in a thread.
+
+        :param callable function: The blocking call
+        :return: The outcome of the call
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(function, *args))
+
+    def _get_issue(self, raw):
+        """
+        Get an issue resource from its JSON representation.
+
+        :param dict raw: The issue as returned by JIRA
+        :return: The issue
+        :rtype: jira.issue
+        """
+        return Issue(self.jira._options, self.jira._session, raw=raw)
+
+    async def create_jira_issues(self, tickets):
+        """
+        Create JIRA issues.
+
+        Parents are created before their subtasks.
+
+        :param list(Ticket) tickets: The tickets to create
+        :return: The list of created JIRA issues
+        :rtype: list(jira.issue)
+        """
+        project = await self._run_sync(self.jira.prepare_migration, tickets)
+
+        graph = TaskGraph(tickets, parent_attribute="parent_id")
+        levels = {}
+        for ticket in graph.ordered():
+            levels.setdefault(graph.depth(ticket), []).append(ticket)
+
+        issues = []
+        async with self.session():
+            for level in sorted(levels):
+                issues.extend(
+                    await asyncio.gather(
+                        *(
+                            self.create_jira_issue(ticket, project)
+                            for ticket in levels[level]
+                        )
+                    )
+                )
+
+        await self._run_sync(self.jira.finish_migration)
+        return issues
+
+    async def create_jira_issue(self, ticket, project):
+        """
+        Create a JIRA issue.
+
+        :param Ticket ticket: The ticket to create
+        :param str project: The project id
+        :return: The new issue
+        :rtype: jira.issue
+        """
+        logger.info(f"Creating {ticket.title} in JIRA.")
+        # Resume tickets migrated by a previous run
+        issue_key = self.jira._get_migrated_issue_key(ticket)
+        if issue_key:
+            self._created[ticket.id] = issue_key
+            await self.resume_jira_issue(issue_key, ticket)
+            return
+
+        # Check issue already exists
+        try:
+            if await self.get_issue_from_summary(project, ticket.title):
+                logger.warning(f"Ticket {ticket.title} already exists.")
+                return
+        except JIRAError as e:
+            logger.warning(e)
+            return
+
+        # Create issue in JIRA
+        issue = await self.create_base_jira_issue(ticket, project)
+        if not issue:
+            logger.error(f"Cannot create issue from {ticket}.")
+            return
+
+        await self.complete_jira_issue(issue, ticket)
+        return issue
+
+    async def resume_jira_issue(self, issue_key, ticket):
+        """
+        Complete the steps a previous run did not finish for an issue.
+
+        :param str issue_key: The key of the migrated JIRA issue
+        :param Ticket ticket: The ticket the issue was created from
+        :return: The JIRA issue if any step was pending
+        :rtype: jira.issue
+        """
+        if not self.jira.has_pending_steps(ticket):
+            logger.info(f"Ticket {ticket.title} is already in {issue_key}.")
+            return None
+
+        logger.info(f"Resuming {ticket.title} in {issue_key}.")
+        issue = self._get_issue(
+            await self.request("get", f"issue/{issue_key}?fields=status")
+        )
+        await self.complete_jira_issue(issue, ticket)
+        return issue
+
+    async def get_issue_from_summary(self, project, summary):
+        """
+        Get issue from given summary.
+
+        :param str project: Project to search in
+        :param str summary: The summary string
+        :return: The JIRA issues
+        :rtype: list(jira.issue)
+        """
+        # Use the preloaded index when there is one for the project
+        summary_index = self.jira.summary_index
+        if summary_index is not None and summary_index.project == project:
+            return summary_index.get(summary)
+
+        raw = await self.request(
+            "get",
+            "search",
+            params={
+                "jql": self.jira.get_summary_jql(project, summary),
+                "fields": "summary",
+            },
+        )
+        return [
+            self._get_issue(raw_issue)
+            for raw_issue in raw["issues"]
+            if raw_issue["fields"]["summary"] == summary
+        ]
+
+    async def create_base_jira_issue(self, ticket, project):
+        """
+        Create the JIRA issue of a ticket.
+
+        :param Ticket ticket: The ticket to create
+        :param str project: The project id
+        :return: The created JIRA issue
+        :rtype: jira.issue
+        """
+        try:
+            # Handle case where issue is subtasks
+            parent_key = self._created.get(ticket.parent_id)
+            if not parent_key and ticket.parent:
+                parent_list = await self.get_issue_from_summary(
+                    project, ticket.parent
+                )
+                if parent_list:
+                    parent_key = parent_list[0].key
+
+            fields = await self._run_sync(
+                self.jira._get_issue_fields, ticket, project, parent_key
+            )
+            issue = await self.create_issue(ticket, project, fields)
+        except (JIRAError, *HTTPX_TRANSPORT_ERRORS):
+            logger.warning(f"Cannot create issue from {ticket.title}")
+            return None
+
+        self._created[ticket.id] = issue.key
+        if self.jira.summary_index is not None:
+            self.jira.summary_index.add(issue, ticket.title)
+        if self.jira.migration_state is not None:
+            self.jira.migration_state.record_issue(ticket.id, issue.key)
+        return issue
+
+    async def create_issue(self, ticket, project, fields):
+        """
+        Create a JIRA issue once, even if the response to a request is lost.
+
+        Before retrying, the issue is looked up from the label or summary of
+        its ticket, a few times as JIRA may not have indexed it yet.
+
+        :param Ticket ticket: The ticket to create
+        :param str project: The project id
+        :param dict fields: The fields of the issue
+        :return: The created JIRA issue
+        :rtype: jira.issue
+        :raises JIRAError: If JIRA rejects the issue or keeps failing
+        :raises httpx.TransportError: If JIRA kept being unreachable
+        """
+        retry_policy = self.jira.retry_policy
+        retries = 0
+        start = monotonic()
+        while True:
+            try:
+                return self._get_issue(
+                    await self.request(
+                        "post", "issue", json={"fields": fields}
+                    )
+                )
+            except (JIRAError, *HTTPX_TRANSPORT_ERRORS) as error:
+                if not is_transient(error) or not retry_policy.can_retry(
+                    retries, start
+                ):
+                    raise
+            await asyncio.sleep(retry_policy.get_delay(retries))
+            retries += 1
+            for polls in range(retry_policy.recovery_polls):
+                if polls:
+                    await asyncio.sleep(retry_policy.get_poll_delay(polls))
+                found = await self._run_sync(
+                    self.jira.find_created_issues, project, [ticket]
+                )
+                if ticket.id in found:
+                    return found[ticket.id]
+
+    async def complete_jira_issue(self, issue, ticket):
+        """
+        Assign, transition, comment, attach and link a created JIRA issue.
+
+        The steps of an issue run concurrently.
+
+        :param jira.issue issue: The created JIRA issue
+        :param Ticket ticket: The ticket the issue was created from
+        """
+        steps = [
+            ("assign", self.assign_issue_to_user, issue, ticket),
+            (
+                "transition",
+                self.transition_issue_to_proper_status,
+                issue,
+                ticket,
+            ),
+            ("comments", self.add_comments, issue, ticket),
+        ]
+        if ticket.attachments and self.jira.attachment_transfer is not None:
+            steps.append(("attachments", self.add_attachments, issue, ticket))
+        if os.getenv("JIRACLICKUPLINK"):
+            steps.append(
+                (
+                    "link",
+                    self.add_simple_link,
+                    issue,
+                    {
+                        "url": ticket.url,
+                        "title": f"ClickUp issue {ticket.title}",
+                    },
+                )
+            )
+
+        await asyncio.gather(
+            *(
+                self._run_step(ticket, step, function, *args)
+                for step, function, *args in steps
+                if not self.jira._is_step_done(ticket, step)
+            )
+        )
+
+    async def _run_step(self, ticket, step, function, *args):
+        """
+        Run a follow-up step and record it once it succeeds.
+
+        :param Ticket ticket: The ticket the issue was created from
+        :param str step: The step name
+        :param callable function: The coroutine function of the step
+        :return: The outcome of the step
+        """
+        try:
+            result = await function(*args)
+        except HTTPX_TRANSPORT_ERRORS as error:
+            # Left for a later run, without failing the other issues
+            logger.warning(f"Step {step} of {ticket.title} failed: {error!r}")
+            return False
+        if (
+            result is not False
+            and step not in ITEM_STEPS
+            and self.jira.migration_state is not None
+        ):
+            self.jira.migration_state.record_step(ticket.id, step)
+        return result
+
+    async def assign_issue_to_user(self, issue, ticket):
+        """
+        Assign JIRA issue to a user.
+
+        :param jira.issue issue: The JIRA issue
+        :param Ticket ticket: The Ticket to retrieve the assignee from
+        :return: Assignment succeeded
+        :rtype: bool
+        """
+        if not ticket.assignee:
+            return True
+
+        try:
+            user = await self._run_sync(
+                self.jira.user_directory.get_account_id, ticket.assignee
+            )
+            if not user:
+                logger.warning(f"Cannot assign {issue}. No such user")
+                return False
+            await self.request(
+                "put", f"issue/{issue.key}/assignee", json={"accountId": user}
+            )
+            logger.info(f"Assigned {issue}")
+            return True
+        except JIRAError:
+            logger.warning(f"Cannot assign {issue}")
+            return False
+
+    async def transition_issue_to_proper_status(self, issue, ticket):
+        """
+        Transition JIRA issue to the desired status.
+
+        :param jira.issue issue: The JIRA issue
+        :param Ticket ticket: The Ticket to retrieve the status from
+        :return: Transition succeeded
+        :rtype: bool
+        """
+        if not await self._run_sync(
+            self.jira.ensure_status_mapping, issue, ticket
+        ):
+            return False
+        try:
+            workflow = self.jira.get_workflow(issue, ticket)
+            if await self.move_issue_to_status(
+                issue,
+                workflow,
+                await self._get_current_status(workflow, issue),
+                self.jira.status_mappings[ticket.status],
+            ):
+                logger.info(f"Transitioned {issue}")
+                return True
+            logger.warning(f"Cannot find transitions for {issue}")
+            return False
+        except (JIRAError, KeyError):
+            logger.warning("Cannot transition issue")
+            return False
+
+    async def _get_current_status(self, workflow, issue):
+        """
+        Get the status an issue is in.
+
+        Resumed issues report their own status. Created issues come without
+        fields and are in the initial status of their workflow.
+
+        :param Workflow workflow: The workflow of the issue
+        :param jira.issue issue: The JIRA issue
+        :return: The status name
+        :rtype: str
+        """
+        try:
+            return issue.fields.status.name
+        except AttributeError:
+            pass
+        if workflow.initial_status is None:
+            raw = await self.request("get", f"issue/{issue.key}?fields=status")
+            workflow.initial_status = raw["fields"]["status"]["name"]
+        return workflow.initial_status
+
+    async def move_issue_to_status(self, issue, workflow, status, target):
+        """
+        Move an issue through the shortest transition path to a status.
+
+        :param jira.issue issue: The JIRA issue
+        :param Workflow workflow: The workflow of the issue
+        :param str status: The current status of the issue
+        :param str target: The desired status
+        :return: The issue reached the desired status
+        :rtype: bool
+        """
+        for _ in range(MAX_TRANSITION_HOPS):
+            if status == target:
+                return True
+            if not workflow.is_explored(status):
+                raw = await self.request(
+                    "get", f"issue/{issue.key}/transitions"
+                )
+                workflow.add_transitions(status, raw["transitions"])
+
+            path = workflow.shortest_path(status, target)
+            if path is None:
+                path = workflow.path_to_unexplored(status)
+            if path is None:
+                return False
+
+            for transition_id, next_status in path:
+                await self.request(
+                    "post",
+                    f"issue/{issue.key}/transitions",
+                    json={"transition": {"id": transition_id}},
+                )
+                status = next_status
+                if not workflow.is_explored(status):
+                    break
+        return status == target
+
+    async def add_comments(self, issue, ticket):
+        """
+        Add comments to JIRA Issue in their original order.
+
+        :param jira.issue issue: The issue to add comments to
+        :param Ticket ticket: The ticket to read comments from
+        :return: All comments were added
+        :rtype: bool
+        """
+        succeeded = True
+        for comment in ticket.comments:
+            # Skip comments added by a previous run
+            step = f"comment:{comment.id}"
+            if not comment.text or self.jira._is_step_done(ticket, step):
+                continue
+
+            logger.info(f"Adding {comment} in {issue}")
+            try:
+                await self.request(
+                    "post",
+                    f"issue/{issue.key}/comment",
+                    json={"body": f"{comment.commenter} said: {comment.text}"},
+                )
+            except JIRAError:
+                logger.warning(f"Failed to add {comment} in {issue}")
+                succeeded = False
+                continue
+            if self.jira.migration_state is not None:
+                self.jira.migration_state.record_step(ticket.id, step)
+        return succeeded
+
+    async def add_attachments(self, issue, ticket):
+        """
+        Add attachments to JIRA Issue.
+
+        The files are streamed by the attachment transfer of the synchronous
+        handler, whose threads keep the event loop free.
+
+        :param jira.issue issue: The issue to add attachments to
+        :param Ticket ticket: The ticket to read attachments from
+        :return: All attachments were added
+        :rtype: bool
+        """
+        return await self._run_sync(self.jira.add_attachments, issue, ticket)
+
+    async def add_simple_link(self, issue, link):
+        """
+        Add a remote link to a JIRA issue.
+
+        :param jira.issue issue: The JIRA issue
+        :param dict link: The ``url`` and ``title`` of the link
+        :return: The link was added
+        :rtype: bool
+        """
+        try:
+            await self.request(
+                "post", f"issue/{issue.key}/remotelink", json={"object": link}
+            )
+            return True
+        except JIRAError:
+            logger.warning(f"Cannot link {issue}")
+            return False
@@ -1,14 +1,37 @@
+import os
+import re
+import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from itertools import repeat
 from logging import getLogger
-from time import sleep
 
+import requests
 from pyclickup import ClickUp
+from pyclickup.models import Task
+from pyclickup.models.error import RateLimited
 
 from clickup_to_jira.comment import Comment
-from clickup_to_jira.utils import get_item_from_user_input
+from clickup_to_jira.handlers.clickup_v2 import ClickUpV2Client
+from clickup_to_jira.rate_limit import (
+    RATE_LIMITED_STATUS,
+    AdaptiveRateLimiter,
+    mount_rate_limiter,
+)
+from clickup_to_jira.retry import RetryPolicy
+from clickup_to_jira.snapshot import SnapshotCache, SnapshotMiss
+from clickup_to_jira.task_graph import TaskGraph
+from clickup_to_jira.utils import get_item_by_name, get_item_from_user_input
 
 logger = getLogger(__name__)
 
-SLEEP_PER_REQUEST = 1.1 * 60 / 100  # Rate is 100req / sec. Add 10% margin
+REQUESTS_PER_MINUTE = 100
+COMMENT_WORKERS = 4
+MAX_CONNECTIONS = 10
+TIMEOUT = 30
+# Paths of the team, space and project lookups kept in snapshots
+HIERARCHY_PATH = re.compile(r"^(team|team/[^/]+/space|space/[^/]+/project)$")
 
 
 class ClickUpHandler(ClickUp):
@@ -16,6 +39,122 @@ class ClickUpHandler(ClickUp):
     Class responsible for retrieving info from ClickUp
     """
 
+    def __init__(
+        self,
+        token,
+        *args,
+        config=None,
+        metrics=None,
+        rate_limit_share=1.0,
+        shard=None,
+        **kwargs,
+    ):
+        """
+        Initialize the handler.
+
+        :param str token: The ClickUp API key
+        :param MigrationConfig config: The config of a headless migration
+        :param MigrationMetrics metrics: The metrics recording every call
+        :param float rate_limit_share: The fraction of the rate limit to use,
+            when several processes share it
+        :param str shard: The shard migrated by the process, if any, whose
+            snapshot files are kept apart
+        """
+        if os.getenv("CLICKUP_API_URL"):
+            kwargs.setdefault("api_url", os.getenv("CLICKUP_API_URL"))
+        super().__init__(token, *args, **kwargs)
+        self.config = config
+        self.metrics = metrics
+        self.api_v2_url = self.api_url.replace("v1", "v2")
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=int(
+                os.getenv("CLICKUP_REQUESTS_PER_MINUTE", REQUESTS_PER_MINUTE)
+            )
+            / 60,
+            share=rate_limit_share,
+        )
+        self.comment_workers = int(
+            os.getenv("CLICKUP_COMMENT_WORKERS", COMMENT_WORKERS)
+        )
+        # Attachments are fetched along with the comments when transferred
+        self.fetch_attachments = bool(
+            os.getenv("MIGRATION_ATTACHMENT_WORKERS")
+        )
+        self.max_connections = int(
+            os.getenv("CLICKUP_MAX_CONNECTIONS", MAX_CONNECTIONS)
+        )
+        self.timeout = float(os.getenv("CLICKUP_TIMEOUT", TIMEOUT))
+        self.retry_policy = RetryPolicy.from_env()
+
+        # One pooled session for the v1 and v2 endpoints
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        mount_rate_limiter(
+            self.session,
+            self.rate_limiter,
+            retry_policy=self.retry_policy,
+            metrics=metrics,
+            api="clickup",
+            pool_connections=self.max_connections,
+            pool_maxsize=max(self.max_connections, self.comment_workers),
+        )
+        self.v2 = ClickUpV2Client(
+            self.session, self.api_v2_url, timeout=self.timeout
+        )
+
+        self._member_emails = None
+
+        self.snapshot = None
+        if os.getenv("CLICKUP_SNAPSHOT_DIR"):
+            max_age = os.getenv("CLICKUP_SNAPSHOT_MAX_AGE")
+            self.snapshot = SnapshotCache(
+                os.getenv("CLICKUP_SNAPSHOT_DIR"),
+                max_age=float(max_age) * 3600 if max_age else None,
+                offline=bool(os.getenv("CLICKUP_OFFLINE")),
+                shard=shard,
+            )
+
+    def _req(self, path, method="get", **kwargs):
+        """
+        Perform a request through the rate limited session.
+
+        :param str path: The path relative to the API URL
+        :param str method: The HTTP method
+        :return: The response
+        :rtype: requests.Response
+        :raises requests.HTTPError: If ClickUp kept failing
+        """
+        full_path = urllib.parse.urljoin(self.api_url, path)
+        if self.snapshot is not None and self.snapshot.offline:
+            raise SnapshotMiss(f"Cannot request {full_path} offline")
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, full_path, **kwargs)
+        if response.status_code == RATE_LIMITED_STATUS:
+            raise RateLimited()
+        # Server errors outlasting the retries must not pass for empty data
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    def get(self, path, raw=False, **kwargs):
+        """
+        Perform a GET request, replaying team, space and project lookups
+        from the snapshot if there is one.
+
+        :param str path: The path relative to the API URL
+        :param bool raw: Return the response instead of its decoded body
+        :return: The decoded response
+        :rtype: dict
+        """
+        if self.snapshot is None or raw or not HIERARCHY_PATH.match(path):
+            return super().get(path, raw=raw, **kwargs)
+
+        payload = self.snapshot.get("responses", path)
+        if payload is None:
+            payload = super().get(path, **kwargs)
+            self.snapshot.put("responses", path, payload)
+        return payload
+
     def get_click_up_tickets(self):
         """
         Get all ClickUp tickets.
@@ -27,9 +166,10 @@ class ClickUpHandler(ClickUp):
 
         tasks = self.get_tasks_from_click_up()
         tasks_with_comments = self.add_comments_to_tasks(tasks)
-        tasks_with_parent = self.add_parent_to_tasks(tasks_with_comments)
 
-        return self.get_sorted_tasks(tasks_with_parent)
+        graph = TaskGraph(tasks_with_comments)
+        graph.resolve_parents()
+        return graph.ordered()
 
     def get_tasks_from_click_up(self):
         """
@@ -38,32 +178,318 @@ class ClickUpHandler(ClickUp):
         :return: The list of ClickUp tasks
         :rtype: ClickUp(Task)
         """
+        _, container = self.select_task_container()
+        tasks = self.get_snapshot_tasks(container)
+        if tasks is None:
+            tasks = container.get_all_tasks(include_closed=True, subtasks=True)
+            self.put_snapshot_tasks(container, tasks)
+        return tasks
+
+    def get_updated_tasks(self, container, since=None):
+        """
+        Get the tasks of a ClickUp project or list updated after a time.
+
+        The tasks are always fetched from ClickUp.
+
+        :param container: The ClickUp project or list
+        :param int since: The POSIX timestamp in milliseconds, or None for
+            every task
+        :return: The list of ClickUp tasks
+        :rtype: list(Task)
+        """
+        if since is None:
+            return container.get_all_tasks(include_closed=True, subtasks=True)
+        return container.get_all_tasks(
+            include_closed=True, subtasks=True, date_updated_gt=since
+        )
+
+    @staticmethod
+    def get_updated_at(task):
+        """
+        Get when a task was last updated.
+
+        :param Task task: The ClickUp task
+        :return: The POSIX timestamp in milliseconds, if known
+        :rtype: int
+        """
+        if task.date_updated is None:
+            return None
+        # pyclickup parses timestamps to naive UTC datetimes
+        updated_at = task.date_updated.replace(tzinfo=timezone.utc)
+        return round(updated_at.timestamp() * 1000)
+
+    def get_snapshot_tasks(self, container):
+        """
+        Get the tasks of a ClickUp project or list from the snapshot.
+
+        :param container: The ClickUp project or list
+        :return: The ClickUp tasks, unless they are missing or stale
+        :rtype: list(Task)
+        """
+        raw_tasks = self._get_snapshot("tasks", container.id)
+        if raw_tasks is None:
+            return None
+        logger.info(f"Replaying {len(raw_tasks)} tasks from the snapshot")
+        return [Task(raw_task, client=self) for raw_task in raw_tasks]
+
+    def put_snapshot_tasks(self, container, tasks):
+        """
+        Add the tasks of a ClickUp project or list to the snapshot.
+
+        :param container: The ClickUp project or list
+        :param list(Task) tasks: The fetched ClickUp tasks
+        """
+        self._put_snapshot(
+            "tasks", container.id, [task._data for task in tasks]
+        )
+
+    def get_snapshot_comments(self, task):
+        """
+        Get the comments of a ClickUp task from the snapshot.
+
+        Comments fetched before the task last changed may be outdated and
+        are not replayed.
+
+        :param Task task: The ClickUp task
+        :return: The comments as returned by ClickUp, unless they are missing
+            or stale
+        :rtype: dict
+        """
+        return self._get_snapshot(
+            "comments", task.id, self.get_updated_at(task)
+        )
+
+    def put_snapshot_comments(self, task, raw_comment_dict):
+        """
+        Add the comments of a ClickUp task to the snapshot.
+
+        :param Task task: The ClickUp task
+        :param dict raw_comment_dict: The comments as returned by ClickUp
+        """
+        self._put_snapshot("comments", task.id, raw_comment_dict)
+
+    def get_snapshot_attachments(self, task):
+        """
+        Get the attachments of a ClickUp task from the snapshot.
+
+        :param Task task: The ClickUp task
+        :return: The attachments as returned by ClickUp, unless they are
+            missing or stale
+        :rtype: list(dict)
+        """
+        return self._get_snapshot(
+            "attachments", task.id, self.get_updated_at(task)
+        )
+
+    def put_snapshot_attachments(self, task, raw_attachments):
+        """
+        Add the attachments of a ClickUp task to the snapshot.
+
+        :param Task task: The ClickUp task
+        :param list(dict) raw_attachments: The attachments as returned by
+            ClickUp
+        """
+        self._put_snapshot("attachments", task.id, raw_attachments)
+
+    def _get_snapshot(self, kind, key, updated_at=None):
+        """
+        Get a payload from the snapshot if there is one.
+
+        :param str kind: The kind of payload
+        :param str key: The id the payload belongs to
+        :param int updated_at: The POSIX timestamp in milliseconds the
+            payload last changed in ClickUp, if known
+        :return: The payload, unless it is missing or stale
+        """
+        if self.snapshot is None:
+            return None
+        return self.snapshot.get(
+            kind, key, updated_at / 1000 if updated_at else None
+        )
+
+    def _put_snapshot(self, kind, key, payload):
+        """
+        Add a payload to the snapshot if there is one.
+
+        :param str kind: The kind of payload
+        :param str key: The id the payload belongs to
+        :param payload: The fetched payload
+        """
+        if self.snapshot is not None:
+            self.snapshot.put(kind, key, payload)
+
+    def close(self):
+        """
+        Release the resources of the handler.
+        """
+        # Flush the payloads kept for the next run
+        if self.snapshot is not None:
+            self.snapshot.close()
+
+    def select_task_container(self):
+        """
+        Select the ClickUp project or list to migrate.
+
+        :return: The selected space and the project or list in it
+        :rtype: tuple
+        """
+        if self.config is not None:
+            cur_team = get_item_by_name("team", self.teams, self.config.team)
+            cur_space = get_item_by_name(
+                "space", cur_team.spaces, self.config.space
+            )
+            cur_project = get_item_by_name(
+                "project", cur_space.projects, self.config.project
+            )
+            lst = None
+            if self.config.list:
+                lst = get_item_by_name(
+                    "list", cur_project.lists, self.config.list
+                )
+            return cur_space, lst or cur_project
+
         cur_team = get_item_from_user_input("team", self.teams)
         cur_space = get_item_from_user_input("space", cur_team.spaces)
         cur_project = get_item_from_user_input("project", cur_space.projects)
         lst = get_item_from_user_input(
             "list", cur_project.lists, allow_none=True
         )
+        return cur_space, lst or cur_project
+
+    def iter_tasks_from_click_up(self, container):
+        """
+        Iterate over the tasks of a ClickUp project or list page by page.
 
-        if not lst:
-            return cur_project.get_all_tasks(
-                include_closed=True, subtasks=True
+        :param container: The ClickUp project or list
+        :return: The ClickUp tasks
+        :rtype: iterator(Task)
+        """
+        snapshot_tasks = self.get_snapshot_tasks(container)
+        if snapshot_tasks is not None:
+            yield from snapshot_tasks
+            return
+
+        # Only keep every task around when they are added to a snapshot
+        fetched_tasks = [] if self.snapshot is not None else None
+        page = 0
+        while True:
+            tasks = container.get_tasks(
+                page=page, include_closed=True, subtasks=True
             )
-        else:
-            return lst.get_all_tasks(include_closed=True, subtasks=True)
+            if not tasks:
+                break
+            logger.info(f"Retrieved page {page} of tasks")
+            if fetched_tasks is not None:
+                fetched_tasks.extend(tasks)
+            yield from tasks
+            page += 1
+        if fetched_tasks is not None:
+            self.put_snapshot_tasks(container, fetched_tasks)
+
+    def iter_comments_to_tasks(self, tasks):
+        """
+        Add comments to tasks as they are iterated.
+
+        At most twice as many tasks as comment workers are fetched ahead of
+        the consumer.
+
+        :param iterator(Task) tasks: The tasks on which comments are added
+        :return: The updated tasks in their original order
+        :rtype: iterator(Task)
+        """
+        with ThreadPoolExecutor(max_workers=self.comment_workers) as executor:
+            pending = deque()
+            for task in tasks:
+                attachments_future = None
+                if self.fetch_attachments:
+                    attachments_future = executor.submit(
+                        self.get_task_attachments, task
+                    )
+                pending.append(
+                    (
+                        task,
+                        executor.submit(self.get_task_comments, task),
+                        attachments_future,
+                    )
+                )
+                if len(pending) >= 2 * self.comment_workers:
+                    yield self._set_task_comments(*pending.popleft())
+            while pending:
+                yield self._set_task_comments(*pending.popleft())
+
+    @staticmethod
+    def _set_task_comments(task, future, attachments_future=None):
+        """
+        Set the fetched comments, and attachments if any, of a task.
+
+        :param Task task: The task
+        :param concurrent.futures.Future future: The comments request
+        :param concurrent.futures.Future attachments_future: The attachments
+            request, if they are fetched
+        :return: The updated task
+        :rtype: Task
+        """
+        task.comments = future.result()
+        if attachments_future is not None:
+            task.raw_attachments = attachments_future.result()
+        logger.info(f"Retrieved comments for task {task.name}")
+        return task
+
+    def get_member_email(self, username):
+        """
+        Get the email of a member of the ClickUp teams.
+
+        :param str username: The username, in any case
+        :return: The email if the username belongs to a member
+        :rtype: str
+        """
+        if self._member_emails is None:
+            self._member_emails = {
+                member.username.casefold(): member.email
+                for team in self.teams
+                for member in team.members
+                if getattr(member, "username", None)
+            }
+        return self._member_emails.get(username.casefold())
+
+    def get_space_labels(self, space):
+        """
+        Get the labels tasks of a ClickUp space can be tagged with.
+
+        :param Space space: The ClickUp space
+        :return: The tag names, along with the empty label of untagged tasks
+        :rtype: list(str)
+        """
+        raw_tags = self._get_snapshot("tags", space.id)
+        if raw_tags is None:
+            raw_tags = self.v2.get_space_tags(space.id)
+            self._put_snapshot("tags", space.id, raw_tags)
+        if not isinstance(raw_tags, dict):
+            return [""]
+        return [tag["name"] for tag in raw_tags["tags"]] + [""]
 
     def add_comments_to_tasks(self, tasks):
         """
-        Add comments to tasks.
+        Add comments, and attachments if they are transferred, to tasks.
 
         :param list(Task) tasks: The tasks on which comments are added
         :return: The updated tasks
         :rtype: list(Task)
         """
-        for task in tasks:
-            logger.info(f"Retrieving task {task.name}")
-            sleep(SLEEP_PER_REQUEST)
-            task.comments = self.get_task_comments(task)
+        with ThreadPoolExecutor(max_workers=self.comment_workers) as executor:
+            task_comments = executor.map(self.get_task_comments, tasks)
+            task_attachments = repeat(None)
+            if self.fetch_attachments:
+                task_attachments = executor.map(
+                    self.get_task_attachments, tasks
+                )
+            for task, comments, raw_attachments in zip(
+                tasks, task_comments, task_attachments
+            ):
+                logger.info(f"Retrieved comments for task {task.name}")
+                task.comments = comments
+                if raw_attachments is not None:
+                    task.raw_attachments = raw_attachments
         return tasks
 
     @staticmethod
@@ -75,23 +501,7 @@ class ClickUpHandler(ClickUp):
         :return: The updated tasks
         :rtype: list(Task)
         """
-        for task in tasks:
-            task.parent = None
-
-        for task in tasks:
-            logger.info(f"Retrieving father for task {task.name}")
-            try:
-                task.parent = list(
-                    filter(
-                        lambda x: x.id
-                        == task.parent,  # pylint: disable=cell-var-from-loop
-                        tasks,
-                    )
-                )[0].name
-            except IndexError:
-                logger.info("Issue has no parent")
-                task.parent = None
-        return tasks
+        return TaskGraph(tasks).resolve_parents()
 
     def get_task_comments(self, task):
         """
@@ -102,10 +512,53 @@ class ClickUpHandler(ClickUp):
         :rtype: list(Comment)
         """
         # Get comments from ClickUp
-        self.api_url = self.api_url.replace("v1", "v2")
-        path = f"task/{task.id}/comment/?"
-        raw_comment_dict = self.get(path)
-        self.api_url = self.api_url.replace("v2", "v1")
+        raw_comment_dict = self.get_snapshot_comments(task)
+        if raw_comment_dict is None:
+            raw_comment_dict = self.v2.get_task_comments(task.id)
+            self.put_snapshot_comments(task, raw_comment_dict)
+        return self.parse_comments(raw_comment_dict)
+
+    def get_task_attachments(self, task):
+        """
+        Get task attachments.
+
+        Task lists come without attachments, so the task itself is fetched,
+        unless its attachments were already fetched along with its comments.
+
+        :param Task task: The task whose attachments are to be retrieved
+        :return: The attachments as returned by ClickUp
+        :rtype: list(dict)
+        """
+        raw_attachments = vars(task).get("raw_attachments")
+        if raw_attachments is None:
+            raw_attachments = self.get_snapshot_attachments(task)
+        if raw_attachments is None:
+            raw_attachments = self.parse_attachments(self.v2.get_task(task.id))
+            self.put_snapshot_attachments(task, raw_attachments)
+        return raw_attachments
+
+    @staticmethod
+    def parse_attachments(raw_task):
+        """
+        Get the attachments of a task.
+
+        :param dict raw_task: The task as returned by ClickUp
+        :return: The attachments as returned by ClickUp
+        :rtype: list(dict)
+        """
+        if not isinstance(raw_task, dict):
+            return []
+        return raw_task.get("attachments") or []
+
+    @staticmethod
+    def parse_comments(raw_comment_dict):
+        """
+        Parse the comments of a task.
+
+        :param dict raw_comment_dict: The comments as returned by ClickUp
+        :return: The list of task comments
+        :rtype: list(Comment)
+        """
         if not isinstance(raw_comment_dict, dict):
             return []
 
@@ -127,15 +580,8 @@ class ClickUpHandler(ClickUp):
         """
         Get ordered tasks with tasks before subtasks.
 
-        :param list(Task) tasks: The tasks list
-
+        :param list(Task) tasks: The tasks list, with parents already added
         :return: The ordered tasks list
         :rtype: list(Task)
         """
-        sorted_tasks = []
-        for task in tasks:
-            if task.parent:
-                sorted_tasks.append(task)
-            else:
-                sorted_tasks.insert(0, task)
-        return sorted_tasks
+        return TaskGraph(tasks, parent_attribute="parent_id").ordered()
@@ -0,0 +1,75 @@
+import urllib.parse
+
+from pyclickup.models.error import RateLimited
+
+from clickup_to_jira.rate_limit import RATE_LIMITED_STATUS
+
+
+class ClickUpV2Client:
+    """
+    Class responsible for calling the endpoints of the ClickUp API v2.
+
+    The client has its own base URL but shares the pooled keep-alive session
+    of the v1 calls, so it can be used from several threads at once.
+    """
+
+    def __init__(self, session, api_url, timeout=None):
+        """
+        Initialize the client.
+
+        :param requests.Session session: The shared rate limited session
+        :param str api_url: The base URL of the API v2
+        :param float timeout: The timeout of requests in seconds
+        """
+        self.session = session
+        self.api_url = api_url
+        self.timeout = timeout
+
+    def get(self, path, **kwargs):
+        """
+        Perform a GET request to the API v2.
+
+        :param str path: The path relative to the API v2 URL
+        :return: The decoded response
+        :rtype: dict
+        :raises requests.HTTPError: If ClickUp kept failing
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.get(
+            urllib.parse.urljoin(self.api_url, path), **kwargs
+        )
+        if response.status_code == RATE_LIMITED_STATUS:
+            raise RateLimited()
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response.json()
+
+    def get_task(self, task_id):
+        """
+        Get a task, along with its attachments.
+
+        :param str task_id: The task id
+        :return: The task as returned by ClickUp
+        :rtype: dict
+        """
+        return self.get(f"task/{task_id}")
+
+    def get_task_comments(self, task_id):
+        """
+        Get the comments of a task.
+
+        :param str task_id: The task id
+        :return: The comments as returned by ClickUp
+        :rtype: dict
+        """
+        return self.get(f"task/{task_id}/comment/")
+
+    def get_space_tags(self, space_id):
+        """
+        Get the tags of a space.
+
+        :param str space_id: The space id
+        :return: The tags as returned by ClickUp
+        :rtype: dict
+        """
+        return self.get(f"space/{space_id}/tag")
@@ -1,15 +1,33 @@
 import json
 import os
 from logging import getLogger
+from threading import Lock
 
 from jira import JIRA
 from jira.exceptions import JIRAError
 
+from clickup_to_jira.attachment_transfer import AttachmentTransfer
+from clickup_to_jira.config import ConfigError
+from clickup_to_jira.follow_up import FollowUpExecutor
+from clickup_to_jira.rate_limit import AdaptiveRateLimiter, mount_rate_limiter
+from clickup_to_jira.retry import RetryPolicy
+from clickup_to_jira.state import MigrationState
+from clickup_to_jira.summary_index import SummaryIndex
+from clickup_to_jira.task_graph import TaskGraph
+from clickup_to_jira.user_directory import UserDirectory
 from clickup_to_jira.utils import get_item_from_user_input
+from clickup_to_jira.workflow import Workflow
 
 logger = getLogger(__name__)
 
 DEFAULT_ISSUE_TYPE = "Story"
+BULK_CREATE_SIZE = 50
+MAX_TRANSITION_HOPS = 10
+REQUESTS_PER_MINUTE = 600
+# Marks issues with the ClickUp task they were created from
+TASK_LABEL = "clickup-{}"
+# Steps that record each of their items instead of themselves
+ITEM_STEPS = frozenset({"comments", "attachments"})
 
 
 class JIRAHandler(JIRA):
@@ -17,8 +35,74 @@ class JIRAHandler(JIRA):
     Class responsible for adding Ticket to JIRA.
     """
 
-    status_mappings = {}
-    type_mappings = {}
+    config = None
+    metrics = None
+    retry_policy = RetryPolicy()
+    summary_index = None
+    follow_ups = None
+    attachment_transfer = None
+    migration_state = None
+    labelled_issue_types = None
+    _user_directory = None
+    _workflows = None
+    _status_mappings_lock = Lock()
+    _workflows_lock = Lock()
+
+    def __init__(
+        self,
+        *args,
+        config=None,
+        metrics=None,
+        rate_limit_share=1.0,
+        **kwargs,
+    ):
+        """
+        Initialize the handler and route its requests through a rate limiter.
+
+        :param MigrationConfig config: The config of a headless migration
+        :param MigrationMetrics metrics: The metrics recording every call
+        :param float rate_limit_share: The fraction of the rate limit to use,
+            when several processes share it
+        """
+        # Retries are left to the rate limited adapter, which never sends a
+        # POST twice
+        kwargs.setdefault("max_retries", 0)
+        super().__init__(*args, **kwargs)
+        self.config = config
+        self.metrics = metrics
+        self.retry_policy = RetryPolicy.from_env()
+        self.status_mappings = {}
+        self.type_mappings = {}
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=int(
+                os.getenv("JIRA_REQUESTS_PER_MINUTE", REQUESTS_PER_MINUTE)
+            )
+            / 60,
+            share=rate_limit_share,
+        )
+        mount_rate_limiter(
+            self._session,
+            self.rate_limiter,
+            retry_policy=self.retry_policy,
+            metrics=metrics,
+            api="jira",
+        )
+
+    @property
+    def user_directory(self):
+        """
+        Get the directory resolving users to JIRA account ids.
+
+        :return: The user directory
+        :rtype: UserDirectory
+        """
+        if self._user_directory is None:
+            self._user_directory = UserDirectory(
+                self, os.getenv("JIRA_USER_CACHE")
+            )
+            if os.getenv("JIRA_PRELOAD_USERS"):
+                self._user_directory.preload()
+        return self._user_directory
 
     def create_jira_issues(self, tickets):
         """
@@ -28,6 +112,52 @@ class JIRAHandler(JIRA):
         :return: The list of created JIRA issues
         :rtype: list(jira.issue)
         """
+        project = self.prepare_migration(tickets)
+
+        # Create all tickets
+        if os.getenv("JIRA_BULK_CREATE"):
+            issues = self.create_jira_issues_in_bulk(tickets, project)
+        else:
+            issues = []
+            for ticket in tickets:
+                issues.append(self.create_jira_issue(ticket, project))
+
+        self.finish_migration()
+        return issues
+
+    def sync_jira_issues(self, tickets):
+        """
+        Update the JIRA issues of migrated tickets and create the rest.
+
+        :param list(Ticket) tickets: The changed tickets
+        :return: The list of updated or created JIRA issues
+        :rtype: list(jira.issue)
+        """
+        project = self.prepare_migration(tickets)
+        if self.migration_state is None:
+            raise ConfigError("Syncing requires MIGRATION_STATE_DB")
+
+        issues = []
+        for ticket in tickets:
+            issue_key = self._get_migrated_issue_key(ticket)
+            if issue_key:
+                issues.append(self.update_jira_issue(issue_key, ticket))
+            else:
+                issues.append(self.create_jira_issue(ticket, project))
+
+        self.finish_migration()
+        return issues
+
+    def prepare_migration(self, tickets=(), click_up_labels=None):
+        """
+        Prepare the handler for creating JIRA issues.
+
+        :param list(Ticket) tickets: The tickets to create
+        :param list(str) click_up_labels: The ClickUp labels, if the tickets
+            are not known up front
+        :return: The id of the selected project
+        :rtype: str
+        """
         # Read status mappings from file
         statusmap = os.getenv("STATUSMAP")
         if statusmap and os.path.exists(statusmap):
@@ -40,15 +170,80 @@ class JIRAHandler(JIRA):
                 logger.info("Read status mappings from file.")
 
         # Create type mappings from tickets
-        cur_project = get_item_from_user_input("project", self.projects())
-        self.type_mappings = self.create_type_mappings(tickets)
+        cur_project = self.select_project()
+        if os.getenv("JIRA_SUMMARY_INDEX"):
+            self.summary_index = SummaryIndex(cur_project.id).load(self)
+        if self.config is not None:
+            self.type_mappings = self.create_configured_type_mappings(
+                tickets, click_up_labels
+            )
+            self.create_configured_status_mappings(tickets)
+        else:
+            self.type_mappings = self.create_type_mappings(
+                tickets, click_up_labels
+            )
         logger.info(self.type_mappings)
+        self.labelled_issue_types = self.get_labelled_issue_types(
+            cur_project.id
+        )
 
-        # Create all tickets
-        issues = []
-        for ticket in tickets:
-            issues.append(self.create_jira_issue(ticket, cur_project.id))
-        return issues
+        # Record the progress of the migration if configured
+        state_path = os.getenv("MIGRATION_STATE_DB")
+        if state_path:
+            self.migration_state = MigrationState(state_path)
+
+        # Run follow-up steps in the background if configured
+        follow_up_workers = os.getenv("JIRA_FOLLOW_UP_WORKERS")
+        if follow_up_workers:
+            self.follow_ups = FollowUpExecutor.from_config(follow_up_workers)
+
+        # Transfer attachments if configured
+        attachment_workers = os.getenv("MIGRATION_ATTACHMENT_WORKERS")
+        if attachment_workers:
+            self.attachment_transfer = AttachmentTransfer(
+                int(attachment_workers)
+            )
+        return cur_project.id
+
+    def select_project(self):
+        """
+        Select the JIRA project to create issues in.
+
+        :return: The project
+        :rtype: jira.Project
+        """
+        if self.config is None:
+            return get_item_from_user_input("project", self.projects())
+
+        projects = self.projects()
+        for project in projects:
+            if self.config.jira_project in (project.key, project.name):
+                return project
+        raise ConfigError(
+            f"{self.config.jira_project} is not a valid project. Eligible "
+            f"options are {[project.key for project in projects]}"
+        )
+
+    def finish_migration(self):
+        """
+        Wait for pending work and release the resources of the migration.
+        """
+        # Wait for the follow-up steps and report their failures
+        if self.follow_ups is not None:
+            self.follow_ups.shutdown().log()
+            self.follow_ups = None
+
+        # Remove the spooled attachments
+        if self.attachment_transfer is not None:
+            self.attachment_transfer.close()
+            self.attachment_transfer = None
+
+        if self.migration_state is not None:
+            self.migration_state.close()
+            self.migration_state = None
+
+        # Keep resolved users for the next run
+        self.user_directory.save()
 
     def create_jira_issue(self, ticket, project):
         """
@@ -60,6 +255,12 @@ class JIRAHandler(JIRA):
         :rtype: jira.issue
         """
         logger.info(f"Creating {ticket.title} in JIRA.")
+        # Resume tickets migrated by a previous run
+        issue_key = self._get_migrated_issue_key(ticket)
+        if issue_key:
+            self.resume_jira_issue(issue_key, ticket)
+            return
+
         # Check issue already exists
         try:
             if self.get_issue_from_summary(project, ticket.title):
@@ -75,26 +276,309 @@ class JIRAHandler(JIRA):
             logger.exception(f"Cannot create issue from {ticket}.")
             return
 
-        # Assign issue in proper user
-        self.assign_issue_to_user(issue, ticket)
+        self.complete_jira_issue(issue, ticket)
+        return issue
 
-        # Transition issue to proper status
-        self.transition_issue_to_proper_status(issue, ticket)
+    def create_jira_issues_in_bulk(self, tickets, project):
+        """
+        Create JIRA issues through the bulk create API.
 
-        # Add comments in ticket
-        self.add_comments(issue, ticket)
+        Tickets are created level by level, so parents exist before their
+        subtasks are submitted.
+
+        :param list(Ticket) tickets: The tickets to create
+        :param str project: The project id
+        :return: The list of created JIRA issues
+        :rtype: list(jira.issue)
+        """
+        graph = TaskGraph(tickets, parent_attribute="parent_id")
+        levels = {}
+        for ticket in graph.ordered():
+            levels.setdefault(graph.depth(ticket), []).append(ticket)
+
+        issues = []
+        created = {}
+        for level in sorted(levels):
+            pending = []
+            for ticket in levels[level]:
+                # Resume tickets migrated by a previous run
+                issue_key = self._get_migrated_issue_key(ticket)
+                if issue_key:
+                    created[ticket.id] = issue_key
+                    self.resume_jira_issue(issue_key, ticket)
+                    continue
+
+                try:
+                    if self.get_issue_from_summary(project, ticket.title):
+                        logger.warning(
+                            f"Ticket {ticket.title} already exists."
+                        )
+                        continue
+                except JIRAError as e:
+                    logger.warning(e)
+                    continue
+                pending.append(ticket)
+
+            for start in range(0, len(pending), BULK_CREATE_SIZE):
+                batch = pending[start : start + BULK_CREATE_SIZE]
+                issues.extend(
+                    self._create_issue_batch(batch, project, created)
+                )
+        return issues
+
+    def _create_issue_batch(self, tickets, project, created):
+        """
+        Create a batch of JIRA issues with a single request.
+
+        :param list(Ticket) tickets: The tickets to create
+        :param str project: The project id
+        :param dict created: The issue keys created so far by ClickUp task id
+        :return: The created JIRA issues
+        :rtype: list(jira.issue)
+        """
+        logger.info(f"Creating {len(tickets)} issues in JIRA.")
+        field_list = []
+        for ticket in tickets:
+            parent_key = created.get(ticket.parent_id)
+            if not parent_key and ticket.parent:
+                parent_list = self.get_issue_from_summary(
+                    project, ticket.parent
+                )
+                parent_key = parent_list[0].key if parent_list else None
+            field_list.append(
+                self._get_issue_fields(ticket, project, parent_key)
+            )
+
+        # Issues created by failed attempts are looked up before retrying
+        found = {}
+        try:
+            results = self.retry_policy.run(
+                self._create_missing_issues,
+                tickets,
+                field_list,
+                found,
+                recover=lambda: self._find_created_batch(
+                    project, tickets, found
+                ),
+            )
+        except JIRAError:
+            logger.exception(
+                f"Cannot create issues {[t.title for t in tickets]}. Move on"
+            )
+            return []
+
+        issues = []
+        for ticket, result in zip(tickets, results):
+            if result["status"] != "Success":
+                logger.error(
+                    f"Cannot create issue from {ticket.title}: "
+                    f"{result['error']}"
+                )
+                continue
+            issue = result["issue"]
+            created[ticket.id] = issue.key
+            if self.summary_index is not None:
+                self.summary_index.add(issue, ticket.title)
+            if self.migration_state is not None:
+                self.migration_state.record_issue(ticket.id, issue.key)
+            self.complete_jira_issue(issue, ticket)
+            issues.append(issue)
+        return issues
+
+    def _create_missing_issues(self, tickets, field_list, found):
+        """
+        Create the issues of a batch that were not found already.
+
+        :param list(Ticket) tickets: The tickets of the batch
+        :param list(dict) field_list: The fields of their issues
+        :param dict found: The issues already created by ClickUp task id
+        :return: The bulk create result of every ticket
+        :rtype: list(dict)
+        """
+        missing = [
+            fields
+            for ticket, fields in zip(tickets, field_list)
+            if ticket.id not in found
+        ]
+        results = iter(
+            self.create_issues(missing, prefetch=False) if missing else []
+        )
+        return [
+            (
+                {"status": "Success", "issue": found[ticket.id], "error": None}
+                if ticket.id in found
+                else next(results)
+            )
+            for ticket in tickets
+        ]
+
+    def _find_created_batch(self, project, tickets, found):
+        """
+        Find the issues of a batch created by failed attempts.
+
+        :param str project: The project id
+        :param list(Ticket) tickets: The tickets of the batch
+        :param dict found: The issues already created by ClickUp task id,
+            updated in place
+        :return: The bulk create result of every ticket, once all of their
+            issues are found
+        :rtype: list(dict)
+        """
+        found.update(self.find_created_issues(project, tickets))
+        if any(ticket.id not in found for ticket in tickets):
+            return None
+        return [
+            {"status": "Success", "issue": found[ticket.id], "error": None}
+            for ticket in tickets
+        ]
+
+    def complete_jira_issue(self, issue, ticket):
+        """
+        Assign, transition, comment, attach and link a created JIRA issue.
+
+        :param jira.issue issue: The created JIRA issue
+        :param Ticket ticket: The ticket the issue was created from
+        """
+        steps = [
+            # Assign issue in proper user
+            ("assign", self.assign_issue_to_user, issue, ticket),
+            # Transition issue to proper status
+            (
+                "transition",
+                self.transition_issue_to_proper_status,
+                issue,
+                ticket,
+            ),
+            # Add comments in ticket
+            ("comments", self.add_comments, issue, ticket),
+        ]
+
+        # Transfer attachments if configured
+        if ticket.attachments and self.attachment_transfer is not None:
+            steps.append(("attachments", self.add_attachments, issue, ticket))
 
         # check if links should be set
         if os.getenv("JIRACLICKUPLINK"):
             # add link to clickup
-            self.add_simple_link(
-                issue,
-                {
-                    "url": ticket.url,
-                    "title": f"ClickUp issue {ticket.title}",
-                },
+            steps.append(
+                (
+                    "link",
+                    self.add_simple_link,
+                    issue,
+                    {
+                        "url": ticket.url,
+                        "title": f"ClickUp issue {ticket.title}",
+                    },
+                )
             )
 
+        for step, function, *args in steps:
+            # Skip steps completed by a previous run
+            if self._is_step_done(ticket, step):
+                continue
+            if self.follow_ups is not None:
+                self.follow_ups.submit(
+                    step,
+                    issue,
+                    ticket,
+                    self._run_step,
+                    ticket,
+                    step,
+                    function,
+                    *args,
+                )
+            else:
+                self._run_step(ticket, step, function, *args)
+
+    def _run_step(self, ticket, step, function, *args):
+        """
+        Run a follow-up step and record it once it succeeds.
+
+        :param Ticket ticket: The ticket the issue was created from
+        :param str step: The step name
+        :param callable function: The step to run
+        :return: The outcome of the step
+        """
+        result = function(*args)
+        if (
+            result is not False
+            and step not in ITEM_STEPS
+            and self.migration_state is not None
+        ):
+            self.migration_state.record_step(ticket.id, step)
+        return result
+
+    def _is_step_done(self, ticket, step):
+        """
+        Get if a step was completed for a ticket by a previous run.
+
+        The comments and attachments steps are never done as a whole, since
+        the ticket may have gained items since; they skip the items already
+        recorded instead.
+
+        :param Ticket ticket: The ticket
+        :param str step: The step name
+        :return: The step was completed
+        :rtype: bool
+        """
+        if step in ITEM_STEPS:
+            return False
+        return self.migration_state is not None and (
+            self.migration_state.is_done(ticket.id, step)
+        )
+
+    def _get_migrated_issue_key(self, ticket):
+        """
+        Get the key of the JIRA issue a previous run created for a ticket.
+
+        :param Ticket ticket: The ticket
+        :return: The JIRA issue key if the ticket was migrated
+        :rtype: str
+        """
+        if self.migration_state is None:
+            return None
+        return self.migration_state.get_issue_key(ticket.id)
+
+    def has_pending_steps(self, ticket):
+        """
+        Get if a previous run did not finish every step of a ticket.
+
+        :param Ticket ticket: The ticket
+        :return: Some step is pending
+        :rtype: bool
+        """
+        steps = ["assign", "transition"] + [
+            f"comment:{comment.id}"
+            for comment in ticket.comments
+            if comment.text
+        ]
+        if self.attachment_transfer is not None:
+            steps += [
+                f"attachment:{attachment.id}"
+                for attachment in ticket.attachments
+            ]
+        if os.getenv("JIRACLICKUPLINK"):
+            steps.append("link")
+        return not all(self._is_step_done(ticket, step) for step in steps)
+
+    def resume_jira_issue(self, issue_key, ticket):
+        """
+        Complete the steps a previous run did not finish for an issue.
+
+        :param str issue_key: The key of the migrated JIRA issue
+        :param Ticket ticket: The ticket the issue was created from
+        :return: The JIRA issue if any step was pending
+        :rtype: jira.issue
+        """
+        if not self.has_pending_steps(ticket):
+            logger.info(f"Ticket {ticket.title} is already in {issue_key}.")
+            return None
+
+        logger.info(f"Resuming {ticket.title} in {issue_key}.")
+        issue = self.issue(issue_key, fields="status")
+        self.complete_jira_issue(issue, ticket)
+        return issue
+
     def create_base_jira_issue(self, ticket, project):
         """
         Create a JIRA issue given the ticket and the JIRA project.
@@ -105,49 +589,182 @@ class JIRAHandler(JIRA):
         :rtype: Jira.issue
         """
         try:
-            # Get creator user id
-            c = self.search_users(user=ticket.creator)
-            # reporter needs to be dict with id
-            reporter = {"id": c[0].accountId} if c and c[0].accountId else None
-
-            # Populate basic data for ticket creation
-            issue_data = {
-                "project": project,
-                "issuetype": (
-                    {"name": self.type_mappings[ticket.type.split(",")[0]]}
-                    if not ticket.parent
-                    else {"name": "Subtask"}
-                ),
-                "summary": ticket.title,
-                "description": ticket.description,
-                "reporter": reporter,
-            }
-
             # Handle case where issue is subtasks
-            parent_list = self.get_issue_from_summary(project, ticket.parent)
-            if parent_list:
-                logger.info(f"Ticket {ticket.title} has parent")
-                issue_data["parent"] = {"id": parent_list[0].id}
+            parent_key = None
+            if ticket.parent:
+                parent_list = self.get_issue_from_summary(
+                    project, ticket.parent
+                )
+                if parent_list:
+                    logger.info(f"Ticket {ticket.title} has parent")
+                    parent_key = parent_list[0].key
 
-            # Create the ticket
-            return self.create_issue(**issue_data)
+            # Create the ticket, once even if a response is lost
+            issue = self.retry_policy.run(
+                self.create_issue,
+                fields=self._get_issue_fields(ticket, project, parent_key),
+                recover=lambda: self.find_created_issues(
+                    project, [ticket]
+                ).get(ticket.id),
+            )
+            if self.summary_index is not None:
+                self.summary_index.add(issue)
+            if self.migration_state is not None:
+                self.migration_state.record_issue(ticket.id, issue.key)
+            return issue
         except JIRAError:
             logger.exception("Cannot create issue. Move on")
             return None
 
+    def _get_issue_fields(self, ticket, project, parent_key=None):
+        """
+        Get the fields of the JIRA issue to create from a ticket.
+
+        :param Ticket ticket: The ticket to create to JIRA
+        :param str project: The project id to add the ticket to
+        :param str parent_key: The key of the parent JIRA issue
+        :return: The issue fields
+        :rtype: dict
+        """
+        # Get creator user id
+        account_id = self.user_directory.get_account_id(ticket.creator)
+        # reporter needs to be dict with id
+        reporter = {"id": account_id} if account_id else None
+
+        # Populate basic data for ticket creation
+        issue_data = {
+            "project": {"id": str(project)},
+            "issuetype": {"name": self._get_issue_type(ticket)},
+            "summary": ticket.title,
+            "description": ticket.description,
+            "reporter": reporter,
+        }
+        if self.can_label(ticket):
+            issue_data["labels"] = [TASK_LABEL.format(ticket.id)]
+        if parent_key:
+            issue_data["parent"] = {"key": parent_key}
+        return issue_data
+
+    def get_labelled_issue_types(self, project):
+        """
+        Get the issue types that can be labelled on creation.
+
+        Only the issue types of the type mappings and subtasks are checked.
+        Cloud and servers before 8.4 only describe their create screens
+        through ``createmeta``.
+
+        :param str project: The project id
+        :return: The issue type names, or None if the create screens cannot
+            be read and every issue type is labelled
+        :rtype: set(str)
+        """
+        names = set(self.type_mappings.values()) | {"Subtask"}
+        try:
+            return self._get_labelled_project_issue_types(project, names)
+        except JIRAError:
+            pass
+        try:
+            return self._get_labelled_createmeta_issue_types(project, names)
+        except JIRAError:
+            logger.warning(
+                "Cannot read the create screens. Labelling every issue type"
+            )
+            return None
+
+    def _get_labelled_project_issue_types(self, project, names):
+        """
+        Get the issue types that can be labelled from the issue type
+        endpoints of JIRA Server 8.4 and later.
+
+        :param str project: The project id
+        :param set(str) names: The issue type names to check
+        :return: The issue type names
+        :rtype: set(str)
+        :raises JIRAError: If the endpoints are not supported
+        """
+        return {
+            issue_type.name
+            for issue_type in self.project_issue_types(
+                project, maxResults=False
+            )
+            if issue_type.name in names
+            and any(
+                field.fieldId == "labels"
+                for field in self.project_issue_fields(
+                    project, issue_type.id, maxResults=False
+                )
+            )
+        }
+
+    def _get_labelled_createmeta_issue_types(self, project, names):
+        """
+        Get the issue types that can be labelled from ``createmeta``.
+
+        :param str project: The project id
+        :param set(str) names: The issue type names to check
+        :return: The issue type names
+        :rtype: set(str)
+        :raises JIRAError: If the endpoint is not supported
+        """
+        meta = self.createmeta(
+            projectIds=[project], expand="projects.issuetypes.fields"
+        )
+        return {
+            issue_type["name"]
+            for meta_project in meta.get("projects", [])
+            for issue_type in meta_project.get("issuetypes", [])
+            if issue_type["name"] in names
+            and "labels" in issue_type.get("fields", {})
+        }
+
+    def can_label(self, ticket):
+        """
+        Get if the issue of a ticket can be labelled with its ClickUp task.
+
+        :param Ticket ticket: The ticket
+        :return: The issue can be labelled
+        :rtype: bool
+        """
+        return (
+            self.labelled_issue_types is None
+            or self._get_issue_type(ticket) in self.labelled_issue_types
+        )
+
+    def _get_issue_type(self, ticket):
+        """
+        Get the JIRA issue type of a ticket.
+
+        :param Ticket ticket: The ticket
+        :return: The issue type name
+        :rtype: str
+        """
+        if ticket.parent:
+            return "Subtask"
+        return self.type_mappings[ticket.type.split(",")[0]]
+
     def assign_issue_to_user(self, issue, ticket):
         """
         Assign JIRA issue to a user.
 
         :param jira.issue issue: The JIRA issue
         :param Ticket ticket: The Ticket to retrieve the assignee from
+        :return: Assignment succeeded
+        :rtype: bool
         """
+        if not ticket.assignee:
+            return True
+
         try:
-            user = self.search_users(user=ticket.assignee)[0].accountId
+            user = self.user_directory.get_account_id(ticket.assignee)
+            if not user:
+                logger.warning(f"Cannot assign {issue}. No such user")
+                return False
             self.assign_issue(issue, user)
             logger.info(f"Assigned {issue}")
-        except (JIRAError, IndexError):
+            return True
+        except JIRAError:
             logger.warning(f"Cannot assign {issue}")
+            return False
 
     def transition_issue_to_proper_status(self, issue, ticket):
         """
@@ -155,21 +772,120 @@ class JIRAHandler(JIRA):
 
         :param jira.issue issue: The JIRA issue
         :param Ticket ticket: The Ticket to retrieve the assignee from
+        :return: Transition succeeded
+        :rtype: bool
         """
-        if ticket.status not in self.status_mappings.keys():
-            try:
-                self.update_status_mappings(ticket, issue)
-            except JIRAError:
-                logger.warning("Cannot transition ticket")
-                return
+        if not self.ensure_status_mapping(issue, ticket):
+            return False
         try:
-            self.transition_issue(
+            workflow = self.get_workflow(issue, ticket)
+            if self.move_issue_to_status(
                 issue,
+                workflow,
+                self._get_current_status(workflow, issue),
                 self.status_mappings[ticket.status],
-            )
-            logger.info(f"Transitioned {issue}")
+            ):
+                logger.info(f"Transitioned {issue}")
+                return True
+            logger.warning(f"Cannot find transitions for {issue}")
+            return False
         except (JIRAError, IndexError, KeyError, AttributeError):
             logger.warning("Cannot transition issue")
+            return False
+
+    def ensure_status_mapping(self, issue, ticket):
+        """
+        Make sure the status of a ticket is mapped to a JIRA status.
+
+        :param jira.issue issue: The JIRA issue
+        :param Ticket ticket: The Ticket to retrieve the status from
+        :return: The mapping could be updated if needed
+        :rtype: bool
+        """
+        if ticket.status in self.status_mappings.keys():
+            return True
+        try:
+            # Only one prompt for a new status at a time
+            with self._status_mappings_lock:
+                if ticket.status not in self.status_mappings.keys():
+                    self.update_status_mappings(ticket, issue)
+        except JIRAError:
+            logger.warning("Cannot transition ticket")
+            return False
+        return True
+
+    def get_workflow(self, issue, ticket):
+        """
+        Get the cached workflow of an issue.
+
+        Workflows are shared by all issues of the same project and type.
+
+        :param jira.issue issue: The JIRA issue
+        :param Ticket ticket: The Ticket the issue was created from
+        :return: The workflow
+        :rtype: Workflow
+        """
+        key = (str(issue).split("-")[0], self._get_issue_type(ticket))
+        with self._workflows_lock:
+            if self._workflows is None:
+                self._workflows = {}
+            return self._workflows.setdefault(key, Workflow())
+
+    def _get_current_status(self, workflow, issue):
+        """
+        Get the status an issue is in.
+
+        Issues fetched with their fields, e.g. ones resumed after a previous
+        run moved them, report their own status. Issues created in bulk come
+        without fields and are in the initial status of their workflow.
+
+        :param Workflow workflow: The workflow of the issue
+        :param jira.issue issue: The JIRA issue
+        :return: The status name
+        :rtype: str
+        """
+        try:
+            return issue.fields.status.name
+        except AttributeError:
+            pass
+        if workflow.initial_status is None:
+            workflow.initial_status = self.issue(
+                str(issue), fields="status"
+            ).fields.status.name
+        return workflow.initial_status
+
+    def move_issue_to_status(self, issue, workflow, status, target):
+        """
+        Move an issue through the shortest transition path to a status.
+
+        Statuses are explored while the issue passes through them, so the
+        transitions of a workflow are fetched once per status.
+
+        :param jira.issue issue: The JIRA issue
+        :param Workflow workflow: The workflow of the issue
+        :param str status: The current status of the issue
+        :param str target: The desired status
+        :return: The issue reached the desired status
+        :rtype: bool
+        """
+        for _ in range(MAX_TRANSITION_HOPS):
+            if status == target:
+                return True
+            if not workflow.is_explored(status):
+                workflow.add_transitions(status, self.transitions(issue))
+
+            path = workflow.shortest_path(status, target)
+            if path is None:
+                path = workflow.path_to_unexplored(status)
+            if path is None:
+                return False
+
+            for transition_id, next_status in path:
+                self.transition_issue(issue, transition_id)
+                status = next_status
+                if not workflow.is_explored(status):
+                    break
+        return status == target
 
     def update_status_mappings(self, ticket, issue):
         """
@@ -178,15 +894,22 @@ class JIRAHandler(JIRA):
         :param jira.issue issue: The JIRA issue
         :param Ticket ticket: The Ticket to retrieve the assignee from
         """
+        # Fall back to the default status of a headless migration
+        if self.config is not None:
+            if self.config.default_status:
+                self.status_mappings[ticket.status] = (
+                    self.config.default_status
+                )
+            else:
+                logger.warning(f"No status mapping for {ticket.status}")
+            return
+
         # Populate jira statuses for specific Issue
-        jira_statuses = list(
-            set(
-                [
-                    transition["to"].get("name")
-                    for transition in self.transitions(issue)
-                ]
-            )
-        )
+        workflow = self.get_workflow(issue, ticket)
+        status = self._get_current_status(workflow, issue)
+        if not workflow.is_explored(status):
+            workflow.add_transitions(status, self.transitions(issue))
+        jira_statuses = workflow.statuses()
         # Check if mappings already exists for ticket status
         if ticket.status in self.status_mappings.keys():
             return
@@ -210,24 +933,18 @@ class JIRAHandler(JIRA):
         else:
             self.status_mappings[ticket.status] = jira_status
 
-    def create_type_mappings(self, tickets):
+    def create_type_mappings(self, tickets, click_up_labels=None):
         """
         Create mappings between ClickUp labels and Jira Ticket types.
 
         :param list(Ticket) tickets: The tickets to create
+        :param list(str) click_up_labels: The ClickUp labels, if the tickets
+            are not known up front
         :return: The type mappings
         :rtype: dict
         """
         # Populate ClickUp labels found and JIRA types available
-        click_up_labels = list(
-            set(
-                [
-                    ticket_type
-                    for ticket in tickets
-                    for ticket_type in ticket.type.split(",")
-                ]
-            )
-        )
+        click_up_labels = self._get_click_up_labels(tickets, click_up_labels)
         jira_types = list(
             set([issue_type.name for issue_type in self.issue_types()])
         )
@@ -280,6 +997,93 @@ class JIRAHandler(JIRA):
         else:
             return self.__compute_type_mappings(click_up_labels, jira_types)
 
+    def create_configured_type_mappings(self, tickets, click_up_labels=None):
+        """
+        Create type mappings from the config of a headless migration.
+
+        Every mapping is validated against the JIRA issue types up front.
+
+        :param list(Ticket) tickets: The tickets to create
+        :param list(str) click_up_labels: The ClickUp labels, if the tickets
+            are not known up front
+        :return: The type mappings
+        :rtype: dict
+        :raises ConfigError: If a label is not mapped to a valid type
+        """
+        jira_types = {issue_type.name for issue_type in self.issue_types()}
+        mappings = {}
+        for click_up_label in self._get_click_up_labels(
+            tickets, click_up_labels
+        ):
+            jira_type = self.config.type_mappings.get(
+                click_up_label, self.config.default_type
+            )
+            if not jira_type:
+                raise ConfigError(
+                    f"No type mapping for ClickUp label '{click_up_label}'"
+                )
+            mappings[click_up_label] = jira_type
+
+        invalid_types = (
+            set(mappings.values()) | set(self.config.type_mappings.values())
+        ) - jira_types
+        if invalid_types:
+            raise ConfigError(
+                f"Unknown JIRA issue types {sorted(invalid_types)}. "
+                f"Eligible options are {sorted(jira_types)}"
+            )
+        return mappings
+
+    def create_configured_status_mappings(self, tickets):
+        """
+        Add the status mappings of a headless migration.
+
+        Every mapping is validated against the JIRA statuses up front.
+
+        :param list(Ticket) tickets: The tickets to create
+        :raises ConfigError: If a status is not mapped to a valid status
+        """
+        jira_statuses = {status.name for status in self.statuses()}
+        targets = set(self.config.status_mappings.values())
+        if self.config.default_status:
+            targets.add(self.config.default_status)
+        invalid_statuses = targets - jira_statuses
+        if invalid_statuses:
+            raise ConfigError(
+                f"Unknown JIRA statuses {sorted(invalid_statuses)}. "
+                f"Eligible options are {sorted(jira_statuses)}"
+            )
+
+        self.status_mappings.update(self.config.status_mappings)
+        if not self.config.default_status:
+            unmapped = {ticket.status for ticket in tickets} - set(
+                self.status_mappings
+            )
+            if unmapped:
+                raise ConfigError(
+                    f"No status mapping for ClickUp statuses "
+                    f"{sorted(unmapped)}"
+                )
+
+    @staticmethod
+    def _get_click_up_labels(tickets, click_up_labels=None):
+        """
+        Get the distinct ClickUp labels of the tickets.
+
+        :param list(Ticket) tickets: The tickets to create
+        :param list(str) click_up_labels: The ClickUp labels, if the tickets
+            are not known up front
+        :return: The ClickUp labels
+        :rtype: list(str)
+        """
+        if click_up_labels is None:
+            click_up_labels = [
+                ticket_type
+                for ticket in tickets
+                for ticket_type in ticket.type.split(",")
+            ]
+        return list(set(click_up_labels))
+
     @staticmethod
     def __compute_type_mappings(click_up_labels, jira_types):
         """
@@ -316,8 +1120,16 @@ class JIRAHandler(JIRA):
 
         :param jira.issue issue: The issue to add comments to
         :param Ticket ticket: The ticket to read comments from
+        :return: All comments were added
+        :rtype: bool
         """
+        succeeded = True
         for comment in ticket.comments:
+            # Skip comments added by a previous run
+            step = f"comment:{comment.id}"
+            if self._is_step_done(ticket, step):
+                continue
+
             logger.info(f"Adding {comment} in {issue}")
             print(comment.text)
             if comment.text:
@@ -326,9 +1138,132 @@ class JIRAHandler(JIRA):
                 )
                 try:
                     self.add_comment(issue, text_with_commenter)
+                    if self.migration_state is not None:
+                        self.migration_state.record_step(ticket.id, step)
                 except JIRAError:
                     logger.warning(f"Failed to add {comment} in {issue}")
+                    succeeded = False
                     continue
+        return succeeded
+
+    def add_attachments(self, issue, ticket):
+        """
+        Add attachments to JIRA Issue.
+
+        The files are transferred in parallel and each is recorded once it
+        is attached.
+
+        :param jira.issue issue: The issue to add attachments to
+        :param Ticket ticket: The ticket to read attachments from
+        :return: All attachments were added
+        :rtype: bool
+        """
+        transfers = []
+        for attachment in ticket.attachments:
+            # Skip attachments added by a previous run
+            step = f"attachment:{attachment.id}"
+            if self._is_step_done(ticket, step):
+                continue
+            transfers.append(
+                (
+                    step,
+                    attachment,
+                    self.attachment_transfer.submit(self, issue, attachment),
+                )
+            )
+
+        succeeded = True
+        for step, attachment, transfer in transfers:
+            try:
+                transfer.result()
+            except (JIRAError, OSError) as error:
+                logger.warning(
+                    f"Failed to add {attachment.title} in {issue}: {error}"
+                )
+                succeeded = False
+                continue
+            if self.migration_state is not None:
+                self.migration_state.record_step(ticket.id, step)
+        return succeeded
+
+    def update_jira_issue(self, issue_key, ticket):
+        """
+        Bring the JIRA issue of a migrated ticket up to date.
+
+        The description, assignee and status are updated if they changed and
+        comments not added yet are added.
+
+        :param str issue_key: The key of the migrated JIRA issue
+        :param Ticket ticket: The changed ticket
+        :return: The updated JIRA issue
+        :rtype: jira.issue
+        """
+        logger.info(f"Updating {issue_key} from {ticket.title}.")
+        try:
+            issue = self.issue(issue_key, fields="description,assignee,status")
+        except JIRAError:
+            logger.warning(f"Cannot find {issue_key}")
+            return None
+
+        if issue.fields.description != ticket.description:
+            try:
+                issue.update(fields={"description": ticket.description})
+                logger.info(f"Updated the description of {issue}")
+            except JIRAError:
+                logger.warning(f"Cannot update the description of {issue}")
+        self.update_issue_assignee(issue, ticket)
+        self.update_issue_status(issue, ticket)
+        self.add_comments(issue, ticket)
+        return issue
+
+    def update_issue_assignee(self, issue, ticket):
+        """
+        Reassign a JIRA issue if the assignee of its ticket changed.
+
+        :param jira.issue issue: The JIRA issue, with its assignee
+        :param Ticket ticket: The Ticket to retrieve the assignee from
+        :return: The issue has the assignee of the ticket
+        :rtype: bool
+        """
+        try:
+            user = None
+            if ticket.assignee:
+                user = self.user_directory.get_account_id(ticket.assignee)
+                if not user:
+                    logger.warning(f"Cannot assign {issue}. No such user")
+                    return False
+            if getattr(issue.fields.assignee, "accountId", None) != user:
+                self.assign_issue(issue, user)
+                logger.info(f"Reassigned {issue}")
+            return True
+        except JIRAError:
+            logger.warning(f"Cannot assign {issue}")
+            return False
+
+    def update_issue_status(self, issue, ticket):
+        """
+        Transition a JIRA issue if the status of its ticket changed.
+
+        :param jira.issue issue: The JIRA issue, with its status
+        :param Ticket ticket: The Ticket to retrieve the status from
+        :return: The issue has the status of the ticket
+        :rtype: bool
+        """
+        if not self.ensure_status_mapping(issue, ticket):
+            return False
+        try:
+            if self.move_issue_to_status(
+                issue,
+                self.get_workflow(issue, ticket),
+                issue.fields.status.name,
+                self.status_mappings[ticket.status],
+            ):
+                return True
+            logger.warning(f"Cannot find transitions for {issue}")
+            return False
+        except (JIRAError, KeyError, AttributeError):
+            logger.warning("Cannot transition issue")
+            return False
 
     def get_issue_from_summary(self, project, summary):
         """
@@ -339,16 +1274,93 @@ class JIRAHandler(JIRA):
         :return: The JIRA issue
         :rtype: jira.issue
         """
-        jql = (
-            f'project = "{project}" and summary '
-            f'~ "{summary}" ORDER BY created DESC'
-        )
-        issues = self.search_issues(jql)
+        # Use the preloaded index when there is one for the project
+        if (
+            self.summary_index is not None
+            and self.summary_index.project == project
+        ):
+            return self.summary_index.get(summary)
+
+        issues = self.search_issues(self.get_summary_jql(project, summary))
         proper_issues = [
             issue for issue in issues if issue.fields.summary == summary
         ]
         return proper_issues
 
+    def get_issues_from_task_ids(self, project, task_ids):
+        """
+        Get the issues created from ClickUp tasks, from their labels.
+
+        Issues may only be found a moment after their creation, once JIRA
+        indexed them.
+
+        :param str project: Project to search in
+        :param list(str) task_ids: The ClickUp task ids
+        :return: The JIRA issues by ClickUp task id
+        :rtype: dict
+        """
+        labels = {TASK_LABEL.format(task_id): task_id for task_id in task_ids}
+        quoted_labels = ", ".join(f'"{label}"' for label in labels)
+        issues = self.search_issues(
+            f'project = "{project}" and labels in ({quoted_labels})',
+            maxResults=len(labels),
+            fields="labels,status",
+        )
+        return {
+            labels[label]: issue
+            for issue in issues
+            for label in issue.fields.labels
+            if label in labels
+        }
+
+    def find_created_issues(self, project, tickets):
+        """
+        Find the issues created from tickets by failed attempts.
+
+        Issues are found from their labels, or from their summaries when
+        their issue type cannot be labelled. Summaries are searched in JIRA
+        as the summary index lacks issues whose creation response was lost.
+
+        :param str project: Project to search in
+        :param list(Ticket) tickets: The tickets
+        :return: The JIRA issues by ClickUp task id
+        :rtype: dict
+        """
+        labelled = [ticket.id for ticket in tickets if self.can_label(ticket)]
+        found = (
+            self.get_issues_from_task_ids(project, labelled)
+            if labelled
+            else {}
+        )
+        for ticket in tickets:
+            if self.can_label(ticket):
+                continue
+            issues = self.search_issues(
+                self.get_summary_jql(project, ticket.title),
+                fields="summary,status",
+            )
+            for issue in issues:
+                if issue.fields.summary == ticket.title:
+                    found[ticket.id] = issue
+                    break
+        return found
+
+    @staticmethod
+    def get_summary_jql(project, summary):
+        """
+        Get the JQL searching a project for a summary.
+
+        :param str project: Project to search in
+        :param str summary: The summary string
+        :return: The JQL query
+        :rtype: str
+        """
+        escaped_summary = summary.replace("\\", "\\\\").replace('"', '\\"')
+        return (
+            f'project = "{project}" and summary '
+            f'~ "{escaped_summary}" ORDER BY created DESC'
+        )
+
     def assign_issue(self, issue, assignee):
         """
         Assign an issue to a user.
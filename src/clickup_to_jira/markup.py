@@ -0,0 +1,218 @@
+import re
+
+# Every line is classified by the first alternative it matches
+BLOCK = re.compile(
+    r"(?P<fence>```|~~~)\s*(?P<language>[\w+#.-]*)\s*$"
+    r"|(?P<heading>#{1,6})[ \t]+(?P<heading_text>.*)$"
+    r"|(?P<rule>(?:-[ \t]*){3,}|(?:\*[ \t]*){3,}|(?:_[ \t]*){3,})$"
+    r"|>[ \t]?(?P<quote_text>.*)$"
+    r"|(?P<indent>[ \t]*)(?P<bullet>[-*+]|\d{1,9}[.)])[ \t]+(?P<item_text>.*)$"
+    r"|[ \t]*(?P<table>\|.*\|)[ \t]*$"
+)
+TABLE_SEPARATOR = re.compile(r"[ \t]*\|?(?:[ \t]*:?-+:?[ \t]*\|?)+[ \t]*$")
+
+# Every span is consumed left to right by the first alternative it matches.
+# Bodies stop at the next opening delimiter, so a span that is never closed
+# is given up there instead of rescanning the rest of the line.
+INLINE = re.compile(
+    r"`(?P<code>[^`\n]+)`"
+    r"|!\[[^\[\]\n]*\]\((?P<image>[^)\s]+)\)"
+    r"|\[(?P<link_text>[^\[\]\n]+)\]\((?P<link_url>[^)\s]+)\)"
+    r"|<(?P<autolink>https?://[^>\s]+)>"
+    r"|\*\*(?P<bold>[^*\n]+)\*\*"
+    r"|(?<!\w)__(?P<bold_alt>[^_\n]+)__(?!\w)"
+    r"|~~(?P<strike>[^~\n]+)~~"
+    r"|\*(?P<italic>[^*\s][^*\n]*)\*"
+    r"|(?<!\w)_(?P<italic_alt>[^_\s][^_\n]*)_(?!\w)"
+    r"|(?<![\w@])@(?P<mention>[\w.+-]*\w(?:@[\w-]+(?:\.[\w-]+)+)?)"
+    r"|(?P<special>[{\[])"
+)
+
+
+class MarkupConverter:
+    """
+    Class responsible for converting ClickUp Markdown to JIRA wiki markup.
+
+    Headings, lists, quotes, rules, fenced code and tables are recognized
+    line by line, and the inline spans of every line in a single scan, so
+    the conversion is linear in the size of the text.
+    """
+
+    def __init__(self, resolve_mention=None):
+        """
+        Initialize the converter.
+
+        :param callable resolve_mention: Resolves a mentioned user to a JIRA
+            account id, if mentions are to be converted
+        """
+        self.resolve_mention = resolve_mention
+
+    def convert(self, text):
+        """
+        Convert Markdown to JIRA wiki markup.
+
+        :param str text: The Markdown text
+        :return: The JIRA wiki markup
+        :rtype: str
+        """
+        if not text:
+            return text
+
+        lines = text.splitlines()
+        output = []
+        lists = []
+        fence = None
+        index = 0
+        while index < len(lines):
+            line = lines[index]
+            index += 1
+
+            # Code is kept verbatim up to the closing fence
+            if fence is not None:
+                if line.strip() == fence:
+                    output.append("{code}")
+                    fence = None
+                else:
+                    output.append(line)
+                continue
+
+            match = BLOCK.match(line)
+            kind = match.lastgroup if match else None
+            if kind not in ("bullet", "item_text"):
+                lists = []
+
+            if kind == "language":
+                fence = match.group("fence")
+                language = match.group("language")
+                output.append(f"{{code:{language}}}" if language else "{code}")
+            elif kind == "heading_text":
+                output.append(
+                    f"h{len(match.group('heading'))}. "
+                    f"{self.convert_inline(self._get_heading_text(match))}"
+                )
+            elif kind == "rule":
+                output.append("----")
+            elif kind == "quote_text":
+                output.append(
+                    f"bq. {self.convert_inline(match.group('quote_text'))}"
+                )
+            elif kind == "item_text":
+                output.append(
+                    f"{self._get_list_marker(lists, match)} "
+                    f"{self.convert_inline(match.group('item_text'))}"
+                )
+            elif kind == "table":
+                header = index < len(lines) and TABLE_SEPARATOR.match(
+                    lines[index]
+                )
+                if header:
+                    index += 1
+                output.append(self._convert_row(match.group("table"), header))
+            else:
+                output.append(self.convert_inline(line))
+
+        if fence is not None:
+            output.append("{code}")
+        return "\n".join(output)
+
+    @staticmethod
+    def _get_heading_text(match):
+        """
+        Get the text of a heading without its closing hashes.
+
+        They are stripped here rather than in the pattern, which would
+        backtrack over long runs of whitespace.
+
+        :param re.Match match: The heading
+        :return: The heading text
+        :rtype: str
+        """
+        text = match.group("heading_text").rstrip()
+        stripped = text.rstrip("#")
+        if not stripped or stripped[-1] in " \t":
+            return stripped.rstrip()
+        return text
+
+    @staticmethod
+    def _get_list_marker(lists, match):
+        """
+        Get the marker of a list item, nested by its indentation.
+
+        :param list lists: The indentation and marker of every open list,
+            updated in place
+        :param re.Match match: The list item
+        :return: The JIRA list marker
+        :rtype: str
+        """
+        indent = len(match.group("indent").expandtabs(4))
+        marker = "#" if match.group("bullet")[0].isdigit() else "*"
+        while lists and lists[-1][0] > indent:
+            lists.pop()
+        if lists and lists[-1][0] == indent:
+            lists[-1] = (indent, marker)
+        else:
+            lists.append((indent, marker))
+        return "".join(marker for _, marker in lists)
+
+    def _convert_row(self, row, header):
+        """
+        Convert a table row.
+
+        :param str row: The row, with its outer pipes
+        :param bool header: The row is the table header
+        :return: The JIRA table row
+        :rtype: str
+        """
+        separator = "||" if header else "|"
+        cells = [
+            self.convert_inline(cell.strip()) for cell in row[1:-1].split("|")
+        ]
+        return separator + separator.join(cells) + separator
+
+    def convert_inline(self, text):
+        """
+        Convert the inline spans of a line.
+
+        :param str text: The Markdown line
+        :return: The JIRA wiki markup
+        :rtype: str
+        """
+        output = []
+        position = 0
+        for match in INLINE.finditer(text):
+            output.append(text[position : match.start()])
+            output.append(self._convert_span(match))
+            position = match.end()
+        output.append(text[position:])
+        return "".join(output)
+
+    def _convert_span(self, match):
+        """
+        Convert an inline span.
+
+        :param re.Match match: The span
+        :return: The JIRA wiki markup
+        :rtype: str
+        """
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "code":
+            return f"{{{{{value}}}}}"
+        if kind == "image":
+            return f"!{value}!"
+        if kind == "link_url":
+            text = self.convert_inline(match.group("link_text"))
+            return f"[{text}|{value}]"
+        if kind == "autolink":
+            return f"[{value}]"
+        if kind in ("bold", "bold_alt"):
+            return f"*{self.convert_inline(value)}*"
+        if kind == "strike":
+            return f"-{self.convert_inline(value)}-"
+        if kind in ("italic", "italic_alt"):
+            return f"_{self.convert_inline(value)}_"
+        if kind == "mention":
+            account_id = self.resolve_mention and self.resolve_mention(value)
+            return f"[~accountid:{account_id}]" if account_id else f"@{value}"
+        # Brackets and braces would start JIRA links and macros
+        return f"\\{value}"
@@ -0,0 +1,473 @@
+import json
+import os
+import re
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from threading import Lock, Thread
+
+logger = getLogger(__name__)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# The version prefix of the ClickUp and JIRA REST paths
+API_PREFIX = re.compile(r"^/(?:api/v\d+|rest/api/\w+)/")
+# Path segments holding ids or keys, e.g. 9hz, 123 or PROJ-1
+ID_SEGMENT = re.compile(r"[^/]*\d[^/]*")
+
+
+def get_operation(method, url):
+    """
+    Get the logical operation of a request.
+
+    Ids are left out of the path, so every task or issue shares the
+    operation.
+
+    :param str method: The HTTP method
+    :param str url: The request URL
+    :return: The operation, e.g. ``GET issue/{id}/transitions``
+    :rtype: str
+    """
+    path = API_PREFIX.sub("", urllib.parse.urlsplit(url).path)
+    path = ID_SEGMENT.sub("{id}", path).strip("/")
+    return f"{method.upper()} {path}"
+
+
+def get_body_size(body):
+    """
+    Get the size of a request body without reading it.
+
+    :param body: The body, e.g. bytes, a string or a multipart encoder
+    :return: The size in bytes, 0 when unknown
+    :rtype: int
+    """
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, bytes):
+        return len(body)
+    return getattr(body, "len", 0)
+
+
+class Histogram:
+    """
+    Class responsible for counting observations in cumulative buckets.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        :param tuple(float) buckets: The upper bounds of the buckets
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        Add an observation.
+
+        :param float value: The observed value
+        """
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def merge(self, other):
+        """
+        Add the observations of another histogram with the same buckets.
+
+        :param Histogram other: The other histogram
+        """
+        self.count += other.count
+        self.sum += other.sum
+        self.counts = [
+            count + other_count
+            for count, other_count in zip(self.counts, other.counts)
+        ]
+
+    def to_dict(self):
+        """
+        Get the histogram as a JSON serializable dict.
+
+        :return: The buckets by upper bound, the count and the sum
+        :rtype: dict
+        """
+        return {
+            "buckets": {
+                str(bound): count
+                for bound, count in zip(self.buckets, self.counts)
+            },
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class OperationMetrics:
+    """
+    Class responsible for hosting the metrics of a logical operation.
+    """
+
+    def __init__(self):
+        """
+        Initialize the metrics.
+        """
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = Histogram()
+
+    def merge(self, other):
+        """
+        Add the calls of other metrics of the same operation.
+
+        :param OperationMetrics other: The other metrics
+        """
+        self.calls += other.calls
+        self.errors += other.errors
+        self.retries += other.retries
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.latency.merge(other.latency)
+
+    def to_dict(self):
+        """
+        Get the metrics as a JSON serializable dict.
+
+        :return: The metrics
+        :rtype: dict
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class MigrationMetrics:
+    """
+    Class responsible for recording the outbound calls of a migration.
+
+    Calls are grouped by API and logical operation, with their counts,
+    errors, 429 retries, bytes and latency, along with the time spent
+    waiting on the rate limiter of every API. The metrics are reported as
+    JSON and in the Prometheus text format.
+    """
+
+    def __init__(self):
+        """
+        Initialize the metrics.
+        """
+        self.operations = {}
+        self.rate_limit_wait = {}
+        self._lock = Lock()
+        self._server = None
+
+    def __getstate__(self):
+        """
+        Get the recorded calls, e.g. to return them from a worker process.
+
+        :return: The state without the lock and the server
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "operations": self.operations,
+                "rate_limit_wait": self.rate_limit_wait,
+            }
+
+    def __setstate__(self, state):
+        """
+        Restore the recorded calls.
+
+        :param dict state: The state
+        """
+        self.__init__()
+        self.operations = state["operations"]
+        self.rate_limit_wait = state["rate_limit_wait"]
+
+    def merge(self, other):
+        """
+        Add the calls recorded by other metrics, e.g. of a worker process.
+
+        :param MigrationMetrics other: The other metrics
+        """
+        with self._lock:
+            for key, metrics in other.operations.items():
+                if key not in self.operations:
+                    self.operations[key] = OperationMetrics()
+                self.operations[key].merge(metrics)
+            for api, seconds in other.rate_limit_wait.items():
+                self.rate_limit_wait[api] = (
+                    self.rate_limit_wait.get(api, 0.0) + seconds
+                )
+
+    def observe(
+        self,
+        api,
+        operation,
+        latency,
+        error=False,
+        retries=0,
+        bytes_sent=0,
+        bytes_received=0,
+    ):
+        """
+        Record an outbound call.
+
+        :param str api: The API, e.g. clickup or jira
+        :param str operation: The logical operation
+        :param float latency: The time until the response in seconds
+        :param bool error: The call failed
+        :param int retries: The times the call was retried after a 429
+        :param int bytes_sent: The size of the request body
+        :param int bytes_received: The size of the response body
+        """
+        with self._lock:
+            metrics = self.operations.get((api, operation))
+            if metrics is None:
+                metrics = self.operations[(api, operation)] = (
+                    OperationMetrics()
+                )
+            metrics.calls += 1
+            metrics.errors += bool(error)
+            metrics.retries += retries
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            metrics.latency.observe(latency)
+
+    def observe_request(
+        self,
+        api,
+        method,
+        url,
+        response,
+        latency,
+        waited=0.0,
+        retries=0,
+        body=None,
+    ):
+        """
+        Record an outbound HTTP request of the requests or httpx clients.
+
+        The received bytes are the announced ``Content-Length``, so streamed
+        responses are not read.
+
+        :param str api: The API, e.g. clickup or jira
+        :param str method: The HTTP method
+        :param str url: The request URL
+        :param response: The last response, None if the request failed
+        :param float latency: The time until the response in seconds,
+            without the time waiting on the rate limiter
+        :param float waited: The time spent waiting on the rate limiter
+        :param int retries: The times the request was retried after a 429
+        :param body: The request body, e.g. bytes, a string or a multipart
+            encoder
+        """
+        self.observe_wait(api, waited)
+        self.observe(
+            api,
+            get_operation(method, url),
+            latency,
+            error=response is None or response.status_code >= 400,
+            retries=retries,
+            bytes_sent=get_body_size(body),
+            bytes_received=int(
+                response.headers.get("Content-Length", 0)
+                if response is not None
+                else 0
+            ),
+        )
+
+    def observe_wait(self, api, seconds):
+        """
+        Record time spent waiting on a rate limiter.
+
+        :param str api: The API, e.g. clickup or jira
+        :param float seconds: The time waited
+        """
+        if not seconds:
+            return
+        with self._lock:
+            self.rate_limit_wait[api] = (
+                self.rate_limit_wait.get(api, 0.0) + seconds
+            )
+
+    def to_dict(self):
+        """
+        Get the metrics as a JSON serializable dict.
+
+        :return: The metrics per API and operation
+        :rtype: dict
+        """
+        with self._lock:
+            report = {
+                api: {"rate_limit_wait_seconds": seconds, "operations": {}}
+                for api, seconds in self.rate_limit_wait.items()
+            }
+            for (api, operation), metrics in sorted(self.operations.items()):
+                report.setdefault(
+                    api, {"rate_limit_wait_seconds": 0.0, "operations": {}}
+                )["operations"][operation] = metrics.to_dict()
+        return report
+
+    def to_prometheus(self):
+        """
+        Get the metrics in the Prometheus text format.
+
+        :return: The exposition
+        :rtype: str
+        """
+        counters = (
+            ("requests", "calls", "Outbound calls"),
+            ("request_errors", "errors", "Failed outbound calls"),
+            ("request_retries", "retries", "Calls retried after a 429"),
+            ("request_sent_bytes", "bytes_sent", "Bytes of request bodies"),
+            (
+                "request_received_bytes",
+                "bytes_received",
+                "Bytes of response bodies",
+            ),
+        )
+        lines = []
+        with self._lock:
+            operations = sorted(self.operations.items())
+            for name, attribute, description in counters:
+                lines.append(f"# HELP migration_{name}_total {description}")
+                lines.append(f"# TYPE migration_{name}_total counter")
+                for (api, operation), metrics in operations:
+                    labels = _get_labels(api=api, operation=operation)
+                    lines.append(
+                        f"migration_{name}_total{{{labels}}} "
+                        f"{getattr(metrics, attribute)}"
+                    )
+
+            name = "migration_request_duration_seconds"
+            lines.append(f"# HELP {name} Latency of outbound calls")
+            lines.append(f"# TYPE {name} histogram")
+            for (api, operation), metrics in operations:
+                labels = _get_labels(api=api, operation=operation)
+                histogram = metrics.latency
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            name = "migration_rate_limit_wait_seconds_total"
+            lines.append(f"# HELP {name} Time spent waiting on rate limits")
+            lines.append(f"# TYPE {name} counter")
+            for api, seconds in sorted(self.rate_limit_wait.items()):
+                lines.append(f"{name}{{{_get_labels(api=api)}}} {seconds}")
+        return "\n".join(lines) + "\n"
+
+    def report(self, directory=None):
+        """
+        Log the slowest operations and save the metrics to a directory.
+
+        :param str directory: The directory where ``metrics.json`` and
+            ``metrics.prom`` are saved, if any
+        """
+        with self._lock:
+            operations = sorted(
+                self.operations.items(),
+                key=lambda item: item[1].latency.sum,
+                reverse=True,
+            )
+            waits = dict(self.rate_limit_wait)
+        for (api, operation), metrics in operations:
+            logger.info(
+                f"{api} {operation}: {metrics.calls} calls in "
+                f"{metrics.latency.sum:.1f}s, {metrics.errors} errors, "
+                f"{metrics.retries} retries"
+            )
+        for api, seconds in sorted(waits.items()):
+            logger.info(f"{api}: waited {seconds:.1f}s on the rate limit")
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, "metrics.json"), "w") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            with open(os.path.join(directory, "metrics.prom"), "w") as f:
+                f.write(self.to_prometheus())
+            logger.info(f"Saved the metrics to {directory}")
+
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Serve the metrics on a local port in the background.
+
+        ``/metrics`` returns the Prometheus text format and
+        ``/metrics.json`` the JSON report.
+
+        :param int port: The port
+        :param str host: The interface to listen on
+        """
+        metrics = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                if self.path == "/metrics":
+                    body = metrics.to_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics.to_dict()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self._server.daemon_threads = True
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def close(self):
+        """
+        Stop serving the metrics.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _get_labels(**labels):
+    """
+    Get the labels of a Prometheus sample.
+
+    :return: The escaped labels
+    :rtype: str
+    """
+    return ",".join(
+        f'{name}="{_escape(value)}"' for name, value in labels.items()
+    )
+
+
+def _escape(value):
+    """
+    Escape a Prometheus label value.
+
+    :param str value: The label value
+    :return: The escaped value
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
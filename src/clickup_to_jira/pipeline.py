@@ -0,0 +1,143 @@
+import os
+from collections import deque
+from logging import getLogger
+from queue import Queue
+from threading import Thread
+
+logger = getLogger(__name__)
+
+QUEUE_SIZE = 100
+
+_DONE = object()
+
+
+def prefetch(iterable, size=QUEUE_SIZE):
+    """
+    Iterate over an iterable in a background thread.
+
+    The thread stays at most ``size`` items ahead of the consumer, so a slow
+    consumer holds back the producer instead of buffering everything.
+
+    :param iterable iterable: The items to produce
+    :param int size: The maximum number of buffered items
+    :return: The produced items
+    :rtype: iterator
+    """
+    queue = Queue(maxsize=size)
+
+    def produce():
+        try:
+            for item in iterable:
+                queue.put((item, None))
+        except Exception as error:  # pylint: disable=broad-except
+            queue.put((_DONE, error))
+        else:
+            queue.put((_DONE, None))
+
+    Thread(target=produce, name="prefetch", daemon=True).start()
+    while True:
+        item, error = queue.get()
+        if error is not None:
+            raise error
+        if item is _DONE:
+            return
+        yield item
+
+
+def in_parent_order(tasks):
+    """
+    Iterate over ClickUp tasks with every task after its parent.
+
+    Only the tasks whose parent has not been released yet are held back.
+    Like :meth:`TaskGraph.resolve_parents`, the parent id of every task is
+    moved to ``parent_id`` and replaced with the name of the parent.
+
+    :param iterator(Task) tasks: The ClickUp tasks
+    :return: The tasks in parent order
+    :rtype: iterator(Task)
+    """
+    names = {}
+    waiting = {}
+
+    def release(task, parent_id):
+        pending = deque([(task, parent_id)])
+        while pending:
+            task, parent_id = pending.popleft()
+            task.parent_id = parent_id
+            task.parent = names[parent_id] if parent_id else None
+            names[task.id] = task.name
+            yield task
+            pending.extend(
+                (child, task.id) for child in waiting.pop(task.id, [])
+            )
+
+    for task in tasks:
+        parent_id = task.parent
+        if parent_id and parent_id != task.id and parent_id not in names:
+            waiting.setdefault(parent_id, []).append(task)
+            continue
+        yield from release(task, parent_id if parent_id in names else None)
+
+    # Parents that were never fetched are dropped
+    while waiting:
+        held = {task.id for children in waiting.values() for task in children}
+        parent_id = next(
+            (parent_id for parent_id in waiting if parent_id not in held),
+            next(iter(waiting)),
+        )
+        for task in waiting.pop(parent_id):
+            logger.warning(f"Parent of task {task.id} was not fetched")
+            yield from release(task, None)
+
+
+class MigrationPipeline:
+    """
+    Class responsible for streaming ClickUp tasks into JIRA.
+
+    Tasks flow from the ClickUp pages through comment enrichment and
+    conversion into JIRA creation, instead of loading the whole space before
+    the first issue is created. ClickUp is read in a background thread,
+    bounded by a queue, while JIRA issues are created.
+    """
+
+    def __init__(self, click_up_handler, converter, jira_handler):
+        """
+        Initialize the pipeline.
+
+        :param ClickUpHandler click_up_handler: The ClickUp handler
+        :param ClickUpToJIRAConverter converter: The ticket converter
+        :param JIRAHandler jira_handler: The JIRA handler
+        """
+        self.click_up = click_up_handler
+        self.converter = converter
+        self.jira = jira_handler
+        self.queue_size = int(os.getenv("MIGRATION_QUEUE_SIZE", QUEUE_SIZE))
+
+    def run(self):
+        """
+        Migrate the selected ClickUp tasks to JIRA.
+
+        :return: The number of created JIRA issues
+        :rtype: int
+        """
+        space, container = self.click_up.select_task_container()
+        project = self.jira.prepare_migration(
+            click_up_labels=self.click_up.get_space_labels(space)
+        )
+
+        tasks = self.click_up.iter_tasks_from_click_up(container)
+        tasks = self.click_up.iter_comments_to_tasks(tasks)
+        tasks = in_parent_order(tasks)
+        tickets = prefetch(
+            (self.converter.convert_ticket(task) for task in tasks),
+            self.queue_size,
+        )
+
+        created = 0
+        for ticket in tickets:
+            if self.jira.create_jira_issue(ticket, project):
+                created += 1
+
+        self.jira.finish_migration()
+        logger.info(f"Created {created} issues in JIRA.")
+        return created
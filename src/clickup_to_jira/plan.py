@@ -0,0 +1,241 @@
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+from logging import getLogger
+from time import monotonic
+
+from clickup_to_jira.follow_up import FOLLOW_UP_STEPS, parse_workers
+from clickup_to_jira.handlers.async_jira import MAX_CONNECTIONS
+from clickup_to_jira.handlers.jira import BULK_CREATE_SIZE, REQUESTS_PER_MINUTE
+from clickup_to_jira.task_graph import TaskGraph
+from clickup_to_jira.user_directory import UserDirectory
+
+logger = getLogger(__name__)
+
+LATENCY = 0.5
+CALL_TYPES = ("jql", "users", "create") + FOLLOW_UP_STEPS
+
+
+@dataclass
+class MigrationPlan:
+    """
+    Class responsible for hosting the estimated cost of a migration
+    """
+
+    tickets: int = 0
+    calls: Counter = field(default_factory=Counter)
+    latency: float = LATENCY
+    sampled: bool = False
+    duration: float = 0.0
+
+    @property
+    def total_calls(self):
+        """
+        Get the number of JIRA calls of the migration.
+
+        :return: The number of calls
+        :rtype: int
+        """
+        return sum(self.calls.values())
+
+    def log(self):
+        """
+        Log the estimated cost of the migration.
+        """
+        logger.info(
+            f"Migrating {self.tickets} tickets takes about "
+            f"{self.total_calls} JIRA calls."
+        )
+        for call_type in CALL_TYPES:
+            logger.info(f"  {call_type}: {self.calls[call_type]}")
+        source = "sampled" if self.sampled else "assumed"
+        logger.info(
+            f"Estimated duration {timedelta(seconds=round(self.duration))} "
+            f"with a {source} latency of {self.latency:.3f}s per call."
+        )
+
+
+class MigrationPlanner:
+    """
+    Class responsible for estimating a migration without writing to JIRA.
+
+    The JIRA calls of every step are counted the way the JIRA handler makes
+    them, with the configured bulk creation, summary index, user cache and
+    links. The duration is bounded both by the JIRA rate limit and by the
+    latency of calls spread over the configured concurrency. Transitions are
+    counted as a single hop per issue, since workflows are only discovered
+    while issues move through them.
+    """
+
+    def __init__(self, jira_handler, samples=0):
+        """
+        Initialize the planner.
+
+        :param JIRAHandler jira_handler: The JIRA handler
+        :param int samples: The number of read-only JIRA calls timed to
+            measure the latency, if any
+        """
+        self.jira = jira_handler
+        self.samples = samples
+
+    def plan(self, tickets):
+        """
+        Estimate the migration of converted tickets.
+
+        :param list(Ticket) tickets: The tickets to create
+        :return: The plan
+        :rtype: MigrationPlan
+        """
+        plan = MigrationPlan(tickets=len(tickets), calls=self.count(tickets))
+        if self.samples:
+            plan.latency = self.sample_latency(self.samples)
+            plan.sampled = True
+        plan.duration = self.estimate_duration(plan.calls, plan.latency)
+        return plan
+
+    def count(self, tickets):
+        """
+        Count the JIRA calls of every step of a migration.
+
+        :param list(Ticket) tickets: The tickets to create
+        :return: The number of calls per call type
+        :rtype: Counter
+        """
+        calls = Counter()
+        bulk = os.getenv("JIRA_BULK_CREATE")
+        ids = {ticket.id for ticket in tickets}
+
+        # Existing issues and parents are searched by summary
+        if os.getenv("JIRA_SUMMARY_INDEX"):
+            calls["jql"] += 1
+        else:
+            calls["jql"] += len(tickets)
+            calls["jql"] += sum(
+                1
+                for ticket in tickets
+                if ticket.parent and not (bulk and ticket.parent_id in ids)
+            )
+
+        if bulk:
+            graph = TaskGraph(tickets, parent_attribute="parent_id")
+            levels = Counter(graph.depth(ticket) for ticket in tickets)
+            calls["create"] += sum(
+                math.ceil(size / BULK_CREATE_SIZE) for size in levels.values()
+            )
+        else:
+            calls["create"] += len(tickets)
+
+        # Every user is searched once, unless cached or preloaded
+        if os.getenv("JIRA_PRELOAD_USERS"):
+            calls["users"] += 1
+        else:
+            known = UserDirectory(None, os.getenv("JIRA_USER_CACHE"))
+            users = {
+                getattr(user, "email", user)
+                for ticket in tickets
+                for user in (ticket.creator, ticket.assignee)
+                if user
+            }
+            calls["users"] += sum(
+                1 for user in users if user not in known._account_ids
+            )
+
+        calls["assign"] += sum(1 for ticket in tickets if ticket.assignee)
+
+        # The transitions of a status are fetched once per workflow
+        statuses = {
+            (self._get_workflow_key(ticket), ticket.status)
+            for ticket in tickets
+        }
+        calls["transition"] += len(tickets) + len(statuses)
+        if bulk:
+            calls["transition"] += len({key for key, _ in statuses})
+
+        calls["comments"] += sum(
+            1
+            for ticket in tickets
+            for comment in ticket.comments
+            if comment.text
+        )
+        if os.getenv("MIGRATION_ATTACHMENT_WORKERS"):
+            calls["attachments"] += sum(
+                len(ticket.attachments) for ticket in tickets
+            )
+        if os.getenv("JIRACLICKUPLINK"):
+            calls["link"] += len(tickets)
+        return calls
+
+    @staticmethod
+    def _get_workflow_key(ticket):
+        """
+        Get the ClickUp type that decides the workflow of a ticket.
+
+        :param Ticket ticket: The ticket
+        :return: The ClickUp type, or Subtask for subtasks
+        :rtype: str
+        """
+        if ticket.parent:
+            return "Subtask"
+        return ticket.type.split(",")[0]
+
+    def sample_latency(self, samples):
+        """
+        Measure the latency of JIRA calls with read-only requests.
+
+        :param int samples: The number of calls to time
+        :return: The mean latency in seconds
+        :rtype: float
+        """
+        elapsed = 0.0
+        for _ in range(samples):
+            start = monotonic()
+            self.jira.myself()
+            elapsed += monotonic() - start
+        latency = elapsed / samples
+        logger.info(f"Sampled a JIRA latency of {latency:.3f}s")
+        return latency
+
+    @staticmethod
+    def estimate_duration(calls, latency):
+        """
+        Estimate the duration of a migration.
+
+        :param Counter calls: The number of calls per call type
+        :param float latency: The latency of a call in seconds
+        :return: The duration in seconds
+        :rtype: float
+        """
+        rate = (
+            int(os.getenv("JIRA_REQUESTS_PER_MINUTE", REQUESTS_PER_MINUTE))
+            / 60
+        )
+        total = sum(calls.values())
+
+        if os.getenv("JIRA_ASYNC"):
+            connections = int(
+                os.getenv("JIRA_MAX_CONNECTIONS", MAX_CONNECTIONS)
+            )
+            duration = total * latency / connections
+        else:
+            follow_up_workers = os.getenv("JIRA_FOLLOW_UP_WORKERS")
+            creation = sum(
+                calls[call_type]
+                for call_type in CALL_TYPES
+                if call_type not in FOLLOW_UP_STEPS
+            )
+            if follow_up_workers:
+                # Every step type runs in its own pool next to the creation
+                workers = parse_workers(follow_up_workers)
+                duration = max(
+                    creation,
+                    *(
+                        calls[step] / workers.get(step, 1)
+                        for step in FOLLOW_UP_STEPS
+                    ),
+                )
+                duration *= latency
+            else:
+                duration = total * latency
+        return max(duration, total / rate)
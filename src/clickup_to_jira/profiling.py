@@ -0,0 +1,243 @@
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from logging import getLogger
+from time import perf_counter
+
+from clickup_to_jira.task_graph import TaskGraph
+
+logger = getLogger(__name__)
+
+# The methods running every phase of a migration, on whichever handler or
+# converter has them
+PHASES = {
+    "select_task_container": "hierarchy",
+    "get_tasks_from_click_up": "tasks",
+    "add_comments_to_tasks": "comments",
+    "convert": "conversion",
+    "prepare_migration": "mappings",
+    "create_jira_issues": "creation",
+}
+PARENT_PHASE = "parents"
+TOP_FUNCTIONS = 20
+TOP_ALLOCATORS = 10
+IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class PhaseProfiler:
+    """
+    Class responsible for profiling the phases of a migration separately.
+
+    Every phase has its own CPU profile and the memory it allocates is
+    compared between ``tracemalloc`` snapshots taken when it starts and ends.
+    Phases running inside another phase, e.g. the hierarchy selection while
+    fetching tasks, pause the outer one, so the time and functions of a phase
+    exclude its nested phases. Allocations include them.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize the profiler.
+
+        :param str directory: The directory where the profiles and the
+            summary are saved
+        """
+        self.directory = directory
+        self.profiles = {}
+        self.seconds = {}
+        self.calls = {}
+        self.allocations = {}
+        self._stack = []
+        self._started = {}
+        self._originals = []
+
+    def start(self):
+        """
+        Start tracing allocations and profile the parent resolution.
+
+        :return: The profiler
+        :rtype: PhaseProfiler
+        """
+        tracemalloc.start()
+        for name in ("resolve_parents", "ordered"):
+            self._wrap(TaskGraph, name, PARENT_PHASE)
+        return self
+
+    def instrument(self, *handlers):
+        """
+        Run the methods of handlers in their phases.
+
+        :param handlers: The handlers and converters of the migration
+        """
+        for handler in handlers:
+            for name, phase in PHASES.items():
+                if callable(getattr(handler, name, None)):
+                    self._wrap(handler, name, phase)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Profile a phase.
+
+        :param str name: The name of the phase
+        """
+        outer = self._stack[-1] if self._stack else None
+        if outer is not None:
+            self._pause(outer)
+        self._stack.append(name)
+        before = self._take_snapshot()
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self._resume(name)
+        try:
+            yield
+        finally:
+            self._pause(name)
+            self._record_allocations(name, before, self._take_snapshot())
+            self._stack.pop()
+            if outer is not None:
+                self._resume(outer)
+
+    def close(self):
+        """
+        Restore the profiled methods, stop tracing allocations and save the
+        profiles and the summary.
+        """
+        for owner, name, original in reversed(self._originals):
+            if inspect.isclass(owner):
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self._originals = []
+        tracemalloc.stop()
+        self.save()
+
+    def save(self):
+        """
+        Save a profile per phase and the summary to the directory.
+
+        The profiles can be read with ``pstats`` or tools such as
+        ``snakeviz``.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for name, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(self.directory, f"{name}.prof"))
+        with open(os.path.join(self.directory, "summary.txt"), "w") as f:
+            f.write(self.get_summary())
+        for name in self.profiles:
+            logger.info(
+                f"Phase {name}: {self.seconds[name]:.2f}s in "
+                f"{self.calls[name]} calls, "
+                f"{sum(self.allocations[name].values()) / 1024:.0f} KiB "
+                "allocated"
+            )
+        logger.info(f"Saved the profiles to {self.directory}")
+
+    def get_summary(self):
+        """
+        Get the slowest functions and top allocators of every phase.
+
+        :return: The summary
+        :rtype: str
+        """
+        output = io.StringIO()
+        for name, profile in self.profiles.items():
+            output.write(
+                f"=== {name}: {self.seconds[name]:.3f}s in "
+                f"{self.calls[name]} calls ===\n\n"
+            )
+            output.write("Top allocators:\n")
+            allocators = sorted(
+                self.allocations[name].items(),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:TOP_ALLOCATORS]
+            for location, size in allocators:
+                output.write(f"{size / 1024:12.1f} KiB  {location}\n")
+            output.write("\nSlowest functions:\n")
+            pstats.Stats(profile, stream=output).sort_stats(
+                "tottime"
+            ).print_stats(TOP_FUNCTIONS)
+        return output.getvalue()
+
+    def _wrap(self, owner, name, phase):
+        """
+        Replace a method of a class or instance with one running in a phase.
+
+        :param owner: The class or instance
+        :param str name: The name of the method
+        :param str phase: The name of the phase
+        """
+        method = getattr(owner, name)
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs):
+                with self.phase(phase):
+                    return await method(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with self.phase(phase):
+                    return method(*args, **kwargs)
+
+        self._originals.append((owner, name, owner.__dict__.get(name)))
+        setattr(owner, name, wrapper)
+
+    def _pause(self, name):
+        """
+        Stop the profile and the clock of a phase.
+
+        :param str name: The name of the phase
+        """
+        self.profiles[name].disable()
+        self.seconds[name] += perf_counter() - self._started.pop(name)
+
+    def _resume(self, name):
+        """
+        Start the profile and the clock of a phase.
+
+        :param str name: The name of the phase
+        """
+        if name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+            self.seconds[name] = 0.0
+            self.allocations[name] = {}
+        self._started[name] = perf_counter()
+        self.profiles[name].enable()
+
+    @staticmethod
+    def _take_snapshot():
+        """
+        Take a snapshot of the traced allocations.
+
+        :return: The snapshot
+        :rtype: tracemalloc.Snapshot
+        """
+        return tracemalloc.take_snapshot().filter_traces(IGNORED_TRACES)
+
+    def _record_allocations(self, name, before, after):
+        """
+        Add the memory allocated between two snapshots to a phase.
+
+        :param str name: The name of the phase
+        :param tracemalloc.Snapshot before: The snapshot when it started
+        :param tracemalloc.Snapshot after: The snapshot when it ended
+        """
+        allocations = self.allocations[name]
+        for statistic in after.compare_to(before, "lineno"):
+            if statistic.size_diff > 0:
+                location = str(statistic.traceback)
+                allocations[location] = (
+                    allocations.get(location, 0) + statistic.size_diff
+                )
@@ -0,0 +1,368 @@
+import math
+import urllib.parse
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from logging import getLogger
+from threading import Lock
+from time import monotonic, sleep, time
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from clickup_to_jira.retry import (
+    IDEMPOTENT_METHODS,
+    CircuitBreaker,
+    RetryPolicy,
+    is_unsent,
+)
+
+logger = getLogger(__name__)
+
+RATE_LIMITED_STATUS = 429
+MAX_RATE_LIMITED_RETRIES = 5
+SERVER_ERROR_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Class responsible for limiting the rate of outgoing requests.
+
+    The bucket is shared between threads. Every caller reserves a token and
+    sleeps until its slot arrives, so concurrent callers never exceed the
+    configured rate while their requests are in flight.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """
+        Initialize the bucket.
+
+        :param float rate: The tokens added to the bucket per second
+        :param int capacity: The maximum number of tokens kept in the bucket
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """
+        Consume a token, blocking until one is available.
+
+        :return: The time spent waiting in seconds
+        :rtype: float
+        """
+        delay = self.reserve()
+        if delay:
+            sleep(delay)
+        return delay
+
+    def reserve(self):
+        """
+        Consume a token without blocking.
+
+        Callers that cannot block, such as coroutines, wait for the returned
+        delay on their own.
+
+        :return: The time to wait before the token may be used in seconds
+        :rtype: float
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Class responsible for following the rate limits announced by a server.
+
+    The configured rate is only used until the server reports its budget
+    through the ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset`` headers.
+    From then on the remaining budget is spread over the time left until the
+    reset. ``Retry-After`` pauses every caller for exactly the requested time.
+    """
+
+    def __init__(self, rate, capacity=1, share=1.0):
+        """
+        Initialize the limiter.
+
+        :param float rate: The requests per second until the server reports
+            its own budget
+        :param int capacity: The maximum number of tokens kept in the bucket
+        :param float share: The fraction of the server budget to use, when
+            several processes share it
+        """
+        super().__init__(rate * share, capacity)
+        self.share = share
+        self._paused_until = 0.0
+
+    def reserve(self):
+        """
+        Consume a token without blocking, after any pause requested by the
+        server.
+
+        :return: The time to wait before the token may be used in seconds
+        :rtype: float
+        """
+        pause = max(0.0, self._paused_until - monotonic())
+        return pause + super().reserve()
+
+    def update(self, response):
+        """
+        Update the limiter from the headers of a response.
+
+        :param requests.Response response: The response of the server
+        """
+        retry_after = _parse_delay(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            logger.info(f"Rate limited. Pausing for {retry_after}s")
+            self.pause(retry_after)
+            return
+
+        remaining = _parse_remaining(
+            response.headers.get("X-RateLimit-Remaining")
+        )
+        reset = _parse_reset(response.headers.get("X-RateLimit-Reset"))
+        if remaining is None or reset is None:
+            return
+
+        if remaining <= 0:
+            self.pause(reset)
+            return
+        with self._lock:
+            self.rate = remaining / max(reset, 1.0) * self.share
+
+    def pause(self, seconds):
+        """
+        Pause every caller for the given time.
+
+        :param float seconds: The time to pause in seconds
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Class responsible for routing every request of a session through a rate
+    limiter and retrying the ones that failed transiently.
+
+    Requests rejected with 429 are always retried, once the rate limiter
+    allows it. Server errors and lost connections are retried with backoff
+    only when the request is idempotent or never reached the server, so a
+    POST is never sent twice. Every host has a circuit breaker failing fast
+    while it keeps failing.
+    """
+
+    def __init__(
+        self, rate_limiter, retry_policy=None, metrics=None, api=None, **kwargs
+    ):
+        """
+        Initialize the adapter.
+
+        :param AdaptiveRateLimiter rate_limiter: The shared rate limiter
+        :param RetryPolicy retry_policy: The retry policy, the default one if
+            None
+        :param MigrationMetrics metrics: The metrics recording every call, if
+            any
+        :param str api: The name of the API in the metrics
+        """
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = (
+            retry_policy if retry_policy is not None else RetryPolicy()
+        )
+        self.metrics = metrics
+        self.api = api
+        self.circuit_breakers = {}
+        self._circuit_breakers_lock = Lock()
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Send a request once the rate limiter allows it.
+
+        :param requests.PreparedRequest request: The request to send
+        :return: The response
+        :rtype: requests.Response
+        :raises CircuitOpenError: If the host failed too often
+        """
+        circuit_breaker = self.get_circuit_breaker(request.url)
+        retries = 0
+        waited = 0.0
+        start = monotonic()
+        response = None
+        try:
+            while True:
+                circuit_breaker.before_request()
+                waited += self.rate_limiter.acquire()
+                try:
+                    response = super().send(request, **kwargs)
+                except (ConnectionError, Timeout) as error:
+                    circuit_breaker.record_failure()
+                    if not self._can_retry(request, retries, start, error):
+                        raise
+                    logger.warning(f"{error}. Retrying {request.url}")
+                else:
+                    self.rate_limiter.update(response)
+                    if response.status_code in SERVER_ERROR_STATUSES:
+                        circuit_breaker.record_failure()
+                    else:
+                        circuit_breaker.record_success()
+                    if not self._can_retry(request, retries, start, response):
+                        return response
+                    response.close()
+
+                # The rate limiter already waits as long as a 429 asks for
+                if response is None or (
+                    response.status_code != RATE_LIMITED_STATUS
+                ):
+                    sleep(self.retry_policy.get_delay(retries))
+                retries += 1
+                response = None
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_request(
+                    self.api,
+                    request.method,
+                    request.url,
+                    response,
+                    monotonic() - start - waited,
+                    waited=waited,
+                    retries=retries,
+                    body=request.body,
+                )
+
+    def get_circuit_breaker(self, url):
+        """
+        Get the circuit breaker of the host of a URL.
+
+        :param str url: The URL
+        :return: The circuit breaker
+        :rtype: CircuitBreaker
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        with self._circuit_breakers_lock:
+            if host not in self.circuit_breakers:
+                self.circuit_breakers[host] = CircuitBreaker(
+                    host,
+                    self.retry_policy.failure_threshold,
+                    self.retry_policy.cooldown,
+                )
+            return self.circuit_breakers[host]
+
+    def _can_retry(self, request, retries, start, outcome):
+        """
+        Get if a request may be sent again.
+
+        :param requests.PreparedRequest request: The sent request
+        :param int retries: The times the request was retried so far
+        :param float start: The monotonic time of its first attempt
+        :param outcome: The response, or the error raised when sending it
+        :return: The request may be retried
+        :rtype: bool
+        """
+        if not isinstance(request.body, (str, bytes, type(None))):
+            return False
+        if isinstance(outcome, Exception):
+            transient = request.method in IDEMPOTENT_METHODS or is_unsent(
+                outcome
+            )
+        elif outcome.status_code == RATE_LIMITED_STATUS:
+            return retries < MAX_RATE_LIMITED_RETRIES
+        else:
+            transient = (
+                outcome.status_code in SERVER_ERROR_STATUSES
+                and request.method in IDEMPOTENT_METHODS
+            )
+        return transient and self.retry_policy.can_retry(retries, start)
+
+
+def mount_rate_limiter(session, rate_limiter, **kwargs):
+    """
+    Route all requests of a session through a rate limiter.
+
+    Extra keyword arguments, e.g. ``retry_policy``, ``metrics`` and ``api``
+    or the pool sizes, are passed to the adapter.
+
+    :param requests.Session session: The session to limit
+    :param AdaptiveRateLimiter rate_limiter: The shared rate limiter
+    :return: The mounted adapter
+    :rtype: RateLimitedAdapter
+    """
+    adapter = RateLimitedAdapter(rate_limiter, **kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+def _parse_delay(value):
+    """
+    Parse a ``Retry-After`` header.
+
+    :param str value: Seconds or an HTTP date
+    :return: The delay in seconds
+    :rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, delay) if math.isfinite(delay) else None
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_remaining(value):
+    """
+    Parse a ``X-RateLimit-Remaining`` header.
+
+    :param str value: The header value
+    :return: The requests left until the reset, None if it is malformed
+    :rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        remaining = float(value)
+    except ValueError:
+        logger.debug(f"Ignoring malformed X-RateLimit-Remaining {value!r}")
+        return None
+    return remaining if math.isfinite(remaining) else None
+
+
+def _parse_reset(value):
+    """
+    Parse a ``X-RateLimit-Reset`` header.
+
+    ClickUp sends the reset as epoch seconds while JIRA sends an ISO 8601
+    timestamp.
+
+    :param str value: The header value
+    :return: The seconds left until the reset
+    :rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        try:
+            reset = datetime.fromisoformat(
+                value.replace("Z", "+00:00")
+            ).timestamp()
+        except ValueError:
+            return None
+    if not math.isfinite(reset):
+        return None
+    return max(0.0, reset - time())
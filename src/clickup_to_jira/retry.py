@@ -0,0 +1,314 @@
+import os
+import random
+from logging import getLogger
+from threading import Lock
+from time import monotonic, sleep
+
+from jira.exceptions import JIRAError
+from requests.exceptions import (
+    ConnectionError as RequestsConnectionError,
+    ConnectTimeout,
+    HTTPError,
+    Timeout,
+)
+from urllib3.exceptions import NewConnectionError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+logger = getLogger(__name__)
+
+RETRIES = 5
+BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+MAX_ELAPSED = 120.0
+RECOVERY_POLLS = 3
+FAILURE_THRESHOLD = 10
+COOLDOWN = 30.0
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# The connection errors and timeouts of the optional async client
+HTTPX_TRANSPORT_ERRORS = (httpx.TransportError,) if httpx else ()
+# Its errors raised before a request reached the server
+HTTPX_UNSENT_ERRORS = (
+    (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    if httpx
+    else ()
+)
+
+
+class CircuitOpenError(RequestsConnectionError):
+    """
+    A host failed too often and requests to it are failing fast.
+    """
+
+
+class RetryPolicy:
+    """
+    Class responsible for deciding when and how late failed calls are
+    retried.
+
+    Delays grow exponentially from ``backoff`` up to ``max_backoff`` and are
+    drawn uniformly below that bound, so concurrent callers do not retry in
+    lockstep. Calls are retried at most ``retries`` times and never after
+    ``max_elapsed`` seconds since their first attempt. The outcome of a
+    failed attempt is looked for ``recovery_polls`` times before retrying.
+    """
+
+    def __init__(
+        self,
+        retries=RETRIES,
+        backoff=BACKOFF,
+        max_backoff=MAX_BACKOFF,
+        max_elapsed=MAX_ELAPSED,
+        failure_threshold=FAILURE_THRESHOLD,
+        cooldown=COOLDOWN,
+        recovery_polls=RECOVERY_POLLS,
+    ):
+        """
+        Initialize the policy.
+
+        :param int retries: The maximum number of retries of a call
+        :param float backoff: The bound of the first delay in seconds
+        :param float max_backoff: The maximum bound of a delay in seconds
+        :param float max_elapsed: The time after which a call is not retried
+            anymore in seconds
+        :param int failure_threshold: The consecutive failures after which
+            the circuit breaker of a host opens
+        :param float cooldown: The time an open circuit breaker fails fast
+            in seconds
+        :param int recovery_polls: The times the outcome of a failed attempt
+            is looked for before retrying
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.recovery_polls = recovery_polls
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a policy from the ``MIGRATION_RETRY_*`` environment variables.
+
+        :return: The policy
+        :rtype: RetryPolicy
+        """
+        return cls(
+            retries=int(os.getenv("MIGRATION_RETRIES", RETRIES)),
+            backoff=float(os.getenv("MIGRATION_RETRY_BACKOFF", BACKOFF)),
+            max_elapsed=float(
+                os.getenv("MIGRATION_RETRY_MAX_ELAPSED", MAX_ELAPSED)
+            ),
+            failure_threshold=int(
+                os.getenv(
+                    "MIGRATION_CIRCUIT_BREAKER_THRESHOLD", FAILURE_THRESHOLD
+                )
+            ),
+            cooldown=float(
+                os.getenv("MIGRATION_CIRCUIT_BREAKER_COOLDOWN", COOLDOWN)
+            ),
+            recovery_polls=int(
+                os.getenv("MIGRATION_RECOVERY_POLLS", RECOVERY_POLLS)
+            ),
+        )
+
+    def can_retry(self, retries, start):
+        """
+        Get if a failed call may be retried.
+
+        :param int retries: The times the call was retried so far
+        :param float start: The monotonic time of its first attempt
+        :return: The call may be retried
+        :rtype: bool
+        """
+        return (
+            retries < self.retries and monotonic() - start < self.max_elapsed
+        )
+
+    def get_delay(self, retries):
+        """
+        Get the delay before a retry.
+
+        :param int retries: The times the call was retried so far
+        :return: The delay in seconds
+        :rtype: float
+        """
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2**retries)
+        )
+
+    def get_poll_delay(self, polls):
+        """
+        Get the delay before looking for the outcome of a failed attempt
+        again.
+
+        :param int polls: The times it was looked for so far
+        :return: The delay in seconds
+        :rtype: float
+        """
+        return min(self.max_backoff, self.backoff * 2**polls)
+
+    def poll(self, recover):
+        """
+        Look for the outcome of a failed attempt.
+
+        Searches may lag behind the writes they look for, so it is looked
+        for again with growing delays before giving up.
+
+        :param callable recover: Returns the outcome of a failed attempt, or
+            None
+        :return: The outcome, if it was found
+        """
+        for polls in range(self.recovery_polls):
+            if polls:
+                sleep(self.get_poll_delay(polls))
+            result = recover()
+            if result is not None:
+                return result
+        return None
+
+    def run(self, function, *args, recover=None, **kwargs):
+        """
+        Call a function, retrying it after transient errors.
+
+        Before every retry, ``recover`` is polled for the outcome of a failed
+        attempt that may have reached the server anyway, e.g. an issue whose
+        creation response was lost. Its result is returned if it found one.
+
+        :param callable function: The function to call
+        :param callable recover: Returns the outcome of a failed attempt, or
+            None
+        :return: The result of the function
+        :raises Exception: The last error, once it is not transient or the
+            retries are exhausted
+        """
+        retries = 0
+        start = monotonic()
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as error:  # pylint: disable=broad-except
+                if not is_transient(error) or not self.can_retry(
+                    retries, start
+                ):
+                    raise
+                delay = self.get_delay(retries)
+                logger.warning(f"{error}. Retrying in {delay:.1f}s")
+            sleep(delay)
+            retries += 1
+            if recover is not None:
+                result = self.poll(recover)
+                if result is not None:
+                    return result
+
+
+class CircuitBreaker:
+    """
+    Class responsible for failing fast while a host keeps failing.
+
+    The circuit opens after ``failure_threshold`` consecutive failures.
+    Requests then fail with :class:`CircuitOpenError` until ``cooldown``
+    seconds passed, after which a single request probes the host. It closes
+    the circuit if it succeeds and opens it again otherwise.
+    """
+
+    def __init__(
+        self, host, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN
+    ):
+        """
+        Initialize the circuit breaker.
+
+        :param str host: The host, for logging
+        :param int failure_threshold: The consecutive failures opening the
+            circuit
+        :param float cooldown: The time the circuit stays open in seconds
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at = None
+        self._lock = Lock()
+
+    def before_request(self):
+        """
+        Check that a request may be sent.
+
+        :raises CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if monotonic() - self._opened_at < self.cooldown:
+                raise CircuitOpenError(
+                    f"{self.host} failed {self.failures} times in a row"
+                )
+            # Let a single request probe the host
+            self._opened_at = monotonic()
+
+    def record_success(self):
+        """
+        Record a request the host answered.
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"{self.host} recovered")
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """
+        Record a request the host failed.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"{self.host} failed {self.failures} times in a row. "
+                        f"Pausing requests to it for {self.cooldown}s"
+                    )
+                self._opened_at = monotonic()
+
+
+def is_transient(error):
+    """
+    Get if an error may go away when the call is retried.
+
+    :param Exception error: The error
+    :return: The error is a connection error, a timeout or a response
+        with a transient status
+    :rtype: bool
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(
+        error, (RequestsConnectionError, Timeout, *HTTPX_TRANSPORT_ERRORS)
+    ):
+        return True
+    if isinstance(error, JIRAError):
+        return error.status_code in TRANSIENT_STATUSES
+    if isinstance(error, HTTPError) and error.response is not None:
+        return error.response.status_code in TRANSIENT_STATUSES
+    return False
+
+
+def is_unsent(error):
+    """
+    Get if a request failed before reaching the server.
+
+    Such requests can be retried whatever their method.
+
+    :param Exception error: The error raised when sending the request
+    :return: The connection could not be established
+    :rtype: bool
+    """
+    if isinstance(error, (ConnectTimeout, *HTTPX_UNSENT_ERRORS)):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
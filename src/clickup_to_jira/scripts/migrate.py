@@ -1,35 +1,151 @@
+import argparse
+import asyncio
 import os
 
+from clickup_to_jira.config import ConfigError, load_config
 from clickup_to_jira.converter import ClickUpToJIRAConverter
-from clickup_to_jira.handlers import ClickUpHandler, JIRAHandler
+from clickup_to_jira.handlers import (
+    AsyncClickUpHandler,
+    AsyncJIRAHandler,
+    ClickUpHandler,
+    JIRAHandler,
+)
+from clickup_to_jira.metrics import MigrationMetrics
+from clickup_to_jira.pipeline import MigrationPipeline
+from clickup_to_jira.plan import MigrationPlanner
+from clickup_to_jira.profiling import PhaseProfiler
+from clickup_to_jira.shards import migrate_team
+from clickup_to_jira.sync import DeltaSync
 from clickup_to_jira.utils import initialize_logging
 
 
-def main():
+def main(argv=None):
     """
     Create JIRA issues from ClickUp tasks.
+
+    :param list(str) argv: The command line arguments, sys.argv if None
     """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip())
+    parser.add_argument(
+        "--profile",
+        metavar="DIRECTORY",
+        help="profile every phase of the migration and save the profiles "
+        "and a summary to DIRECTORY",
+    )
+    args = parser.parse_args(argv)
+
     # Initialize logging
     initialize_logging()
 
+    # Record the outbound calls if configured
+    metrics = None
+    if os.getenv("MIGRATION_METRICS") or os.getenv("MIGRATION_METRICS_PORT"):
+        metrics = MigrationMetrics()
+        if os.getenv("MIGRATION_METRICS_PORT"):
+            metrics.serve(int(os.getenv("MIGRATION_METRICS_PORT")))
+
+    # Profile every phase if requested
+    profiler = PhaseProfiler(args.profile).start() if args.profile else None
+
+    try:
+        migrate(metrics, profiler)
+    finally:
+        if profiler is not None:
+            profiler.close()
+        if metrics is not None:
+            metrics.close()
+            metrics.report(os.getenv("MIGRATION_METRICS"))
+
+
+def migrate(metrics=None, profiler=None):
+    """
+    Run the configured kind of migration.
+
+    :param MigrationMetrics metrics: The metrics recording every call
+    :param PhaseProfiler profiler: The profiler of the migration phases
+    """
+    # Run headless if configured
+    config_path = os.getenv("MIGRATION_CONFIG")
+    config = load_config(config_path) if config_path else None
+
     # Initialize handlers
-    click_up_handler = ClickUpHandler(os.getenv("CLICKUP_API_KEY"))
+    click_up_handler = ClickUpHandler(
+        os.getenv("CLICKUP_API_KEY"), config=config, metrics=metrics
+    )
+    try:
+        migrate_from(click_up_handler, config, metrics, profiler)
+    finally:
+        click_up_handler.close()
+
+
+def migrate_from(click_up_handler, config=None, metrics=None, profiler=None):
+    """
+    Run the configured kind of migration from a ClickUp handler.
+
+    :param ClickUpHandler click_up_handler: The ClickUp handler
+    :param MigrationConfig config: The config of the migration, if headless
+    :param MigrationMetrics metrics: The metrics recording every call
+    :param PhaseProfiler profiler: The profiler of the migration phases
+    """
+    # Migrate every list of the team in worker processes if configured
+    shard_workers = os.getenv("MIGRATION_SHARD_WORKERS")
+    if shard_workers:
+        if config is None:
+            raise ConfigError("Team migrations require MIGRATION_CONFIG")
+        migrate_team(
+            click_up_handler, config, int(shard_workers), metrics=metrics
+        )
+        return
+
     jira_handler = JIRAHandler(
         os.getenv("JIRA_URL"),
         basic_auth=(os.getenv("JIRA_USER"), os.getenv("JIRA_API_KEY")),
+        config=config,
+        metrics=metrics,
     )
 
     # Setup Converter
     converter = ClickUpToJIRAConverter(click_up_handler, jira_handler)
+    if profiler is not None:
+        profiler.instrument(click_up_handler, converter, jira_handler)
+
+    # Only sync the changes since the previous run if configured
+    if os.getenv("MIGRATION_SYNC"):
+        DeltaSync(click_up_handler, converter, jira_handler).run()
+        return
+
+    # Stream tickets from ClickUp to JIRA if configured
+    if os.getenv("MIGRATION_STREAMING"):
+        MigrationPipeline(click_up_handler, converter, jira_handler).run()
+        return
 
     # Get tickets from ClickUp
-    tickets = click_up_handler.get_click_up_tickets()
+    if os.getenv("CLICKUP_ASYNC"):
+        async_click_up_handler = AsyncClickUpHandler(click_up_handler)
+        if profiler is not None:
+            profiler.instrument(async_click_up_handler)
+        tickets = asyncio.run(async_click_up_handler.get_click_up_tickets())
+    else:
+        tickets = click_up_handler.get_click_up_tickets()
 
     # Convert them to JIRA tickets
     new_tickets = converter.convert(tickets)
 
+    # Only estimate the migration if configured
+    if os.getenv("MIGRATION_PLAN"):
+        MigrationPlanner(
+            jira_handler, int(os.getenv("MIGRATION_PLAN_SAMPLES", 0))
+        ).plan(new_tickets).log()
+        return
+
     # Create JIRA tickets
-    jira_handler.create_jira_issues(new_tickets)
+    if os.getenv("JIRA_ASYNC"):
+        async_jira_handler = AsyncJIRAHandler(jira_handler)
+        if profiler is not None:
+            profiler.instrument(async_jira_handler)
+        asyncio.run(async_jira_handler.create_jira_issues(new_tickets))
+    else:
+        jira_handler.create_jira_issues(new_tickets)
 
 
 if __name__ == "__main__":  # pragma: no cover
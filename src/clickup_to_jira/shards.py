@@ -0,0 +1,267 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from logging import getLogger
+from time import monotonic
+
+from clickup_to_jira.converter import ClickUpToJIRAConverter
+from clickup_to_jira.handlers import ClickUpHandler, JIRAHandler
+from clickup_to_jira.metrics import MigrationMetrics
+from clickup_to_jira.utils import get_item_by_name, initialize_logging
+
+logger = getLogger(__name__)
+
+SHARD_WORKERS = 4
+
+
+@dataclass
+class Shard:
+    """
+    Class responsible for hosting a ClickUp list migrated by a worker
+    """
+
+    space: str
+    project: str
+    list: str
+    jira_project: str
+
+    @property
+    def name(self):
+        """
+        Get the path of the list in the ClickUp team.
+
+        :return: The shard name
+        :rtype: str
+        """
+        return f"{self.space}/{self.project}/{self.list}"
+
+
+@dataclass
+class ShardResult:
+    """
+    Class responsible for hosting the outcome of a migrated shard
+    """
+
+    shard: str
+    tickets: int = 0
+    created: int = 0
+    seconds: float = 0.0
+    error: str = None
+    metrics: MigrationMetrics = None
+
+
+@dataclass
+class TeamReport:
+    """
+    Class responsible for aggregating the outcome of all shards
+    """
+
+    results: list = field(default_factory=list)
+
+    @property
+    def tickets(self):
+        """
+        Get the tickets read from all shards.
+
+        :rtype: int
+        """
+        return sum(result.tickets for result in self.results)
+
+    @property
+    def created(self):
+        """
+        Get the issues created from all shards.
+
+        :rtype: int
+        """
+        return sum(result.created for result in self.results)
+
+    @property
+    def failures(self):
+        """
+        Get the shards that could not be migrated.
+
+        :rtype: list(ShardResult)
+        """
+        return [result for result in self.results if result.error]
+
+    def log(self):
+        """
+        Log the outcome of the team migration.
+        """
+        for result in self.results:
+            logger.info(
+                f"Shard {result.shard}: created {result.created} of "
+                f"{result.tickets} issues in {result.seconds:.1f}s"
+            )
+        logger.info(
+            f"Created {self.created} of {self.tickets} issues from "
+            f"{len(self.results)} shards with {len(self.failures)} failures."
+        )
+        for failure in self.failures:
+            logger.warning(
+                f"Failed to migrate {failure.shard}: {failure.error}"
+            )
+
+
+def get_shards(click_up_handler, config):
+    """
+    Get every list of the configured ClickUp team.
+
+    The configured space and project, if any, restrict the shards.
+
+    :param ClickUpHandler click_up_handler: The ClickUp handler
+    :param MigrationConfig config: The config of the migration
+    :return: The shards
+    :rtype: list(Shard)
+    """
+    team = get_item_by_name("team", click_up_handler.teams, config.team)
+    shards = []
+    for space in team.spaces:
+        if config.space and space.name != config.space:
+            continue
+        for project in space.projects:
+            if config.project and project.name != config.project:
+                continue
+            for lst in project.lists:
+                shards.append(
+                    Shard(
+                        space=space.name,
+                        project=project.name,
+                        list=lst.name,
+                        jira_project=get_jira_project(
+                            config, space.name, project.name, lst.name
+                        ),
+                    )
+                )
+    return shards
+
+
+def get_jira_project(config, space, project, lst):
+    """
+    Get the JIRA project a ClickUp list is migrated to.
+
+    The most specific of ``space/project/list``, ``space/project`` and
+    ``space`` in the configured projects wins.
+
+    :param MigrationConfig config: The config of the migration
+    :param str space: The ClickUp space name
+    :param str project: The ClickUp project name
+    :param str lst: The ClickUp list name
+    :return: The JIRA project key or name
+    :rtype: str
+    """
+    for path in (f"{space}/{project}/{lst}", f"{space}/{project}", space):
+        if path in config.jira_projects:
+            return config.jira_projects[path]
+    return config.jira_project
+
+
+def migrate_shard(shard, config, share=1.0, record_metrics=False):
+    """
+    Migrate a ClickUp list in a worker process.
+
+    Every worker has its own handlers, so no state is shared between shards.
+
+    :param Shard shard: The ClickUp list to migrate
+    :param MigrationConfig config: The config of the migration
+    :param float share: The fraction of the API rate limits of the worker
+    :param bool record_metrics: Record the calls of the shard in its result
+    :return: The outcome of the shard
+    :rtype: ShardResult
+    """
+    started = monotonic()
+    metrics = MigrationMetrics() if record_metrics else None
+    shard_config = replace(
+        config,
+        space=shard.space,
+        project=shard.project,
+        list=shard.list,
+        jira_project=shard.jira_project,
+    )
+    click_up_handler = None
+    try:
+        click_up_handler = ClickUpHandler(
+            os.getenv("CLICKUP_API_KEY"),
+            config=shard_config,
+            metrics=metrics,
+            rate_limit_share=share,
+            shard=shard.name,
+        )
+        jira_handler = JIRAHandler(
+            os.getenv("JIRA_URL"),
+            basic_auth=(os.getenv("JIRA_USER"), os.getenv("JIRA_API_KEY")),
+            config=shard_config,
+            metrics=metrics,
+            rate_limit_share=share,
+        )
+        converter = ClickUpToJIRAConverter(click_up_handler, jira_handler)
+        tickets = converter.convert(click_up_handler.get_click_up_tickets())
+        issues = jira_handler.create_jira_issues(tickets)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception(f"Failed to migrate {shard.name}")
+        return ShardResult(
+            shard=shard.name,
+            seconds=monotonic() - started,
+            error=str(error),
+            metrics=metrics,
+        )
+    finally:
+        if click_up_handler is not None:
+            click_up_handler.close()
+
+    return ShardResult(
+        shard=shard.name,
+        tickets=len(tickets),
+        created=len([issue for issue in issues if issue]),
+        seconds=monotonic() - started,
+        metrics=metrics,
+    )
+
+
+def migrate_team(
+    click_up_handler, config, workers=SHARD_WORKERS, metrics=None
+):
+    """
+    Migrate every list of the configured ClickUp team in worker processes.
+
+    The API rate limits are split evenly between the busy workers.
+
+    :param ClickUpHandler click_up_handler: The ClickUp handler
+    :param MigrationConfig config: The config of the migration
+    :param int workers: The number of worker processes
+    :param MigrationMetrics metrics: The metrics the calls of every shard are
+        added to, if any
+    :return: The aggregated outcome of all shards
+    :rtype: TeamReport
+    """
+    shards = get_shards(click_up_handler, config)
+    workers = max(1, min(workers, len(shards)))
+    logger.info(f"Migrating {len(shards)} shards with {workers} workers.")
+
+    # Flush the lookups the workers replay from the snapshot
+    click_up_handler.close()
+
+    report = TeamReport()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initialize_logging
+    ) as executor:
+        futures = [
+            executor.submit(
+                migrate_shard,
+                shard,
+                config,
+                1 / workers,
+                metrics is not None,
+            )
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if metrics is not None and result.metrics is not None:
+                metrics.merge(result.metrics)
+                result.metrics = None
+            report.results.append(result)
+
+    report.log()
+    return report
@@ -0,0 +1,174 @@
+import gzip
+import json
+import os
+import zlib
+from glob import glob
+from logging import getLogger
+from threading import Lock
+from time import time
+from urllib.parse import quote
+
+logger = getLogger(__name__)
+
+# Subdirectory of the files written by the workers of a team migration
+SHARDS_DIRECTORY = "shards"
+
+
+class SnapshotMiss(LookupError):
+    """
+    Raised when an offline snapshot lacks a requested payload.
+    """
+
+
+class SnapshotCache:
+    """
+    Class responsible for keeping raw ClickUp payloads on disk.
+
+    Every kind of payload, e.g. the tasks of a list or the comments of a
+    task, lives in its own gzip compressed JSONL file where each line holds
+    a key, the time it was fetched and the payload. Refreshed payloads are
+    appended through a writer kept open per file until the cache is closed,
+    and the latest line of a key wins.
+
+    Worker processes of a team migration write to their own subdirectory,
+    so they never append to the same file, and every cache reads the files
+    of all of them.
+    """
+
+    def __init__(self, directory, max_age=None, offline=False, shard=None):
+        """
+        Initialize the cache.
+
+        :param str directory: The directory holding the snapshot files
+        :param float max_age: The seconds after which payloads are stale,
+            if they ever are
+        :param bool offline: Payloads are only read from the snapshot
+        :param str shard: The shard whose payloads are written, if the cache
+            belongs to a worker process
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.offline = offline
+        self.shard = shard
+        self._write_directory = directory
+        if shard is not None:
+            self._write_directory = os.path.join(
+                directory, SHARDS_DIRECTORY, quote(shard, safe="")
+            )
+        self._entries = {}
+        self._writers = {}
+        self._lock = Lock()
+        os.makedirs(self._write_directory, exist_ok=True)
+
+    def _get_path(self, kind):
+        """
+        Get the file payloads of a kind are written to.
+
+        :param str kind: The kind of payload
+        :return: The file path
+        :rtype: str
+        """
+        return os.path.join(self._write_directory, f"{kind}.jsonl.gz")
+
+    def _get_paths(self, kind):
+        """
+        Get the files holding payloads of a kind, those of shards last.
+
+        :param str kind: The kind of payload
+        :return: The file paths
+        :rtype: list(str)
+        """
+        file_name = f"{kind}.jsonl.gz"
+        return [os.path.join(self.directory, file_name)] + sorted(
+            glob(
+                os.path.join(self.directory, SHARDS_DIRECTORY, "*", file_name)
+            )
+        )
+
+    def _load(self, kind):
+        """
+        Load the entries of a kind of payload once.
+
+        A line cut short by an interrupted run ends its file. The most
+        recently fetched payload of a key wins across files.
+
+        :param str kind: The kind of payload
+        :return: The entries by key
+        :rtype: dict
+        """
+        if kind in self._entries:
+            return self._entries[kind]
+
+        entries = {}
+        for path in self._get_paths(kind):
+            if not os.path.exists(path):
+                continue
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        previous = entries.get(entry["key"])
+                        if (
+                            previous is None
+                            or previous["fetched"] <= entry["fetched"]
+                        ):
+                            entries[entry["key"]] = entry
+            except (EOFError, OSError, zlib.error, ValueError):
+                logger.warning(f"Ignoring the truncated end of {path}")
+        self._entries[kind] = entries
+        return entries
+
+    def get(self, kind, key, updated_at=None):
+        """
+        Get a payload from the snapshot.
+
+        :param str kind: The kind of payload
+        :param str key: The list, task or path the payload belongs to
+        :param float updated_at: The POSIX time the payload last changed in
+            ClickUp, if known, so older payloads are stale
+        :return: The payload, unless it is missing or stale
+        :raises SnapshotMiss: If offline and the payload is missing
+        """
+        key = str(key)
+        with self._lock:
+            entry = self._load(kind).get(key)
+        if self.offline:
+            if entry is None:
+                raise SnapshotMiss(f"No {kind} for {key} in the snapshot")
+            return entry["payload"]
+        if entry is None:
+            return None
+        if self.max_age is not None and time() - entry["fetched"] > (
+            self.max_age
+        ):
+            return None
+        if updated_at is not None and entry["fetched"] < updated_at:
+            return None
+        return entry["payload"]
+
+    def put(self, kind, key, payload):
+        """
+        Add a payload to the snapshot.
+
+        :param str kind: The kind of payload
+        :param str key: The list, task or path the payload belongs to
+        :param payload: The JSON serializable payload
+        """
+        entry = {"key": str(key), "fetched": time(), "payload": payload}
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._load(kind)[entry["key"]] = entry
+            if kind not in self._writers:
+                self._writers[kind] = gzip.open(
+                    self._get_path(kind), "at", encoding="utf-8"
+                )
+            self._writers[kind].write(line)
+
+    def close(self):
+        """
+        Flush and close the snapshot files.
+        """
+        with self._lock:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
@@ -0,0 +1,138 @@
+import sqlite3
+from logging import getLogger
+from threading import Lock
+
+logger = getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    task_id TEXT PRIMARY KEY,
+    issue_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    task_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    PRIMARY KEY (task_id, step)
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    container_id TEXT PRIMARY KEY,
+    updated_at INTEGER NOT NULL
+);
+"""
+
+
+class MigrationState:
+    """
+    Class responsible for recording the progress of a migration in SQLite.
+
+    Every ClickUp task is mapped to the JIRA issue created from it, along with
+    the follow-up steps completed for that issue, so an interrupted run can
+    resume exactly where it stopped. Delta syncs record how far every
+    ClickUp project or list was synced.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the state store.
+
+        :param str path: The SQLite database file
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = Lock()
+
+    def get_issue_key(self, task_id):
+        """
+        Get the key of the JIRA issue created from a ClickUp task.
+
+        :param str task_id: The ClickUp task id
+        :return: The JIRA issue key if the task was migrated
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT issue_key FROM issues WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def record_issue(self, task_id, issue_key):
+        """
+        Record the JIRA issue created from a ClickUp task.
+
+        :param str task_id: The ClickUp task id
+        :param str issue_key: The JIRA issue key
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO issues (task_id, issue_key) "
+                "VALUES (?, ?)",
+                (task_id, issue_key),
+            )
+
+    def is_done(self, task_id, step):
+        """
+        Get if a step was completed for a ClickUp task.
+
+        :param str task_id: The ClickUp task id
+        :param str step: The step name
+        :return: The step was completed
+        :rtype: bool
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM steps WHERE task_id = ? AND step = ?",
+                (task_id, step),
+            ).fetchone()
+        return row is not None
+
+    def record_step(self, task_id, step):
+        """
+        Record a completed step for a ClickUp task.
+
+        :param str task_id: The ClickUp task id
+        :param str step: The step name
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO steps (task_id, step) VALUES (?, ?)",
+                (task_id, step),
+            )
+
+    def get_watermark(self, container_id):
+        """
+        Get the last update of a ClickUp project or list already synced.
+
+        :param str container_id: The ClickUp project or list id
+        :return: The POSIX timestamp in milliseconds, if ever synced
+        :rtype: int
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT updated_at FROM watermarks WHERE container_id = ?",
+                (container_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, container_id, updated_at):
+        """
+        Record the last update of a ClickUp project or list already synced.
+
+        :param str container_id: The ClickUp project or list id
+        :param int updated_at: The POSIX timestamp in milliseconds
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO watermarks (container_id, updated_at) "
+                "VALUES (?, ?)",
+                (container_id, updated_at),
+            )
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from logging import getLogger
+from threading import Lock
+
+logger = getLogger(__name__)
+
+PAGE_SIZE = 100
+
+
+class SummaryIndex:
+    """
+    Class responsible for indexing the issues of a JIRA project by summary.
+
+    The index replaces the fuzzy ``summary ~`` JQL searches with exact,
+    in-memory lookups. It is kept up to date as issues are created.
+    """
+
+    def __init__(self, project):
+        """
+        Initialize the index.
+
+        :param str project: The project the indexed issues belong to
+        """
+        self.project = project
+        self._issues = defaultdict(list)
+        self._lock = Lock()
+
+    def load(self, jira, page_size=PAGE_SIZE):
+        """
+        Page through every issue of the project.
+
+        :param JIRA jira: The JIRA client
+        :param int page_size: The issues to request per page
+        :return: The loaded index
+        :rtype: SummaryIndex
+        """
+        jql = f'project = "{self.project}" ORDER BY created ASC'
+        start = 0
+        while True:
+            issues = jira.search_issues(
+                jql,
+                startAt=start,
+                maxResults=page_size,
+                fields="summary,parent",
+            )
+            for issue in issues:
+                self.add(issue)
+            start += len(issues)
+            if not issues or start >= issues.total:
+                break
+        logger.info(f"Indexed {start} issues of project {self.project}")
+        return self
+
+    def add(self, issue, summary=None):
+        """
+        Add an issue to the index.
+
+        :param jira.issue issue: The issue to add
+        :param str summary: The summary of the issue, if its fields were not
+            fetched
+        """
+        summary = summary if summary is not None else issue.fields.summary
+        with self._lock:
+            self._issues[summary].append(issue)
+
+    def get(self, summary):
+        """
+        Get the issues with exactly the given summary.
+
+        :param str summary: The summary string
+        :return: The matching issues
+        :rtype: list(jira.issue)
+        """
+        with self._lock:
+            return list(self._issues.get(summary, []))
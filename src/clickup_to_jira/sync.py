@@ -0,0 +1,103 @@
+import os
+from logging import getLogger
+
+from jira.exceptions import JIRAError
+
+from clickup_to_jira.config import ConfigError
+from clickup_to_jira.state import MigrationState
+from clickup_to_jira.task_graph import TaskGraph
+
+logger = getLogger(__name__)
+
+
+class DeltaSync:
+    """
+    Class responsible for syncing ClickUp changes to migrated JIRA issues.
+
+    Only the tasks updated since the previous sync of the selected ClickUp
+    project or list are fetched. The JIRA issues of migrated tasks are
+    updated through the task to issue mapping of the state store and new
+    tasks are created. The first sync migrates every task.
+    """
+
+    def __init__(self, click_up_handler, converter, jira_handler):
+        """
+        Initialize the sync.
+
+        :param ClickUpHandler click_up_handler: The ClickUp handler
+        :param ClickUpToJIRAConverter converter: The ticket converter
+        :param JIRAHandler jira_handler: The JIRA handler
+        """
+        self.click_up = click_up_handler
+        self.converter = converter
+        self.jira = jira_handler
+        self.state_path = os.getenv("MIGRATION_STATE_DB")
+
+    def run(self):
+        """
+        Sync the changes of the selected ClickUp tasks to JIRA.
+
+        The watermark only moves once every change was synced, so a failed
+        sync is retried by the next one.
+
+        :return: The number of synced tickets
+        :rtype: int
+        :raises ConfigError: If there is no state store
+        """
+        if not self.state_path:
+            raise ConfigError("Syncing requires MIGRATION_STATE_DB")
+
+        _, container = self.click_up.select_task_container()
+        state = MigrationState(self.state_path)
+        try:
+            since = state.get_watermark(container.id)
+            tasks = self.click_up.get_updated_tasks(container, since)
+            logger.info(f"Found {len(tasks)} tasks updated since {since}.")
+            if not tasks:
+                return 0
+
+            # Parents left out of the update are replaced by None
+            parent_ids = {task.id: task.parent for task in tasks}
+            tasks = self.click_up.add_comments_to_tasks(tasks)
+            graph = TaskGraph(tasks)
+            graph.resolve_parents()
+            tickets = self.converter.convert(graph.ordered())
+            for ticket in tickets:
+                self.attach_migrated_parent(
+                    ticket, parent_ids.get(ticket.id), state
+                )
+
+            self.jira.sync_jira_issues(tickets)
+            watermark = max(
+                filter(None, map(self.click_up.get_updated_at, tasks)),
+                default=since,
+            )
+            if watermark is not None:
+                state.set_watermark(container.id, watermark)
+        finally:
+            state.close()
+
+        logger.info(f"Synced {len(tickets)} tickets to JIRA.")
+        return len(tickets)
+
+    def attach_migrated_parent(self, ticket, parent_id, state):
+        """
+        Attach a ticket to the migrated issue of a parent left out of the
+        update.
+
+        :param Ticket ticket: The ticket
+        :param str parent_id: The id of the parent ClickUp task, if any
+        :param MigrationState state: The state store
+        """
+        if ticket.parent or not parent_id:
+            return
+        issue_key = state.get_issue_key(parent_id)
+        if issue_key is None:
+            return
+        try:
+            parent = self.jira.issue(issue_key, fields="summary")
+        except JIRAError:
+            logger.warning(f"Cannot find the parent {issue_key}")
+            return
+        ticket.parent = parent.fields.summary
+        ticket.parent_id = parent_id
@@ -0,0 +1,122 @@
+from collections import deque
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+class TaskGraph:
+    """
+    Class responsible for indexing ClickUp tasks by their parent relations.
+
+    The graph is built once in linear time and answers parent, children and
+    depth lookups with dictionary accesses.
+    """
+
+    def __init__(self, tasks, parent_attribute="parent"):
+        """
+        Initialize the graph.
+
+        :param list(Task) tasks: The ClickUp tasks
+        :param str parent_attribute: The task attribute holding the id of the
+            parent task, ``parent_id`` for tasks whose parents were resolved
+        """
+        self.tasks = list(tasks)
+        self.index = {task.id: task for task in self.tasks}
+        self.children = {task.id: [] for task in self.tasks}
+        self.roots = []
+        self._parents = {}
+        self._depths = None
+
+        for task in self.tasks:
+            parent_id = _get_parent_id(task, parent_attribute)
+            if parent_id in self.index and parent_id != task.id:
+                self._parents[task.id] = parent_id
+                self.children[parent_id].append(task)
+            else:
+                self.roots.append(task)
+
+    def parent_of(self, task):
+        """
+        Get the parent of a task.
+
+        :param Task task: The task
+        :return: The parent task if it was fetched
+        :rtype: Task
+        """
+        parent_id = self._parents.get(task.id)
+        return self.index[parent_id] if parent_id else None
+
+    def depth(self, task):
+        """
+        Get the nesting depth of a task.
+
+        :param Task task: The task
+        :return: Zero for root tasks, one for their subtasks and so on
+        :rtype: int
+        """
+        if self._depths is None:
+            self.ordered()
+        return self._depths[task.id]
+
+    def ordered(self):
+        """
+        Get the tasks ordered level by level.
+
+        Every task comes after its parent whatever the nesting depth. Tasks
+        within a level keep their original order.
+
+        :return: The ordered tasks
+        :rtype: list(Task)
+        """
+        depths = {}
+        ordered_tasks = []
+        queue = deque((task, 0) for task in self.roots)
+        while queue:
+            task, depth = queue.popleft()
+            depths[task.id] = depth
+            ordered_tasks.append(task)
+            queue.extend(
+                (child, depth + 1) for child in self.children[task.id]
+            )
+
+        # Tasks in a parent cycle are never reached from a root
+        for task in self.tasks:
+            if task.id not in depths:
+                logger.warning(f"Task {task.id} is part of a parent cycle")
+                depths[task.id] = 0
+                ordered_tasks.append(task)
+
+        self._depths = depths
+        return ordered_tasks
+
+    def resolve_parents(self):
+        """
+        Replace the parent id of every task with the name of its parent.
+
+        The id is kept in ``parent_id``, which later graphs read instead of
+        the name, so resolving the same tasks again keeps their parents.
+        Parents that were not fetched are dropped.
+
+        :return: The updated tasks
+        :rtype: list(Task)
+        """
+        for task in self.tasks:
+            parent = self.parent_of(task)
+            task.parent_id = parent.id if parent else None
+            task.parent = parent.name if parent else None
+        return self.tasks
+
+
+def _get_parent_id(task, parent_attribute):
+    """
+    Get the id of the parent of a task.
+
+    :param Task task: The task
+    :param str parent_attribute: The task attribute holding the id
+    :return: The parent id, if any
+    :rtype: str
+    """
+    # Resolved tasks hold the name of their parent in ``parent``
+    if parent_attribute == "parent" and "parent_id" in vars(task):
+        return task.parent_id
+    return getattr(task, parent_attribute, None)
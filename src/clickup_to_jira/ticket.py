@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -19,3 +19,5 @@ class Ticket:
     parent: str
     comments: list
     url: str
+    parent_id: str = None
+    attachments: list = field(default_factory=list)
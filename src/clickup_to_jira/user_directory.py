@@ -0,0 +1,119 @@
+import json
+import os
+from logging import getLogger
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+logger = getLogger(__name__)
+
+PAGE_SIZE = 100
+
+
+class UserDirectory:
+    """
+    Class responsible for resolving ClickUp users to JIRA account ids.
+
+    Every user is searched in JIRA at most once. Users that cannot be found
+    are remembered as well, so they are not searched again.
+    """
+
+    def __init__(self, jira, path=None):
+        """
+        Initialize the directory.
+
+        :param JIRA jira: The JIRA client
+        :param str path: The file the directory is saved to and loaded from
+        """
+        self.jira = jira
+        self.path = path
+        self._account_ids = {}
+        self._lock = Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def get_account_id(self, user):
+        """
+        Get the JIRA account id of a user.
+
+        :param str user: The email of the user
+        :return: The account id if the user exists in JIRA
+        :rtype: str
+        """
+        if not user:
+            return None
+
+        # ClickUp users may be passed as they come from the converter
+        email = getattr(user, "email", user)
+        with self._lock:
+            if email in self._account_ids:
+                return self._account_ids[email]
+
+        users = self.jira.search_users(user=email)
+        account_id = users[0].accountId if users else None
+        with self._lock:
+            self._account_ids[email] = account_id or None
+        return account_id or None
+
+    def preload(self, page_size=PAGE_SIZE):
+        """
+        Page through every JIRA user and store the ones with a visible email.
+
+        :param int page_size: The users to request per page
+        """
+        start = 0
+        while True:
+            users = self.jira._get_json(
+                "users/search",
+                params={"startAt": start, "maxResults": page_size},
+            )
+            with self._lock:
+                for user in users:
+                    if user.get("emailAddress"):
+                        self._account_ids[user["emailAddress"]] = user[
+                            "accountId"
+                        ]
+            if len(users) < page_size:
+                break
+            start += len(users)
+        logger.info(f"Preloaded {start + len(users)} JIRA users")
+
+    def load(self):
+        """
+        Load the directory from its file.
+        """
+        with open(self.path) as f:
+            account_ids = json.load(f)
+        with self._lock:
+            self._account_ids.update(account_ids)
+        logger.info(f"Loaded {len(account_ids)} JIRA users from {self.path}")
+
+    def save(self):
+        """
+        Save the found users to the directory file.
+
+        Users that were not found are not saved, as they may be created in
+        JIRA before the next run. Users saved by other processes in the
+        meantime are kept, and the file is replaced atomically.
+        """
+        if not self.path:
+            return
+        account_ids = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                account_ids.update(json.load(f))
+        with self._lock:
+            account_ids.update(
+                {
+                    email: account_id
+                    for email, account_id in self._account_ids.items()
+                    if account_id
+                }
+            )
+        with NamedTemporaryFile(
+            "w",
+            dir=os.path.dirname(os.path.abspath(self.path)),
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            json.dump(account_ids, f, indent=2, sort_keys=True)
+        os.replace(f.name, self.path)
@@ -1,6 +1,8 @@
 import logging
 import os
 
+from clickup_to_jira.config import ConfigError
+
 
 def initialize_logging():  # pragma: no cover
     """
@@ -88,3 +90,23 @@ def get_with_to_specify_outcome(name):
             return False
         elif item_input == "N":
             return True
+
+
+def get_item_by_name(name, selection_list, item_name):
+    """
+    Get proper item from list of items by its exact name.
+
+    :param str name: The name of the parameter to be specified.
+    :param list selection_list: The entities to search in.
+    :param str item_name: The name of the item.
+    :return: The proper item
+    :rtype: ClickUp.Team|ClickUp.Space|ClickUp.Project|ClickUp.list
+    :raises ConfigError: If no item has the given name
+    """
+    for item in selection_list:
+        if item.name == item_name:
+            return item
+    raise ConfigError(
+        f"{item_name} is not a valid {name}. Eligible options are "
+        f"{[item.name for item in selection_list]}"
+    )
@@ -0,0 +1,119 @@
+from collections import deque
+from threading import Lock
+
+
+class Workflow:
+    """
+    Class responsible for caching the status graph of a JIRA workflow.
+
+    JIRA only lists the transitions available from the current status of an
+    issue, so the graph is discovered status by status while issues move
+    through it. Every status is explored once per workflow.
+    """
+
+    def __init__(self, initial_status=None):
+        """
+        Initialize the workflow.
+
+        :param str initial_status: The status new issues start in
+        """
+        self.initial_status = initial_status
+        self._transitions = {}
+        self._lock = Lock()
+
+    def is_explored(self, status):
+        """
+        Get if the transitions of a status are known.
+
+        :param str status: The status name
+        :return: The status was explored
+        :rtype: bool
+        """
+        with self._lock:
+            return status in self._transitions
+
+    def add_transitions(self, status, transitions):
+        """
+        Store the transitions available from a status.
+
+        :param str status: The status name
+        :param list(dict) transitions: The transitions as returned by JIRA
+        """
+        with self._lock:
+            self._transitions[status] = {
+                transition["to"]["name"]: transition["id"]
+                for transition in transitions
+            }
+
+    def statuses(self):
+        """
+        Get all statuses known so far.
+
+        :return: The status names
+        :rtype: list(str)
+        """
+        with self._lock:
+            statuses = set(self._transitions)
+            for targets in self._transitions.values():
+                statuses.update(targets)
+        return sorted(statuses)
+
+    def shortest_path(self, source, target):
+        """
+        Get the shortest known transition path between two statuses.
+
+        :param str source: The current status
+        :param str target: The desired status
+        :return: The ``(transition id, status)`` hops, or None if no path is
+            known yet
+        :rtype: list(tuple)
+        """
+        return self._search(source, lambda status: status == target)
+
+    def path_to_unexplored(self, source):
+        """
+        Get the shortest transition path to a status not explored yet.
+
+        :param str source: The current status
+        :return: The ``(transition id, status)`` hops, or None if every
+            reachable status is explored
+        :rtype: list(tuple)
+        """
+        return self._search(
+            source, lambda status: not self.is_explored(status)
+        )
+
+    def _search(self, source, is_goal):
+        """
+        Breadth first search over the known transitions.
+
+        :param str source: The current status
+        :param callable is_goal: Checks if a status is the goal
+        :return: The ``(transition id, status)`` hops to the nearest goal
+        :rtype: list(tuple)
+        """
+        if is_goal(source):
+            return []
+        with self._lock:
+            transitions = {
+                status: dict(targets)
+                for status, targets in self._transitions.items()
+            }
+
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            status = queue.popleft()
+            for target, transition_id in transitions.get(status, {}).items():
+                if target in previous:
+                    continue
+                previous[target] = (status, transition_id)
+                if is_goal(target):
+                    path = []
+                    while previous[target]:
+                        status, transition_id = previous[target]
+                        path.insert(0, (transition_id, target))
+                        target = status
+                    return path
+                queue.append(target)
+        return None
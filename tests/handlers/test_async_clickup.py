@@ -0,0 +1,203 @@
+from unittest import IsolatedAsyncioTestCase, skipIf
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pyclickup.models import List
+from pyclickup.models.error import RateLimited
+
+from clickup_to_jira.comment import Comment
+from clickup_to_jira.handlers import AsyncClickUpHandler, ClickUpHandler
+from clickup_to_jira.retry import CircuitOpenError, RetryPolicy, httpx
+
+
+def get_response(data, status_code=200, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = data
+    return response
+
+
+def get_task_data(task_id):
+    return {
+        "id": task_id,
+        "creator": {"id": 1},
+        "status": {"status": "open"},
+        "tags": [],
+        "assignees": [],
+        "due_date": None,
+        "start_date": None,
+        "date_created": None,
+        "date_updated": None,
+        "date_closed": None,
+    }
+
+
+class TestAsyncClickUpHandler(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.click_up = ClickUpHandler("key")
+        self.click_up.rate_limiter.rate = 1000
+        self.client = MagicMock()
+        self.client.get = AsyncMock()
+        self.handler = AsyncClickUpHandler(self.click_up, client=self.client)
+
+    async def test_get(self):
+        self.client.get.return_value = get_response({"teams": []})
+
+        async with self.handler.session():
+            output = await self.handler.get("team")
+
+        self.assertEqual(output, {"teams": []})
+        self.client.get.assert_awaited_once_with(
+            "https://api.clickup.com/api/v1/team"
+        )
+
+    @patch("clickup_to_jira.handlers.async_clickup.asyncio.sleep")
+    async def test_get_retries_rate_limited(self, sleep):
+        self.client.get.side_effect = [
+            get_response(None, 429, {"Retry-After": "3"}),
+            get_response({"teams": []}),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.get("team")
+
+        self.assertEqual(output, {"teams": []})
+        self.assertEqual(self.client.get.await_count, 2)
+        self.assertGreaterEqual(sleep.await_args_list[1].args[0], 2)
+
+    @patch(
+        "clickup_to_jira.handlers.async_clickup.MAX_RATE_LIMITED_RETRIES", 0
+    )
+    async def test_get_rate_limited(self):
+        self.client.get.return_value = get_response(None, 429)
+
+        with self.assertRaises(RateLimited):
+            async with self.handler.session():
+                await self.handler.get("team")
+
+    @skipIf(httpx is None, "requires httpx")
+    @patch("clickup_to_jira.handlers.async_clickup.asyncio.sleep")
+    async def test_get_retries_transient_errors(self, sleep):
+        self.client.get.side_effect = [
+            httpx.ReadTimeout("timeout"),
+            httpx.ConnectError("refused"),
+            get_response(None, 503),
+            get_response({"teams": []}),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.get("team")
+
+        self.assertEqual(output, {"teams": []})
+        self.assertEqual(self.client.get.await_count, 4)
+
+    @skipIf(httpx is None, "requires httpx")
+    @patch("clickup_to_jira.handlers.async_clickup.asyncio.sleep")
+    async def test_get_fails_fast_once_circuit_opens(self, sleep):
+        self.click_up.retry_policy = RetryPolicy(
+            retries=0, failure_threshold=1
+        )
+        self.click_up.session.get_adapter(
+            "https://api.clickup.com"
+        ).retry_policy = self.click_up.retry_policy
+        self.client.get.side_effect = httpx.ConnectError("refused")
+
+        async with self.handler.session():
+            with self.assertRaises(httpx.ConnectError):
+                await self.handler.get("team")
+            with self.assertRaises(CircuitOpenError):
+                await self.handler.get("team")
+
+        self.assertEqual(self.client.get.await_count, 1)
+
+    @patch("clickup_to_jira.handlers.async_clickup.PAGE_WINDOW", 2)
+    async def test_get_tasks_from_click_up(self):
+        container = MagicMock(spec=List)
+        container.id = "list"
+        container.project = MagicMock()
+        container.project.space.team.id = "team"
+        pages = {
+            0: {"tasks": [get_task_data("1"), get_task_data("2")]},
+            1: {"tasks": [get_task_data("3")]},
+            2: {"tasks": []},
+            3: {"tasks": []},
+        }
+        self.client.get.side_effect = lambda url: get_response(
+            pages[int(url.split("page=")[1].split("&")[0])]
+        )
+
+        async with self.handler.session():
+            output = await self.handler.get_tasks_from_click_up(container)
+
+        self.assertEqual([task.id for task in output], ["1", "2", "3"])
+        self.assertEqual(self.client.get.await_count, 4)
+        self.client.get.assert_any_await(
+            "https://api.clickup.com/api/v1/team/team/task?page=0"
+            "&list_ids[]=list&subtasks=true&include_closed=true"
+        )
+
+    async def test_get_task_comments(self):
+        task = MagicMock()
+        task.id = 1
+        self.client.get.return_value = get_response(
+            {
+                "comments": [
+                    {
+                        "id": "5",
+                        "comment_text": "text",
+                        "user": {"email": "user@mail.com"},
+                    }
+                ]
+            }
+        )
+
+        async with self.handler.session():
+            output = await self.handler.get_task_comments(task)
+
+        self.assertEqual(
+            output, [Comment(id="5", text="text", commenter="user@mail.com")]
+        )
+        self.client.get.assert_awaited_once_with(
+            "https://api.clickup.com/api/v2/task/1/comment/"
+        )
+
+    async def test_add_comments_to_tasks_with_attachments(self):
+        task = MagicMock()
+        task.id = 1
+        self.click_up.fetch_attachments = True
+        self.handler.get_task_comments = AsyncMock(return_value=[])
+        self.client.get.return_value = get_response(
+            {"id": 1, "attachments": [{"id": "2", "url": "https://a"}]}
+        )
+
+        async with self.handler.session():
+            output = await self.handler.add_comments_to_tasks([task])
+
+        self.assertEqual(output, [task])
+        self.assertEqual(task.comments, [])
+        self.assertEqual(
+            self.click_up.get_task_attachments(task),
+            [{"id": "2", "url": "https://a"}],
+        )
+        self.client.get.assert_awaited_once_with(
+            "https://api.clickup.com/api/v2/task/1"
+        )
+
+    @patch("clickup_to_jira.handlers.async_clickup.TaskGraph")
+    async def test_get_click_up_tickets(self, task_graph):
+        container = MagicMock()
+        tasks = [MagicMock(), MagicMock()]
+        self.click_up.select_task_container = MagicMock(
+            return_value=(MagicMock(), container)
+        )
+        self.handler.get_tasks_from_click_up = AsyncMock(return_value=tasks)
+        self.handler.get_task_comments = AsyncMock(return_value=[])
+
+        output = await self.handler.get_click_up_tickets()
+
+        self.assertEqual(output, task_graph.return_value.ordered.return_value)
+        self.handler.get_tasks_from_click_up.assert_awaited_once_with(
+            container
+        )
+        task_graph.assert_called_once_with(tasks)
+        self.assertEqual(tasks[0].comments, [])
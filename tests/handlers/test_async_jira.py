@@ -0,0 +1,388 @@
+from unittest import IsolatedAsyncioTestCase, skipIf
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from jira.exceptions import JIRAError
+
+from clickup_to_jira.comment import Comment
+from clickup_to_jira.handlers import AsyncJIRAHandler, JIRAHandler
+from clickup_to_jira.rate_limit import AdaptiveRateLimiter
+from clickup_to_jira.retry import RetryPolicy, httpx
+from clickup_to_jira.ticket import Ticket
+
+
+def get_response(data, status_code=200, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = b"content" if data is not None else b""
+    response.text = ""
+    response.json.return_value = data
+    return response
+
+
+def get_ticket(ticket_id, parent=None, comments=None):
+    return Ticket(
+        id=ticket_id,
+        type="bug",
+        project="project",
+        title=ticket_id,
+        description="description",
+        subtasks=[],
+        status="status",
+        creator="creator@mail.com",
+        assignee=None,
+        parent=parent.title if parent else None,
+        comments=comments or [],
+        url="url",
+        parent_id=parent.id if parent else None,
+    )
+
+
+class TestAsyncJIRAHandler(IsolatedAsyncioTestCase):
+    @patch("clickup_to_jira.handlers.jira.JIRAHandler.__init__")
+    def setUp(self, handler__init):  # pylint: disable=arguments-differ
+        handler__init.return_value = None
+        self.jira = JIRAHandler("https://jira_url")
+        self.jira.status_mappings = {}
+        self.jira.type_mappings = {}
+        self.jira.rate_limiter = AdaptiveRateLimiter(1000)
+        self.jira._options = {"server": "https://jira_url"}
+        self.jira._session = MagicMock()
+        self.jira._get_url = lambda path: f"https://jira_url/rest/api/2/{path}"
+        self.client = MagicMock()
+        self.client.request = AsyncMock()
+        self.handler = AsyncJIRAHandler(self.jira, client=self.client)
+
+    async def test_request(self):
+        self.client.request.return_value = get_response({"key": "PROJ-1"})
+
+        async with self.handler.session():
+            output = await self.handler.request("get", "issue/PROJ-1")
+
+        self.assertEqual(output, {"key": "PROJ-1"})
+        self.client.request.assert_awaited_once_with(
+            "get", "https://jira_url/rest/api/2/issue/PROJ-1"
+        )
+
+    @patch("clickup_to_jira.handlers.async_jira.asyncio.sleep")
+    async def test_request_retries_rate_limited(self, sleep):
+        self.client.request.side_effect = [
+            get_response(None, 429, {"Retry-After": "3"}),
+            get_response(None, 204),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.request("put", "issue/PROJ-1")
+
+        self.assertIsNone(output)
+        self.assertEqual(self.client.request.await_count, 2)
+        self.assertGreaterEqual(sleep.await_args_list[1].args[0], 2)
+
+    async def test_request_error(self):
+        self.client.request.return_value = get_response(None, 400)
+
+        with self.assertRaises(JIRAError):
+            async with self.handler.session():
+                await self.handler.request("post", "issue")
+
+    async def test_create_jira_issues_creates_parents_first(self):
+        parent = get_ticket("parent")
+        child = get_ticket("child", parent=parent)
+        self.jira.prepare_migration = MagicMock(return_value="10000")
+        self.jira.finish_migration = MagicMock()
+        self.jira.migration_state = None
+        self.jira.summary_index = None
+        self.jira._get_issue_fields = MagicMock(
+            side_effect=lambda ticket, project, parent_key: {
+                "summary": ticket.title,
+                "parent": parent_key,
+            }
+        )
+        self.handler.get_issue_from_summary = AsyncMock(return_value=[])
+        self.handler.complete_jira_issue = AsyncMock()
+        self.client.request.side_effect = [
+            get_response({"key": "PROJ-1"}),
+            get_response({"key": "PROJ-2"}),
+        ]
+
+        output = await self.handler.create_jira_issues([child, parent])
+
+        self.assertEqual(
+            [str(issue) for issue in output], ["PROJ-1", "PROJ-2"]
+        )
+        self.jira._get_issue_fields.assert_called_with(
+            child, "10000", "PROJ-1"
+        )
+        self.jira.prepare_migration.assert_called_once_with([child, parent])
+        self.jira.finish_migration.assert_called_once_with()
+
+    async def test_request_retries_server_errors_of_idempotent_requests(
+        self,
+    ):
+        self.jira.retry_policy = RetryPolicy(backoff=0)
+        self.client.request.side_effect = [
+            get_response(None, status_code=503),
+            get_response({"key": "PROJ-1"}),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.request("get", "issue/PROJ-1")
+
+        self.assertEqual(output, {"key": "PROJ-1"})
+        self.assertEqual(self.client.request.await_count, 2)
+
+    async def test_create_issue_lost_response(self):
+        self.jira.retry_policy = RetryPolicy(backoff=0)
+        issue = MagicMock(key="PROJ-1")
+        self.jira.get_issues_from_task_ids = MagicMock(
+            return_value={"ticket": issue}
+        )
+        self.client.request.return_value = get_response(None, status_code=502)
+
+        async with self.handler.session():
+            output = await self.handler.create_issue(
+                get_ticket("ticket"), "10000", {"summary": "ticket"}
+            )
+
+        self.assertEqual(output, issue)
+        self.client.request.assert_awaited_once()
+        self.jira.get_issues_from_task_ids.assert_called_once_with(
+            "10000", ["ticket"]
+        )
+
+    @skipIf(httpx is None, "requires httpx")
+    async def test_request_retries_unsent_requests(self):
+        self.jira.retry_policy = RetryPolicy(backoff=0)
+        self.client.request.side_effect = [
+            httpx.ConnectError("refused"),
+            get_response({"key": "PROJ-1"}),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.request("post", "issue")
+
+        self.assertEqual(output, {"key": "PROJ-1"})
+        self.assertEqual(self.client.request.await_count, 2)
+
+    @skipIf(httpx is None, "requires httpx")
+    async def test_request_retries_read_timeouts_of_idempotent_requests(
+        self,
+    ):
+        self.jira.retry_policy = RetryPolicy(backoff=0)
+        self.client.request.side_effect = [
+            httpx.ReadTimeout("timeout"),
+            get_response({"key": "PROJ-1"}),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.request("get", "issue/PROJ-1")
+
+        self.assertEqual(output, {"key": "PROJ-1"})
+        self.assertEqual(self.client.request.await_count, 2)
+
+    @skipIf(httpx is None, "requires httpx")
+    async def test_create_issue_read_timeout(self):
+        self.jira.retry_policy = RetryPolicy(backoff=0)
+        issue = MagicMock(key="PROJ-1")
+        self.jira.get_issues_from_task_ids = MagicMock(
+            return_value={"ticket": issue}
+        )
+        self.client.request.side_effect = httpx.ReadTimeout("timeout")
+
+        async with self.handler.session():
+            output = await self.handler.create_issue(
+                get_ticket("ticket"), "10000", {"summary": "ticket"}
+            )
+
+        self.assertEqual(output, issue)
+        self.client.request.assert_awaited_once()
+        self.jira.get_issues_from_task_ids.assert_called_once_with(
+            "10000", ["ticket"]
+        )
+
+    @skipIf(httpx is None, "requires httpx")
+    async def test_complete_jira_issue_transport_error(self):
+        ticket = get_ticket("ticket")
+        self.jira.migration_state = MagicMock()
+        self.jira.migration_state.is_done.return_value = False
+        self.handler.assign_issue_to_user = AsyncMock(
+            side_effect=httpx.ReadTimeout("timeout")
+        )
+        self.handler.transition_issue_to_proper_status = AsyncMock(
+            return_value=True
+        )
+        self.handler.add_comments = AsyncMock(return_value=True)
+
+        await self.handler.complete_jira_issue(MagicMock(), ticket)
+
+        self.handler.add_comments.assert_awaited_once()
+        self.assertNotIn(
+            ("ticket", "assign"),
+            [
+                call.args
+                for call in self.jira.migration_state.record_step.mock_calls
+            ],
+        )
+
+    @patch("clickup_to_jira.handlers.async_jira.asyncio.sleep")
+    async def test_create_issue_lost_response_lagging_index(self, sleep):
+        self.jira.retry_policy = RetryPolicy(backoff=0)
+        issue = MagicMock(key="PROJ-1")
+        self.jira.get_issues_from_task_ids = MagicMock(
+            side_effect=[{}, {"ticket": issue}]
+        )
+        self.client.request.return_value = get_response(None, status_code=502)
+
+        async with self.handler.session():
+            output = await self.handler.create_issue(
+                get_ticket("ticket"), "10000", {"summary": "ticket"}
+            )
+
+        self.assertEqual(output, issue)
+        self.client.request.assert_awaited_once()
+        self.assertEqual(self.jira.get_issues_from_task_ids.call_count, 2)
+
+    async def test_create_jira_issue_already_exists(self):
+        self.jira.migration_state = None
+        self.handler.get_issue_from_summary = AsyncMock(
+            return_value=[MagicMock()]
+        )
+        self.handler.create_base_jira_issue = AsyncMock()
+
+        output = await self.handler.create_jira_issue(
+            get_ticket("ticket"), "10000"
+        )
+
+        self.assertIsNone(output)
+        self.handler.create_base_jira_issue.assert_not_awaited()
+
+    async def test_create_jira_issue_resumes_migrated(self):
+        ticket = get_ticket("ticket")
+        self.jira.migration_state = MagicMock()
+        self.jira.migration_state.get_issue_key.return_value = "PROJ-1"
+        self.handler.resume_jira_issue = AsyncMock()
+        self.handler.create_base_jira_issue = AsyncMock()
+
+        await self.handler.create_jira_issue(ticket, "10000")
+
+        self.handler.resume_jira_issue.assert_awaited_once_with(
+            "PROJ-1", ticket
+        )
+        self.handler.create_base_jira_issue.assert_not_awaited()
+
+    async def test_complete_jira_issue_skips_done_steps(self):
+        issue = MagicMock()
+        ticket = get_ticket("ticket")
+        self.jira.migration_state = MagicMock()
+        self.jira.migration_state.is_done.side_effect = (
+            lambda ticket_id, step: step == "assign"
+        )
+        self.handler.assign_issue_to_user = AsyncMock()
+        self.handler.transition_issue_to_proper_status = AsyncMock(
+            return_value=True
+        )
+        self.handler.add_comments = AsyncMock(return_value=False)
+
+        await self.handler.complete_jira_issue(issue, ticket)
+
+        self.handler.assign_issue_to_user.assert_not_awaited()
+        self.jira.migration_state.record_step.assert_called_once_with(
+            "ticket", "transition"
+        )
+
+    async def test_get_issue_from_summary(self):
+        self.client.request.return_value = get_response(
+            {
+                "issues": [
+                    {"key": "PROJ-1", "fields": {"summary": "summary"}},
+                    {"key": "PROJ-2", "fields": {"summary": "summary 2"}},
+                ]
+            }
+        )
+
+        async with self.handler.session():
+            output = await self.handler.get_issue_from_summary(
+                "PROJ", "summary"
+            )
+
+        self.assertEqual([str(issue) for issue in output], ["PROJ-1"])
+        self.client.request.assert_awaited_once_with(
+            "get",
+            "https://jira_url/rest/api/2/search",
+            params={
+                "jql": 'project = "PROJ" and summary ~ "summary" '
+                "ORDER BY created DESC",
+                "fields": "summary",
+            },
+        )
+
+    async def test_add_comments(self):
+        issue = MagicMock()
+        issue.key = "PROJ-1"
+        ticket = get_ticket(
+            "ticket",
+            comments=[
+                Comment(id="1", text="text", commenter="user@mail.com"),
+                Comment(id="2", text="", commenter="user@mail.com"),
+            ],
+        )
+        self.jira.migration_state = None
+        self.client.request.return_value = get_response({"id": "1"})
+
+        async with self.handler.session():
+            output = await self.handler.add_comments(issue, ticket)
+
+        self.assertTrue(output)
+        self.client.request.assert_awaited_once_with(
+            "post",
+            "https://jira_url/rest/api/2/issue/PROJ-1/comment",
+            json={"body": "user@mail.com said: text"},
+        )
+
+    async def test_move_issue_to_status(self):
+        issue = MagicMock()
+        issue.key = "PROJ-1"
+        workflow = MagicMock()
+        workflow.is_explored.return_value = False
+        workflow.shortest_path.return_value = [("31", "Done")]
+        self.client.request.side_effect = [
+            get_response({"transitions": []}),
+            get_response(None, 204),
+        ]
+
+        async with self.handler.session():
+            output = await self.handler.move_issue_to_status(
+                issue, workflow, "To Do", "Done"
+            )
+
+        self.assertTrue(output)
+        self.client.request.assert_awaited_with(
+            "post",
+            "https://jira_url/rest/api/2/issue/PROJ-1/transitions",
+            json={"transition": {"id": "31"}},
+        )
+
+    async def test_transition_issue_to_proper_status_resumed_issue(self):
+        ticket = get_ticket("1")
+        issue = MagicMock()
+        issue.key = "PROJ-1"
+        issue.__str__.return_value = "PROJ-1"
+        issue.fields.status.name = "In Progress"
+        self.jira.status_mappings = {"status": "Done"}
+        self.jira.type_mappings = {"bug": "Bug"}
+        self.jira._workflows_lock = MagicMock()
+        self.jira._workflows = None
+        workflow = self.jira.get_workflow(issue, ticket)
+        workflow.initial_status = "To Do"
+        self.handler.move_issue_to_status = AsyncMock(return_value=True)
+
+        async with self.handler.session():
+            output = await self.handler.transition_issue_to_proper_status(
+                issue, ticket
+            )
+
+        self.assertTrue(output)
+        self.handler.move_issue_to_status.assert_awaited_once_with(
+            issue, workflow, "In Progress", "Done"
+        )
+        self.client.request.assert_not_awaited()
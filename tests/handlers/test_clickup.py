@@ -1,25 +1,32 @@
+from datetime import datetime, timezone
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
+from pyclickup.models.error import RateLimited
+from requests.exceptions import HTTPError
+
 from clickup_to_jira.comment import Comment
+from clickup_to_jira.config import MigrationConfig
 from clickup_to_jira.handlers import ClickUpHandler
+from clickup_to_jira.snapshot import SnapshotCache, SnapshotMiss
 
 
 class TestClickUpHandler(TestCase):
     def setUp(self) -> None:
         self.handler = ClickUpHandler("key")
 
-    def test_get_click_up_tickets(self):
+    @patch("clickup_to_jira.handlers.clickup.TaskGraph")
+    def test_get_click_up_tickets(self, task_graph):
         self.handler.get_tasks_from_click_up = MagicMock()
         self.handler.add_comments_to_tasks = MagicMock()
-        self.handler.get_sorted_tasks = MagicMock()
 
         tasks = [MagicMock(), MagicMock()]
         self.handler.get_tasks_from_click_up.return_value = tasks
         tasks_comment = [MagicMock(), MagicMock()]
         self.handler.add_comments_to_tasks.return_value = tasks_comment
         sorted_tasks = [MagicMock()]
-        self.handler.get_sorted_tasks.return_value = sorted_tasks
+        task_graph.return_value.ordered.return_value = sorted_tasks
 
         result = self.handler.get_click_up_tickets()
 
@@ -27,7 +34,8 @@ class TestClickUpHandler(TestCase):
 
         self.handler.get_tasks_from_click_up.assert_called_once_with()
         self.handler.add_comments_to_tasks.assert_called_once_with(tasks)
-        self.handler.get_sorted_tasks.assert_called_once_with(tasks_comment)
+        task_graph.assert_called_once_with(tasks_comment)
+        task_graph.return_value.resolve_parents.assert_called_once_with()
 
     @patch("clickup_to_jira.handlers.clickup.get_item_from_user_input")
     def test_get_tasks_from_click_up(self, get_item):
@@ -105,16 +113,260 @@ class TestClickUpHandler(TestCase):
         self.assertEqual(output, [task])
         self.assertEqual(task.comments, [comment])
 
+    def test_add_comments_to_tasks_with_attachments(self):
+        task = MagicMock()
+        self.handler.fetch_attachments = True
+        self.handler.get_task_comments = MagicMock(return_value=[])
+        self.handler.get_task_attachments = MagicMock(
+            return_value=[{"id": "2", "url": "https://a"}]
+        )
+
+        self.handler.add_comments_to_tasks([task])
+
+        self.assertEqual(
+            task.raw_attachments, [{"id": "2", "url": "https://a"}]
+        )
+        self.handler.get_task_attachments.assert_called_once_with(task)
+
+    def test_add_comments_to_tasks_keeps_task_order(self):
+        tasks = [MagicMock(id=str(i)) for i in range(10)]
+
+        self.handler.get_task_comments = MagicMock()
+        self.handler.get_task_comments.side_effect = lambda task: [task.id]
+
+        output = self.handler.add_comments_to_tasks(tasks)
+
+        self.assertEqual(output, tasks)
+        for task in tasks:
+            self.assertEqual(task.comments, [task.id])
+
+    def test_select_task_container_from_config(self):
+        team_obj = MagicMock()
+        team_obj.name = "team"
+        space_obj = MagicMock()
+        space_obj.name = "space"
+        project_obj = MagicMock()
+        project_obj.name = "project"
+        lst_obj = MagicMock()
+        lst_obj.name = "lst"
+        team_obj.spaces = [space_obj]
+        space_obj.projects = [project_obj]
+        project_obj.lists = [lst_obj]
+
+        self.handler._teams = [team_obj]
+        self.handler.config = MigrationConfig(
+            team="team",
+            space="space",
+            project="project",
+            list="lst",
+            jira_project="PROJ",
+        )
+
+        output = self.handler.select_task_container()
+
+        self.assertEqual(output, (space_obj, lst_obj))
+
+        self.handler.config.list = None
+        output = self.handler.select_task_container()
+
+        self.assertEqual(output, (space_obj, project_obj))
+
+    def test_iter_tasks_from_click_up(self):
+        container = MagicMock()
+        tasks = [MagicMock(), MagicMock(), MagicMock()]
+        container.get_tasks.side_effect = [tasks[:2], tasks[2:], []]
+        self.handler.put_snapshot_tasks = MagicMock()
+
+        output = list(self.handler.iter_tasks_from_click_up(container))
+
+        self.assertEqual(output, tasks)
+        self.handler.put_snapshot_tasks.assert_not_called()
+        container.get_tasks.assert_called_with(
+            page=2, include_closed=True, subtasks=True
+        )
+        self.assertEqual(container.get_tasks.call_count, 3)
+
+    def test_iter_comments_to_tasks(self):
+        tasks = [MagicMock(id=str(i)) for i in range(10)]
+
+        self.handler.comment_workers = 2
+        self.handler.get_task_comments = MagicMock()
+        self.handler.get_task_comments.side_effect = lambda task: [task.id]
+
+        output = list(self.handler.iter_comments_to_tasks(iter(tasks)))
+
+        self.assertEqual(output, tasks)
+        for task in tasks:
+            self.assertEqual(task.comments, [task.id])
+
+    def test_iter_comments_to_tasks_with_attachments(self):
+        tasks = [MagicMock(id=str(i)) for i in range(3)]
+
+        self.handler.fetch_attachments = True
+        self.handler.get_task_comments = MagicMock(return_value=[])
+        self.handler.get_task_attachments = MagicMock(
+            side_effect=lambda task: [{"id": task.id}]
+        )
+
+        output = list(self.handler.iter_comments_to_tasks(iter(tasks)))
+
+        self.assertEqual(output, tasks)
+        for task in tasks:
+            self.assertEqual(task.raw_attachments, [{"id": task.id}])
+
+    def test_get_updated_tasks(self):
+        container = MagicMock()
+
+        output = self.handler.get_updated_tasks(container, 1640995200000)
+
+        self.assertEqual(output, container.get_all_tasks.return_value)
+        container.get_all_tasks.assert_called_once_with(
+            include_closed=True, subtasks=True, date_updated_gt=1640995200000
+        )
+
+    def test_get_updated_tasks_all(self):
+        container = MagicMock()
+
+        self.handler.get_updated_tasks(container)
+
+        container.get_all_tasks.assert_called_once_with(
+            include_closed=True, subtasks=True
+        )
+
+    def test_get_updated_at(self):
+        task = MagicMock()
+        task.date_updated = datetime(2022, 1, 1)
+
+        self.assertEqual(self.handler.get_updated_at(task), 1640995200000)
+
+        task.date_updated = None
+        self.assertIsNone(self.handler.get_updated_at(task))
+
+    def test_get_member_email(self):
+        team = MagicMock()
+        team.members = [
+            MagicMock(username="John", email="john@mail.com"),
+            MagicMock(username=None, email="bot@mail.com"),
+        ]
+        self.handler._teams = [team]
+
+        self.assertEqual(
+            self.handler.get_member_email("john"), "john@mail.com"
+        )
+        self.assertIsNone(self.handler.get_member_email("jane"))
+
+    def test_get_space_labels(self):
+        space = MagicMock()
+        space.id = 1
+        self.handler.v2.get = MagicMock()
+        self.handler.v2.get.return_value = {
+            "tags": [{"name": "bug"}, {"name": "feature"}]
+        }
+
+        output = self.handler.get_space_labels(space)
+
+        self.assertEqual(output, ["bug", "feature", ""])
+        self.handler.v2.get.assert_called_once_with("space/1/tag")
+
+    def test_get_task_attachments(self):
+        task = MagicMock()
+        task.id = 1
+        self.handler.v2.get = MagicMock()
+        self.handler.v2.get.return_value = {
+            "id": 1,
+            "attachments": [{"id": "2", "url": "https://a"}],
+        }
+
+        output = self.handler.get_task_attachments(task)
+
+        self.assertEqual(output, [{"id": "2", "url": "https://a"}])
+        self.handler.v2.get.assert_called_once_with("task/1")
+
+    def test_get_task_attachments_fetched_with_comments(self):
+        task = MagicMock()
+        task.raw_attachments = [{"id": "2", "url": "https://a"}]
+        self.handler.v2.get = MagicMock()
+
+        output = self.handler.get_task_attachments(task)
+
+        self.assertEqual(output, [{"id": "2", "url": "https://a"}])
+        self.handler.v2.get.assert_not_called()
+
+    def test_req_uses_rate_limited_session(self):
+        self.handler.session = MagicMock()
+        self.handler.session.request.return_value.status_code = 200
+
+        output = self.handler._req("team")
+
+        self.assertEqual(output, self.handler.session.request.return_value)
+        self.handler.session.request.assert_called_once_with(
+            "get",
+            "https://api.clickup.com/api/v1/team",
+            timeout=30,
+        )
+
+    def test_init_shares_pooled_session(self):
+        adapter = self.handler.session.get_adapter("https://api.clickup.com")
+
+        self.assertIs(self.handler.v2.session, self.handler.session)
+        self.assertEqual(
+            self.handler.v2.api_url, "https://api.clickup.com/api/v2/"
+        )
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(self.handler.session.headers["Authorization"], "key")
+
+    @patch.dict(
+        "os.environ", {"CLICKUP_MAX_CONNECTIONS": "2", "CLICKUP_TIMEOUT": "5"}
+    )
+    def test_init_pool_from_env(self):
+        handler = ClickUpHandler("key")
+
+        adapter = handler.session.get_adapter("https://api.clickup.com")
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(handler.v2.timeout, 5)
+
+    @patch.dict("os.environ", {"CLICKUP_API_URL": "http://localhost/api/v1/"})
+    def test_init_api_url_from_env(self):
+        handler = ClickUpHandler("key")
+
+        self.assertEqual(handler.api_url, "http://localhost/api/v1/")
+        self.assertEqual(handler.v2.api_url, "http://localhost/api/v2/")
+
+    def test_req_rate_limited(self):
+        self.handler.session = MagicMock()
+        self.handler.session.request.return_value.status_code = 429
+
+        with self.assertRaises(RateLimited):
+            self.handler._req("team")
+
+    def test_req_server_error(self):
+        self.handler.session = MagicMock()
+        response = self.handler.session.request.return_value
+        response.status_code = 502
+        response.raise_for_status.side_effect = HTTPError()
+
+        with self.assertRaises(HTTPError):
+            self.handler._req("team")
+
+    @patch.dict("os.environ", {"MIGRATION_RETRIES": "2"})
+    def test_init_retry_policy_from_env(self):
+        handler = ClickUpHandler("key")
+
+        adapter = handler.session.get_adapter("https://api.clickup.com")
+        self.assertIs(adapter.retry_policy, handler.retry_policy)
+        self.assertEqual(handler.retry_policy.retries, 2)
+
     def test_get_task_comments_no_dict(self):
         task = MagicMock()
         task.id = 1
         comment_dict = []
-        self.handler.get = MagicMock()
-        self.handler.get.return_value = comment_dict
+        self.handler.v2.get = MagicMock()
+        self.handler.v2.get.return_value = comment_dict
 
         output = self.handler.get_task_comments(task)
         self.assertEqual(output, [])
-        self.handler.get.assert_called_once_with(f"task/{task.id}/comment/?")
+        self.handler.v2.get.assert_called_once_with(f"task/{task.id}/comment/")
 
     def test_get_task_comments_sunny_day(self):
         task = MagicMock()
@@ -131,26 +383,181 @@ class TestClickUpHandler(TestCase):
                 }
             ]
         }
-        self.handler.get = MagicMock()
-        self.handler.get.return_value = comment_dict
+        self.handler.v2.get = MagicMock()
+        self.handler.v2.get.return_value = comment_dict
 
         ref_comment_list = [
             Comment(id=comment_id, text=comment_text, commenter=email)
         ]
         output = self.handler.get_task_comments(task)
         self.assertEqual(output, ref_comment_list)
-        self.handler.get.assert_called_once_with(f"task/{task.id}/comment/?")
+        self.handler.v2.get.assert_called_once_with(f"task/{task.id}/comment/")
+
+    def test_add_parent_to_tasks(self):
+        task_1 = MagicMock(id="1")
+        task_1.name = "Task 1"
+        task_1.parent = None
+        task_2 = MagicMock(id="2")
+        task_2.name = "Task 2"
+        task_2.parent = "1"
+        task_3 = MagicMock(id="3")
+        task_3.name = "Task 3"
+        task_3.parent = "missing"
+
+        output = self.handler.add_parent_to_tasks([task_1, task_2, task_3])
+
+        self.assertEqual(output, [task_1, task_2, task_3])
+        self.assertEqual(
+            [task.parent for task in output], [None, "Task 1", None]
+        )
+        self.assertEqual(
+            [task.parent_id for task in output], [None, "1", None]
+        )
 
     def test_get_sorted_tasks(self):
-        task_1 = MagicMock()
-        task_1.parent = True
+        task_1 = MagicMock(id="1", parent_id="2")
 
-        task_2 = MagicMock()
-        task_2.parent = False
+        task_2 = MagicMock(id="2", parent_id=None)
 
-        task_3 = MagicMock()
-        task_3.parent = True
+        task_3 = MagicMock(id="3", parent_id="2")
 
         output = self.handler.get_sorted_tasks([task_1, task_2, task_3])
 
         self.assertEqual(output, [task_2, task_1, task_3])
+
+
+class TestClickUpHandlerSnapshot(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.handler = ClickUpHandler("key")
+        self.handler.snapshot = SnapshotCache(self.directory.name)
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def get_task_data(self, task_id):
+        return {
+            "id": task_id,
+            "name": f"Task {task_id}",
+            "creator": {"id": 1},
+            "status": {"status": "open"},
+            "tags": [],
+            "assignees": [],
+            "due_date": None,
+            "start_date": None,
+            "date_created": None,
+            "date_updated": None,
+            "date_closed": None,
+        }
+
+    @patch.dict(
+        "os.environ", {"CLICKUP_SNAPSHOT_DIR": "", "CLICKUP_OFFLINE": ""}
+    )
+    def test_init_without_snapshot(self):
+        self.assertIsNone(ClickUpHandler("key").snapshot)
+
+    def test_init_snapshot_from_env(self):
+        with patch.dict(
+            "os.environ",
+            {
+                "CLICKUP_SNAPSHOT_DIR": self.directory.name,
+                "CLICKUP_SNAPSHOT_MAX_AGE": "2",
+                "CLICKUP_OFFLINE": "True",
+            },
+        ):
+            handler = ClickUpHandler("key")
+
+        self.assertEqual(handler.snapshot.directory, self.directory.name)
+        self.assertEqual(handler.snapshot.max_age, 7200)
+        self.assertTrue(handler.snapshot.offline)
+
+    def test_get_tasks_from_click_up_replays_snapshot(self):
+        container = MagicMock()
+        container.id = "list"
+        container.get_all_tasks.return_value = [
+            MagicMock(_data=self.get_task_data("1"))
+        ]
+        self.handler.select_task_container = MagicMock(
+            return_value=(MagicMock(), container)
+        )
+
+        self.handler.get_tasks_from_click_up()
+        output = self.handler.get_tasks_from_click_up()
+
+        container.get_all_tasks.assert_called_once_with(
+            include_closed=True, subtasks=True
+        )
+        self.assertEqual([task.id for task in output], ["1"])
+        self.assertEqual(output[0].name, "Task 1")
+
+    def test_iter_tasks_from_click_up_replays_snapshot(self):
+        container = MagicMock()
+        container.id = "list"
+        container.get_tasks.side_effect = [
+            [MagicMock(_data=self.get_task_data("1"))],
+            [],
+        ]
+
+        list(self.handler.iter_tasks_from_click_up(container))
+        output = list(self.handler.iter_tasks_from_click_up(container))
+
+        self.assertEqual(container.get_tasks.call_count, 2)
+        self.assertEqual([task.id for task in output], ["1"])
+
+    def test_get_task_comments_replays_snapshot(self):
+        task = MagicMock()
+        task.id = 1
+        task.date_updated = None
+        self.handler.v2.get = MagicMock()
+        self.handler.v2.get.return_value = {
+            "comments": [
+                {"id": "5", "comment_text": "text", "user": {"email": "e"}}
+            ]
+        }
+
+        self.handler.get_task_comments(task)
+        output = self.handler.get_task_comments(task)
+
+        self.assertEqual(output, [Comment(id="5", text="text", commenter="e")])
+        self.handler.v2.get.assert_called_once_with("task/1/comment/")
+
+    def test_get_replays_hierarchy(self):
+        self.handler.session = MagicMock()
+        self.handler.session.request.return_value.status_code = 200
+        self.handler.session.request.return_value.json.return_value = {
+            "teams": []
+        }
+
+        self.handler.get("team")
+        output = self.handler.get("team")
+
+        self.assertEqual(output, {"teams": []})
+        self.handler.session.request.assert_called_once()
+
+    def test_req_offline(self):
+        self.handler.snapshot.offline = True
+        self.handler.session = MagicMock()
+
+        with self.assertRaises(SnapshotMiss):
+            self.handler.get("team")
+        self.handler.session.request.assert_not_called()
+
+    @patch("clickup_to_jira.snapshot.time")
+    def test_get_task_comments_refetches_updated_task(self, time):
+        task = MagicMock()
+        task.id = 1
+        task.date_updated = datetime(2022, 1, 1)
+        self.handler.v2.get = MagicMock(return_value={"comments": []})
+
+        time.return_value = datetime(
+            2021, 12, 31, tzinfo=timezone.utc
+        ).timestamp()
+        self.handler.get_task_comments(task)
+        time.return_value = datetime(
+            2022, 1, 2, tzinfo=timezone.utc
+        ).timestamp()
+        self.handler.get_task_comments(task)
+        self.handler.get_task_comments(task)
+
+        self.assertEqual(self.handler.v2.get.call_count, 2)
@@ -0,0 +1,43 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyclickup.models.error import RateLimited
+
+from clickup_to_jira.handlers.clickup_v2 import ClickUpV2Client
+
+
+class TestClickUpV2Client(TestCase):
+    def setUp(self) -> None:
+        self.session = MagicMock()
+        self.session.get.return_value.status_code = 200
+        self.client = ClickUpV2Client(
+            self.session, "https://api.clickup.com/api/v2/", timeout=5
+        )
+
+    def test_get(self):
+        output = self.client.get("team")
+
+        self.assertEqual(output, self.session.get.return_value.json())
+        self.session.get.assert_called_once_with(
+            "https://api.clickup.com/api/v2/team", timeout=5
+        )
+
+    def test_get_rate_limited(self):
+        self.session.get.return_value.status_code = 429
+
+        with self.assertRaises(RateLimited):
+            self.client.get("team")
+
+    def test_get_task_comments(self):
+        self.client.get_task_comments("1")
+
+        self.session.get.assert_called_once_with(
+            "https://api.clickup.com/api/v2/task/1/comment/", timeout=5
+        )
+
+    def test_get_space_tags(self):
+        self.client.get_space_tags("1")
+
+        self.session.get.assert_called_once_with(
+            "https://api.clickup.com/api/v2/space/1/tag", timeout=5
+        )
@@ -5,8 +5,48 @@ from unittest.mock import MagicMock, call, patch
 
 from jira.exceptions import JIRAError
 from jira.resources import User
+from requests import Session
 
+from clickup_to_jira.attachment import Attachment
+from clickup_to_jira.config import ConfigError, MigrationConfig
 from clickup_to_jira.handlers.jira import JIRAHandler
+from clickup_to_jira.rate_limit import RateLimitedAdapter
+from clickup_to_jira.summary_index import SummaryIndex
+from clickup_to_jira.ticket import Ticket
+
+
+def get_config(**kwargs):
+    return MigrationConfig(
+        team="team",
+        space="space",
+        project="project",
+        jira_project="PROJ",
+        **kwargs,
+    )
+
+
+def get_named(name):
+    item = MagicMock()
+    item.name = name
+    return item
+
+
+def get_ticket(ticket_id, parent=None):
+    return Ticket(
+        id=ticket_id,
+        type="bug",
+        project="project",
+        title=ticket_id,
+        description="description",
+        subtasks=[],
+        status="status",
+        creator="creator@mail.com",
+        assignee=None,
+        parent=parent.title if parent else None,
+        comments=[],
+        url="url",
+        parent_id=parent.id if parent else None,
+    )
 
 
 class TestJIRAHandler(TestCase):
@@ -25,11 +65,54 @@ class TestJIRAHandler(TestCase):
             os.getenv("JIRA_URL"),
             basic_auth=(os.getenv("JIRA_USER"), os.getenv("JIRA_API_KEY")),
         )
+        self.handler.status_mappings = {}
+        self.handler.type_mappings = {}
+
+    @patch("clickup_to_jira.handlers.jira.JIRA.__init__", autospec=True)
+    def test_init_mounts_rate_limiter(self, jira__init):
+        def init(handler, *args, **kwargs):
+            handler._session = Session()
+
+        jira__init.side_effect = init
+
+        handler = JIRAHandler("https://jira_url")
+
+        adapter = handler._session.get_adapter("https://jira_url")
+        self.assertIsInstance(adapter, RateLimitedAdapter)
+        self.assertIs(adapter.rate_limiter, handler.rate_limiter)
+
+    @patch("clickup_to_jira.handlers.jira.JIRA.__init__", autospec=True)
+    def test_init_leaves_retries_to_adapter(self, jira__init):
+        def init(handler, *args, **kwargs):
+            handler._session = Session()
+
+        jira__init.side_effect = init
+
+        handler = JIRAHandler("https://jira_url")
+
+        self.assertEqual(jira__init.call_args.kwargs["max_retries"], 0)
+        adapter = handler._session.get_adapter("https://jira_url")
+        self.assertIs(adapter.retry_policy, handler.retry_policy)
+
+    @patch("clickup_to_jira.handlers.jira.JIRA.__init__", autospec=True)
+    def test_init_does_not_share_mappings(self, jira__init):
+        def init(handler, *args, **kwargs):
+            handler._session = Session()
+
+        jira__init.side_effect = init
+
+        handler = JIRAHandler("https://jira_url")
+        other_handler = JIRAHandler("https://jira_url")
+        handler.status_mappings["status"] = "Done"
+
+        self.assertEqual(other_handler.status_mappings, {})
+        self.assertIsNot(handler.type_mappings, other_handler.type_mappings)
 
     @patch("clickup_to_jira.handlers.jira.get_item_from_user_input")
     def test_create_jira_issues(self, get_item):
         self.handler.projects = MagicMock()
         self.handler.create_type_mappings = MagicMock()
+        self.handler.get_labelled_issue_types = MagicMock()
         self.handler.create_jira_issue = MagicMock()
 
         project = "project"
@@ -51,6 +134,25 @@ class TestJIRAHandler(TestCase):
             ticket, jira_project.id
         )
 
+    @patch.dict(os.environ, {"JIRA_SUMMARY_INDEX": "True"})
+    @patch("clickup_to_jira.handlers.jira.SummaryIndex")
+    @patch("clickup_to_jira.handlers.jira.get_item_from_user_input")
+    def test_create_jira_issues_with_summary_index(self, get_item, index):
+        self.handler.projects = MagicMock()
+        self.handler.create_type_mappings = MagicMock()
+        self.handler.get_labelled_issue_types = MagicMock()
+        self.handler.create_jira_issue = MagicMock()
+
+        jira_project = MagicMock()
+        jira_project.id = 1
+        get_item.return_value = jira_project
+
+        self.handler.create_jira_issues([MagicMock()])
+
+        index.assert_called_once_with(jira_project.id)
+        index().load.assert_called_once_with(self.handler)
+        self.assertEqual(self.handler.summary_index, index().load())
+
     def test_create_jira_issue_sunny_day(self):
         self.handler.get_issue_from_summary = MagicMock()
         self.handler.create_base_jira_issue = MagicMock()
@@ -176,6 +278,437 @@ class TestJIRAHandler(TestCase):
         self.handler.transition_issue_to_proper_status.assert_not_called()
         self.handler.add_comments.assert_not_called()
 
+    @patch.dict(os.environ, {"JIRA_BULK_CREATE": "True"})
+    @patch("clickup_to_jira.handlers.jira.get_item_from_user_input")
+    def test_create_jira_issues_in_bulk_mode(self, get_item):
+        self.handler.projects = MagicMock()
+        self.handler.create_type_mappings = MagicMock()
+        self.handler.get_labelled_issue_types = MagicMock()
+        self.handler.create_jira_issue = MagicMock()
+        self.handler.create_jira_issues_in_bulk = MagicMock()
+
+        jira_project = MagicMock()
+        jira_project.id = 1
+        get_item.return_value = jira_project
+        tickets = [MagicMock()]
+
+        output = self.handler.create_jira_issues(tickets)
+
+        self.assertEqual(
+            output, self.handler.create_jira_issues_in_bulk.return_value
+        )
+        self.handler.create_jira_issues_in_bulk.assert_called_once_with(
+            tickets, jira_project.id
+        )
+        self.handler.create_jira_issue.assert_not_called()
+
+    def test_create_jira_issues_in_bulk(self):
+        self.handler.get_issue_from_summary = MagicMock()
+        self.handler.create_issues = MagicMock()
+        self.handler.complete_jira_issue = MagicMock()
+        self.handler.search_users = MagicMock()
+        self.handler.search_users.return_value = []
+        self.handler.type_mappings = {"bug": "Bug"}
+
+        subtask = get_ticket("2", parent=get_ticket("1"))
+        failed_subtask = get_ticket("3", parent=get_ticket("1"))
+        task = get_ticket("1")
+        existing_task = get_ticket("4")
+
+        issue = MagicMock(key="PROJ-10")
+        sub_issue = MagicMock(key="PROJ-11")
+        self.handler.get_issue_from_summary.side_effect = (
+            lambda project, summary: ([MagicMock()] if summary == "4" else [])
+        )
+        self.handler.create_issues.side_effect = [
+            [{"status": "Success", "issue": issue, "error": None}],
+            [
+                {"status": "Success", "issue": sub_issue, "error": None},
+                {"status": "Error", "issue": None, "error": "Error"},
+            ],
+        ]
+
+        output = self.handler.create_jira_issues_in_bulk(
+            [subtask, failed_subtask, task, existing_task], "project"
+        )
+
+        self.assertEqual(output, [issue, sub_issue])
+        first_batch = self.handler.create_issues.call_args_list[0]
+        self.assertEqual(
+            [fields["summary"] for fields in first_batch.args[0]], ["1"]
+        )
+        second_batch = self.handler.create_issues.call_args_list[1]
+        self.assertEqual(
+            [fields["parent"] for fields in second_batch.args[0]],
+            [{"key": "PROJ-10"}, {"key": "PROJ-10"}],
+        )
+        self.handler.complete_jira_issue.assert_has_calls(
+            [call(issue, task), call(sub_issue, subtask)]
+        )
+        self.assertEqual(self.handler.complete_jira_issue.call_count, 2)
+
+    @patch("clickup_to_jira.handlers.jira.BULK_CREATE_SIZE", 2)
+    def test_create_jira_issues_in_bulk_batches(self):
+        self.handler.get_issue_from_summary = MagicMock()
+        self.handler.get_issue_from_summary.return_value = []
+        self.handler._create_issue_batch = MagicMock()
+        self.handler._create_issue_batch.side_effect = lambda t, p, c: t
+
+        tickets = [get_ticket(str(i)) for i in range(5)]
+
+        output = self.handler.create_jira_issues_in_bulk(tickets, "project")
+
+        self.assertEqual(output, tickets)
+        self.assertEqual(
+            [
+                len(batch.args[0])
+                for batch in self.handler._create_issue_batch.call_args_list
+            ],
+            [2, 2, 1],
+        )
+
+    def test_create_jira_issues_in_bulk_request_error(self):
+        self.handler.get_issue_from_summary = MagicMock()
+        self.handler.get_issue_from_summary.return_value = []
+        self.handler.create_issues = MagicMock()
+        self.handler.create_issues.side_effect = JIRAError()
+        self.handler.complete_jira_issue = MagicMock()
+        self.handler.search_users = MagicMock()
+        self.handler.type_mappings = {"bug": "Bug"}
+
+        output = self.handler.create_jira_issues_in_bulk(
+            [get_ticket("1")], "project"
+        )
+
+        self.assertEqual(output, [])
+        self.handler.complete_jira_issue.assert_not_called()
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_create_jira_issues_in_bulk_lost_response(self, sleep):
+        self.handler.get_issue_from_summary = MagicMock(return_value=[])
+        self.handler.create_issues = MagicMock()
+        self.handler.complete_jira_issue = MagicMock()
+        self.handler.search_users = MagicMock(return_value=[])
+        self.handler.type_mappings = {"bug": "Bug"}
+        created = MagicMock(key="PROJ-1")
+        issue = MagicMock(key="PROJ-2")
+        self.handler.get_issues_from_task_ids = MagicMock(
+            return_value={"1": created}
+        )
+        self.handler.create_issues.side_effect = [
+            JIRAError(status_code=502),
+            [{"status": "Success", "issue": issue, "error": None}],
+        ]
+
+        output = self.handler.create_jira_issues_in_bulk(
+            [get_ticket("1"), get_ticket("2")], "project"
+        )
+
+        self.assertEqual(output, [created, issue])
+        retried = self.handler.create_issues.call_args_list[1]
+        self.assertEqual(
+            [fields["summary"] for fields in retried.args[0]], ["2"]
+        )
+
+    @patch.dict(os.environ, {"JIRA_FOLLOW_UP_WORKERS": "2"})
+    @patch("clickup_to_jira.handlers.jira.FollowUpExecutor")
+    @patch("clickup_to_jira.handlers.jira.get_item_from_user_input")
+    def test_create_jira_issues_with_follow_ups(self, get_item, executor):
+        self.handler.projects = MagicMock()
+        self.handler.create_type_mappings = MagicMock()
+        self.handler.get_labelled_issue_types = MagicMock()
+        self.handler.create_jira_issue = MagicMock()
+
+        jira_project = MagicMock()
+        jira_project.id = 1
+        get_item.return_value = jira_project
+
+        self.handler.create_jira_issues([MagicMock()])
+
+        executor.from_config.assert_called_once_with("2")
+        executor.from_config().shutdown.assert_called_once_with()
+        executor.from_config().shutdown().log.assert_called_once_with()
+        self.assertEqual(self.handler.follow_ups, None)
+
+    @patch.dict(os.environ, {"JIRACLICKUPLINK": "True"})
+    def test_complete_jira_issue_with_follow_ups(self):
+        self.handler.follow_ups = MagicMock()
+        self.handler.assign_issue_to_user = MagicMock()
+        self.handler.add_simple_link = MagicMock()
+
+        ticket = MagicMock()
+        ticket.url = "url"
+        ticket.title = "title"
+        jira_issue = MagicMock()
+
+        self.handler.complete_jira_issue(jira_issue, ticket)
+
+        self.handler.follow_ups.submit.assert_has_calls(
+            [
+                call(
+                    "assign",
+                    jira_issue,
+                    ticket,
+                    self.handler._run_step,
+                    ticket,
+                    "assign",
+                    self.handler.assign_issue_to_user,
+                    jira_issue,
+                    ticket,
+                ),
+                call(
+                    "transition",
+                    jira_issue,
+                    ticket,
+                    self.handler._run_step,
+                    ticket,
+                    "transition",
+                    self.handler.transition_issue_to_proper_status,
+                    jira_issue,
+                    ticket,
+                ),
+                call(
+                    "comments",
+                    jira_issue,
+                    ticket,
+                    self.handler._run_step,
+                    ticket,
+                    "comments",
+                    self.handler.add_comments,
+                    jira_issue,
+                    ticket,
+                ),
+                call(
+                    "link",
+                    jira_issue,
+                    ticket,
+                    self.handler._run_step,
+                    ticket,
+                    "link",
+                    self.handler.add_simple_link,
+                    jira_issue,
+                    {"url": "url", "title": "ClickUp issue title"},
+                ),
+            ]
+        )
+        self.handler.assign_issue_to_user.assert_not_called()
+        self.handler.add_simple_link.assert_not_called()
+
+    def test_create_jira_issue_already_migrated(self):
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.get_issue_key.return_value = "PROJ-1"
+        self.handler.resume_jira_issue = MagicMock()
+        self.handler.get_issue_from_summary = MagicMock()
+        self.handler.create_base_jira_issue = MagicMock()
+
+        ticket = get_ticket("1")
+
+        output = self.handler.create_jira_issue(ticket, "project")
+
+        self.assertEqual(output, None)
+        self.handler.migration_state.get_issue_key.assert_called_once_with("1")
+        self.handler.resume_jira_issue.assert_called_once_with(
+            "PROJ-1", ticket
+        )
+        self.handler.get_issue_from_summary.assert_not_called()
+        self.handler.create_base_jira_issue.assert_not_called()
+
+    def test_resume_jira_issue_with_pending_steps(self):
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.is_done.side_effect = (
+            lambda task_id, step: step == "assign"
+        )
+        self.handler.issue = MagicMock()
+        self.handler.assign_issue_to_user = MagicMock()
+        self.handler.transition_issue_to_proper_status = MagicMock()
+        self.handler.add_comments = MagicMock()
+
+        ticket = get_ticket("1")
+
+        output = self.handler.resume_jira_issue("PROJ-1", ticket)
+
+        self.assertEqual(output, self.handler.issue.return_value)
+        self.handler.issue.assert_called_once_with("PROJ-1", fields="status")
+        self.handler.assign_issue_to_user.assert_not_called()
+        self.handler.transition_issue_to_proper_status.assert_called_once_with(
+            output, ticket
+        )
+        self.handler.migration_state.record_step.assert_called_once_with(
+            "1", "transition"
+        )
+
+    def test_resume_jira_issue_completed(self):
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.is_done.return_value = True
+        self.handler.issue = MagicMock()
+
+        output = self.handler.resume_jira_issue("PROJ-1", get_ticket("1"))
+
+        self.assertEqual(output, None)
+        self.handler.issue.assert_not_called()
+
+    def test_resume_jira_issue_with_new_comment(self):
+        self.handler.migration_state = MagicMock()
+        # An older run recorded the whole comments step
+        self.handler.migration_state.is_done.side_effect = (
+            lambda task_id, step: step
+            in {"assign", "transition", "comments", "comment:1"}
+        )
+        self.handler.issue = MagicMock()
+        self.handler.add_comment = MagicMock()
+
+        ticket = get_ticket("1")
+        ticket.comments = [
+            MagicMock(id="1", commenter="a@mail.com", text="Do that"),
+            MagicMock(id="2", commenter="b@mail.com", text="Did it"),
+        ]
+
+        output = self.handler.resume_jira_issue("PROJ-1", ticket)
+
+        self.assertEqual(output, self.handler.issue.return_value)
+        self.handler.add_comment.assert_called_once_with(
+            output, "b@mail.com said: Did it"
+        )
+        self.handler.migration_state.record_step.assert_called_once_with(
+            "1", "comment:2"
+        )
+
+    def test_sync_jira_issues(self):
+        migrated = get_ticket("1")
+        new = get_ticket("2")
+        self.handler.prepare_migration = MagicMock(return_value="10000")
+        self.handler.finish_migration = MagicMock()
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.get_issue_key.side_effect = {
+            "1": "PROJ-1"
+        }.get
+        self.handler.update_jira_issue = MagicMock()
+        self.handler.create_jira_issue = MagicMock()
+
+        output = self.handler.sync_jira_issues([migrated, new])
+
+        self.assertEqual(
+            output,
+            [
+                self.handler.update_jira_issue.return_value,
+                self.handler.create_jira_issue.return_value,
+            ],
+        )
+        self.handler.update_jira_issue.assert_called_once_with(
+            "PROJ-1", migrated
+        )
+        self.handler.create_jira_issue.assert_called_once_with(new, "10000")
+        self.handler.finish_migration.assert_called_once_with()
+
+    def test_sync_jira_issues_without_state(self):
+        self.handler.prepare_migration = MagicMock(return_value="10000")
+
+        with self.assertRaises(ConfigError):
+            self.handler.sync_jira_issues([get_ticket("1")])
+
+    def test_update_jira_issue(self):
+        ticket = get_ticket("1")
+        issue = MagicMock()
+        issue.fields.description = "old description"
+        self.handler.issue = MagicMock(return_value=issue)
+        self.handler.update_issue_assignee = MagicMock()
+        self.handler.update_issue_status = MagicMock()
+        self.handler.add_comments = MagicMock()
+
+        output = self.handler.update_jira_issue("PROJ-1", ticket)
+
+        self.assertEqual(output, issue)
+        self.handler.issue.assert_called_once_with(
+            "PROJ-1", fields="description,assignee,status"
+        )
+        issue.update.assert_called_once_with(
+            fields={"description": "description"}
+        )
+        self.handler.update_issue_assignee.assert_called_once_with(
+            issue, ticket
+        )
+        self.handler.update_issue_status.assert_called_once_with(issue, ticket)
+        self.handler.add_comments.assert_called_once_with(issue, ticket)
+
+    def test_update_jira_issue_unchanged_description(self):
+        issue = MagicMock()
+        issue.fields.description = "description"
+        self.handler.issue = MagicMock(return_value=issue)
+        self.handler.update_issue_assignee = MagicMock()
+        self.handler.update_issue_status = MagicMock()
+        self.handler.add_comments = MagicMock()
+
+        self.handler.update_jira_issue("PROJ-1", get_ticket("1"))
+
+        issue.update.assert_not_called()
+
+    def test_update_issue_assignee(self):
+        ticket = get_ticket("1")
+        ticket.assignee = "user@mail.com"
+        issue = MagicMock()
+        issue.fields.assignee.accountId = "old"
+        self.handler._user_directory = MagicMock()
+        self.handler._user_directory.get_account_id.return_value = "new"
+        self.handler.assign_issue = MagicMock()
+
+        output = self.handler.update_issue_assignee(issue, ticket)
+
+        self.assertTrue(output)
+        self.handler.assign_issue.assert_called_once_with(issue, "new")
+
+    def test_update_issue_assignee_unassigned(self):
+        issue = MagicMock()
+        issue.fields.assignee.accountId = "old"
+        self.handler.assign_issue = MagicMock()
+
+        output = self.handler.update_issue_assignee(issue, get_ticket("1"))
+
+        self.assertTrue(output)
+        self.handler.assign_issue.assert_called_once_with(issue, None)
+
+    def test_update_issue_assignee_unchanged(self):
+        issue = MagicMock()
+        issue.fields.assignee = None
+        self.handler.assign_issue = MagicMock()
+
+        output = self.handler.update_issue_assignee(issue, get_ticket("1"))
+
+        self.assertTrue(output)
+        self.handler.assign_issue.assert_not_called()
+
+    def test_update_issue_status(self):
+        ticket = get_ticket("1")
+        issue = MagicMock()
+        issue.fields.status.name = "In Progress"
+        self.handler.status_mappings = {"status": "Done"}
+        self.handler.get_workflow = MagicMock()
+        self.handler.move_issue_to_status = MagicMock(return_value=True)
+
+        output = self.handler.update_issue_status(issue, ticket)
+
+        self.assertTrue(output)
+        self.handler.move_issue_to_status.assert_called_once_with(
+            issue,
+            self.handler.get_workflow.return_value,
+            "In Progress",
+            "Done",
+        )
+
+    def test_complete_jira_issue_failed_step_not_recorded(self):
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.is_done.return_value = False
+        self.handler.assign_issue_to_user = MagicMock(return_value=True)
+        self.handler.transition_issue_to_proper_status = MagicMock(
+            return_value=False
+        )
+        self.handler.add_comments = MagicMock(return_value=True)
+
+        self.handler.complete_jira_issue(MagicMock(), get_ticket("1"))
+
+        self.handler.migration_state.record_step.assert_called_once_with(
+            "1", "assign"
+        )
+
     def test_create_base_jira_issue_sunny_day(self):
         self.handler.search_users = MagicMock()
         self.handler.get_issue_from_summary = MagicMock()
@@ -193,6 +726,31 @@ class TestJIRAHandler(TestCase):
         output = self.handler.create_base_jira_issue(ticket, project)
         self.assertEqual(output, jira_issue)
 
+    def test_create_base_jira_issue_without_parent(self):
+        self.handler.search_users = MagicMock()
+        self.handler.get_issue_from_summary = MagicMock()
+        self.handler.create_issue = MagicMock()
+        self.handler.summary_index = SummaryIndex("project")
+
+        project = "project"
+        ticket = MagicMock()
+        ticket.title = "title"
+        ticket.type = "bug"
+        ticket.parent = None
+        self.handler.type_mappings = {"bug": "Bug"}
+
+        jira_issue = MagicMock()
+        jira_issue.fields.summary = ticket.title
+        self.handler.create_issue.return_value = jira_issue
+
+        output = self.handler.create_base_jira_issue(ticket, project)
+
+        self.assertEqual(output, jira_issue)
+        self.handler.get_issue_from_summary.assert_not_called()
+        self.assertEqual(
+            self.handler.summary_index.get(ticket.title), [jira_issue]
+        )
+
     def test_create_base_jira_issue_creation_error(self):
         self.handler.search_users = MagicMock()
         self.handler.get_issue_from_summary = MagicMock()
@@ -210,6 +768,171 @@ class TestJIRAHandler(TestCase):
         output = self.handler.create_base_jira_issue(ticket, project)
         self.assertEqual(output, None)
 
+    @patch("clickup_to_jira.retry.sleep")
+    def test_create_base_jira_issue_lost_response(self, sleep):
+        self.handler.search_users = MagicMock(return_value=[])
+        self.handler.create_issue = MagicMock()
+        self.handler.create_issue.side_effect = JIRAError(status_code=504)
+        self.handler.get_issues_from_task_ids = MagicMock()
+        self.handler.type_mappings = {"bug": "Bug"}
+        jira_issue = MagicMock(key="PROJ-1")
+        self.handler.get_issues_from_task_ids.return_value = {"1": jira_issue}
+
+        output = self.handler.create_base_jira_issue(
+            get_ticket("1"), "project"
+        )
+
+        self.assertEqual(output, jira_issue)
+        self.handler.create_issue.assert_called_once()
+        self.assertEqual(
+            self.handler.create_issue.call_args.kwargs["fields"]["labels"],
+            ["clickup-1"],
+        )
+        self.handler.get_issues_from_task_ids.assert_called_once_with(
+            "project", ["1"]
+        )
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_create_base_jira_issue_retries_when_not_created(self, sleep):
+        self.handler.search_users = MagicMock(return_value=[])
+        self.handler.create_issue = MagicMock()
+        jira_issue = MagicMock(key="PROJ-1")
+        self.handler.create_issue.side_effect = [
+            JIRAError(status_code=503),
+            jira_issue,
+        ]
+        self.handler.get_issues_from_task_ids = MagicMock(return_value={})
+        self.handler.type_mappings = {"bug": "Bug"}
+
+        output = self.handler.create_base_jira_issue(
+            get_ticket("1"), "project"
+        )
+
+        self.assertEqual(output, jira_issue)
+        self.assertEqual(self.handler.create_issue.call_count, 2)
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_create_base_jira_issue_lost_response_lagging_index(self, sleep):
+        self.handler.search_users = MagicMock(return_value=[])
+        self.handler.create_issue = MagicMock(
+            side_effect=JIRAError(status_code=504)
+        )
+        self.handler.type_mappings = {"bug": "Bug"}
+        jira_issue = MagicMock(key="PROJ-1")
+        self.handler.get_issues_from_task_ids = MagicMock(
+            side_effect=[{}, {}, {"1": jira_issue}]
+        )
+
+        output = self.handler.create_base_jira_issue(
+            get_ticket("1"), "project"
+        )
+
+        self.assertEqual(output, jira_issue)
+        self.handler.create_issue.assert_called_once()
+        self.assertEqual(self.handler.get_issues_from_task_ids.call_count, 3)
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_create_base_jira_issue_lost_response_without_labels(self, sleep):
+        self.handler.search_users = MagicMock(return_value=[])
+        self.handler.create_issue = MagicMock(
+            side_effect=JIRAError(status_code=504)
+        )
+        self.handler.type_mappings = {"bug": "Bug"}
+        self.handler.labelled_issue_types = {"Task"}
+        jira_issue = MagicMock(key="PROJ-1")
+        jira_issue.fields.summary = "1"
+        self.handler.search_issues = MagicMock(return_value=[jira_issue])
+        self.handler.get_issues_from_task_ids = MagicMock()
+
+        output = self.handler.create_base_jira_issue(
+            get_ticket("1"), "project"
+        )
+
+        self.assertEqual(output, jira_issue)
+        self.assertNotIn(
+            "labels", self.handler.create_issue.call_args.kwargs["fields"]
+        )
+        self.handler.search_issues.assert_called_once_with(
+            'project = "project" and summary ~ "1" ORDER BY created DESC',
+            fields="summary,status",
+        )
+        self.handler.get_issues_from_task_ids.assert_not_called()
+
+    def test_get_labelled_issue_types(self):
+        self.handler.type_mappings = {"bug": "Bug", "feature": "Story"}
+        bug, story, epic = (
+            get_named("Bug"),
+            get_named("Story"),
+            get_named("Epic"),
+        )
+        bug.id, story.id = "1", "2"
+        self.handler.project_issue_types = MagicMock(
+            return_value=[bug, story, epic]
+        )
+        self.handler.project_issue_fields = MagicMock(
+            side_effect=lambda project, issue_type, maxResults: [
+                MagicMock(fieldId="summary"),
+                MagicMock(fieldId="labels" if issue_type == "1" else "other"),
+            ]
+        )
+
+        output = self.handler.get_labelled_issue_types("10000")
+
+        self.assertEqual(output, {"Bug"})
+        self.assertEqual(self.handler.project_issue_fields.call_count, 2)
+
+    def test_get_labelled_issue_types_on_cloud(self):
+        self.handler.type_mappings = {"bug": "Bug", "feature": "Story"}
+        self.handler.deploymentType = "Cloud"
+        self.handler._version = (1001, 0, 0)
+        self.handler._get_json = MagicMock(
+            return_value={
+                "projects": [
+                    {
+                        "issuetypes": [
+                            {"name": "Bug", "fields": {"labels": {}}},
+                            {"name": "Story", "fields": {"summary": {}}},
+                            {"name": "Epic", "fields": {"labels": {}}},
+                        ]
+                    }
+                ]
+            }
+        )
+
+        output = self.handler.get_labelled_issue_types("10000")
+
+        self.assertEqual(output, {"Bug"})
+        self.handler._get_json.assert_called_once_with(
+            "issue/createmeta",
+            {
+                "projectIds": ["10000"],
+                "expand": "projects.issuetypes.fields",
+            },
+        )
+
+    def test_get_labelled_issue_types_unsupported(self):
+        self.handler.deploymentType = "Server"
+        self.handler._version = (8, 0, 0)
+        self.handler._get_json = MagicMock(
+            side_effect=JIRAError(status_code=404)
+        )
+
+        self.assertIsNone(self.handler.get_labelled_issue_types("10000"))
+
+    def test_get_issues_from_task_ids(self):
+        issue = MagicMock()
+        issue.fields.labels = ["other", "clickup-2"]
+        self.handler.search_issues = MagicMock(return_value=[issue])
+
+        output = self.handler.get_issues_from_task_ids("10000", ["1", "2"])
+
+        self.assertEqual(output, {"2": issue})
+        self.handler.search_issues.assert_called_once_with(
+            'project = "10000" and labels in ("clickup-1", "clickup-2")',
+            maxResults=2,
+            fields="labels,status",
+        )
+
     def test_assign_issue_to_user(self):
         self.handler.search_users = MagicMock()
         self.handler.assign_issue = MagicMock()
@@ -249,41 +972,160 @@ class TestJIRAHandler(TestCase):
         self.handler.search_users.assert_called_once_with(user=assignee)
         self.handler.assign_issue.assert_called_once_with(jira_issue, user)
 
+    def test_assign_issue_to_user_no_user(self):
+        self.handler.search_users = MagicMock()
+        self.handler.assign_issue = MagicMock()
+        self.handler.search_users.return_value = []
+
+        ticket = MagicMock()
+        ticket.assignee = "assignee"
+        jira_issue = MagicMock()
+
+        output = self.handler.assign_issue_to_user(jira_issue, ticket)
+
+        self.assertEqual(output, False)
+        self.handler.assign_issue.assert_not_called()
+
+    def test_assign_issue_to_user_no_assignee(self):
+        self.handler.assign_issue = MagicMock()
+
+        output = self.handler.assign_issue_to_user(
+            MagicMock(), get_ticket("1")
+        )
+
+        self.assertEqual(output, True)
+        self.handler.assign_issue.assert_not_called()
+
+    @patch.dict(os.environ, {"JIRA_PRELOAD_USERS": "True"})
+    @patch("clickup_to_jira.handlers.jira.UserDirectory")
+    def test_user_directory(self, user_directory):
+        output = self.handler.user_directory
+
+        self.assertEqual(output, user_directory.return_value)
+        self.assertEqual(self.handler.user_directory, output)
+        user_directory.assert_called_once_with(self.handler, None)
+        user_directory().preload.assert_called_once_with()
+
     def test_transition_issue_to_proper_status(self):
         self.handler.update_status_mappings = MagicMock()
         self.handler.transition_issue = MagicMock()
+        self.handler.transitions = MagicMock()
 
         ticket = MagicMock()
         status = "status"
         ticket.status = status
         jira_issue = MagicMock()
+        jira_issue.__str__.return_value = "PROJ-1"
+        jira_issue.fields.status.name = "To Do"
+
+        self.handler.status_mappings[status] = "Done"
+        self.handler.transitions.side_effect = [
+            [
+                {"id": "11", "to": {"name": "In Progress"}},
+                {"id": "12", "to": {"name": "Blocked"}},
+            ],
+            [
+                {"id": "21", "to": {"name": "Done"}},
+                {"id": "22", "to": {"name": "To Do"}},
+            ],
+        ]
+
+        output = self.handler.transition_issue_to_proper_status(
+            jira_issue, ticket
+        )
 
-        self.handler.status_mappings[status] = status
+        self.assertEqual(output, True)
+        self.handler.update_status_mappings.assert_not_called()
+        self.handler.transition_issue.assert_has_calls(
+            [call(jira_issue, "11"), call(jira_issue, "21")]
+        )
+        self.assertEqual(self.handler.transitions.call_count, 2)
 
+        # The workflow is cached for the next issue of the same type
+        self.handler.transition_issue.reset_mock()
         self.handler.transition_issue_to_proper_status(jira_issue, ticket)
 
-        self.handler.update_status_mappings.assert_not_called()
-        self.handler.transition_issue.assert_called_once_with(
-            jira_issue, status
+        self.handler.transition_issue.assert_has_calls(
+            [call(jira_issue, "11"), call(jira_issue, "21")]
+        )
+        self.assertEqual(self.handler.transitions.call_count, 2)
+
+    def test_transition_issue_to_proper_status_resumed_issue(self):
+        self.handler.transition_issue = MagicMock()
+        self.handler.transitions = MagicMock()
+
+        ticket = MagicMock()
+        ticket.status = "status"
+        jira_issue = MagicMock()
+        jira_issue.__str__.return_value = "PROJ-1"
+        # A crashed run already moved the issue out of the initial status
+        jira_issue.fields.status.name = "In Progress"
+        workflow = self.handler.get_workflow(jira_issue, ticket)
+        workflow.initial_status = "To Do"
+
+        self.handler.status_mappings["status"] = "Done"
+        self.handler.transitions.return_value = [
+            {"id": "21", "to": {"name": "Done"}}
+        ]
+
+        output = self.handler.transition_issue_to_proper_status(
+            jira_issue, ticket
         )
 
+        self.assertEqual(output, True)
+        self.handler.transition_issue.assert_called_once_with(jira_issue, "21")
+        self.assertEqual(workflow.initial_status, "To Do")
+
+    def test_transition_issue_to_proper_status_no_path(self):
+        self.handler.update_status_mappings = MagicMock()
+        self.handler.transition_issue = MagicMock()
+        self.handler.transitions = MagicMock()
+        self.handler.issue = MagicMock()
+        self.handler.issue.return_value.fields.status.name = "To Do"
+
+        ticket = MagicMock()
+        status = "status"
+        ticket.status = status
+        jira_issue = MagicMock(spec=["__str__"])
+        jira_issue.__str__.return_value = "PROJ-1"
+
+        self.handler.status_mappings[status] = "Done"
+        self.handler.transitions.side_effect = [
+            [{"id": "11", "to": {"name": "In Progress"}}],
+            [{"id": "22", "to": {"name": "To Do"}}],
+        ]
+
+        output = self.handler.transition_issue_to_proper_status(
+            jira_issue, ticket
+        )
+
+        self.assertEqual(output, False)
+        self.handler.issue.assert_called_once_with("PROJ-1", fields="status")
+        self.handler.transition_issue.assert_called_once_with(jira_issue, "11")
+
     def test_transition_issue_to_proper_status_transition_error(self):
         self.handler.update_status_mappings = MagicMock()
         self.handler.transition_issue = MagicMock()
+        self.handler.transitions = MagicMock()
 
         ticket = MagicMock()
         status = "status"
         ticket.status = status
         jira_issue = MagicMock()
+        jira_issue.fields.status.name = "To Do"
 
         self.handler.status_mappings[status] = status
+        self.handler.transitions.return_value = [
+            {"id": "11", "to": {"name": status}}
+        ]
         self.handler.transition_issue.side_effect = JIRAError()
-        self.handler.transition_issue_to_proper_status(jira_issue, ticket)
+        output = self.handler.transition_issue_to_proper_status(
+            jira_issue, ticket
+        )
 
+        self.assertEqual(output, False)
         self.handler.update_status_mappings.assert_not_called()
-        self.handler.transition_issue.assert_called_once_with(
-            jira_issue, status
-        )
+        self.handler.transition_issue.assert_called_once_with(jira_issue, "11")
 
     def test_transition_issue_to_proper_status_mapping_error(self):
         self.handler.update_status_mappings = MagicMock()
@@ -310,8 +1152,9 @@ class TestJIRAHandler(TestCase):
         status = "status"
         ticket.status = status
         jira_issue = MagicMock()
+        jira_issue.fields.status.name = "Backlog"
         jira_status = "To Do"
-        transition = {"to": {"name": jira_status}}
+        transition = {"id": "11", "to": {"name": jira_status}}
 
         input_mock.side_effect = ["Error", jira_status]
         self.handler.transitions.return_value = [transition]
@@ -331,12 +1174,13 @@ class TestJIRAHandler(TestCase):
         status = "status"
         ticket.status = status
         jira_issue = MagicMock()
+        jira_issue.fields.status.name = "Backlog"
         jira_status = "To Do"
-        transition = {"to": {"name": jira_status}}
+        transition = {"id": "11", "to": {"name": jira_status}}
 
         input_mock.side_effect = [jira_status]
         self.handler.transitions.return_value = [transition]
-        self.status_mappings = {status: jira_status}
+        self.handler.status_mappings = {status: jira_status}
 
         self.handler.update_status_mappings(ticket, jira_issue)
 
@@ -352,8 +1196,9 @@ class TestJIRAHandler(TestCase):
         status = "status"
         ticket.status = status
         jira_issue = MagicMock()
+        jira_issue.fields.status.name = "Backlog"
         jira_status = "To Do"
-        transition = {"to": {"name": jira_status}}
+        transition = {"id": "11", "to": {"name": jira_status}}
 
         input_mock.side_effect = [jira_status]
         self.handler.transitions.return_value = [transition]
@@ -427,6 +1272,83 @@ class TestJIRAHandler(TestCase):
         self.assertEqual(mappings, {"bug": "Story", "ci": "Story"})
         self.assertEqual(input_mock.call_count, 4)
 
+    def test_select_project_from_config(self):
+        project = MagicMock(key="PROJ")
+        project.name = "Project"
+        self.handler.projects = MagicMock(return_value=[project])
+        self.handler.config = get_config()
+
+        self.assertEqual(self.handler.select_project(), project)
+
+        self.handler.config.jira_project = "OTHER"
+        with self.assertRaises(ConfigError):
+            self.handler.select_project()
+
+    def test_create_configured_type_mappings(self):
+        self.handler.issue_types = MagicMock()
+        self.handler.issue_types.return_value = [
+            get_named("Bug"),
+            get_named("Story"),
+        ]
+        self.handler.config = get_config(
+            type_mappings={"bug": "Bug"}, default_type="Story"
+        )
+
+        mappings = self.handler.create_configured_type_mappings(
+            [get_ticket("1")], click_up_labels=["bug", "ci"]
+        )
+
+        self.assertEqual(mappings, {"bug": "Bug", "ci": "Story"})
+
+    def test_create_configured_type_mappings_unmapped_label(self):
+        self.handler.issue_types = MagicMock()
+        self.handler.issue_types.return_value = [get_named("Bug")]
+        self.handler.config = get_config(type_mappings={"ci": "Bug"})
+
+        with self.assertRaises(ConfigError):
+            self.handler.create_configured_type_mappings([get_ticket("1")])
+
+    def test_create_configured_type_mappings_invalid_type(self):
+        self.handler.issue_types = MagicMock()
+        self.handler.issue_types.return_value = [get_named("Bug")]
+        self.handler.config = get_config(default_type="Task")
+
+        with self.assertRaises(ConfigError):
+            self.handler.create_configured_type_mappings([get_ticket("1")])
+
+    def test_create_configured_status_mappings(self):
+        self.handler.statuses = MagicMock()
+        self.handler.statuses.return_value = [get_named("Done")]
+        self.handler.status_mappings = {}
+        self.handler.config = get_config(status_mappings={"status": "Done"})
+
+        self.handler.create_configured_status_mappings([get_ticket("1")])
+
+        self.assertEqual(self.handler.status_mappings, {"status": "Done"})
+
+    def test_create_configured_status_mappings_invalid(self):
+        self.handler.statuses = MagicMock()
+        self.handler.statuses.return_value = [get_named("Done")]
+        self.handler.status_mappings = {}
+
+        self.handler.config = get_config(default_status="To Do")
+        with self.assertRaises(ConfigError):
+            self.handler.create_configured_status_mappings([get_ticket("1")])
+
+        self.handler.config = get_config(status_mappings={"other": "Done"})
+        with self.assertRaises(ConfigError):
+            self.handler.create_configured_status_mappings([get_ticket("1")])
+
+    @patch("builtins.input")
+    def test_update_status_mappings_from_config(self, input_mock):
+        self.handler.status_mappings = {}
+        self.handler.config = get_config(default_status="To Do")
+
+        self.handler.update_status_mappings(get_ticket("1"), MagicMock())
+
+        self.assertEqual(self.handler.status_mappings, {"status": "To Do"})
+        input_mock.assert_not_called()
+
     @patch("builtins.input")
     def test_create_type_mappings_first_error_then_default(self, input_mock):
         self.handler.issue_types = MagicMock()
@@ -498,6 +1420,80 @@ class TestJIRAHandler(TestCase):
             ]
         )
 
+    def test_add_comments_skips_migrated_comments(self):
+        self.handler.add_comment = MagicMock()
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.is_done.side_effect = (
+            lambda task_id, step: step == "comment:1"
+        )
+
+        comment_1 = MagicMock(id="1", commenter="a@mail.com", text="Do that")
+        comment_2 = MagicMock(id="2", commenter="b@mail.com", text="Did it")
+        ticket = get_ticket("1")
+        ticket.comments = [comment_1, comment_2]
+        jira_issue = MagicMock()
+
+        output = self.handler.add_comments(jira_issue, ticket)
+
+        self.assertEqual(output, True)
+        self.handler.add_comment.assert_called_once_with(
+            jira_issue, "b@mail.com said: Did it"
+        )
+        self.handler.migration_state.record_step.assert_called_once_with(
+            "1", "comment:2"
+        )
+
+    def test_add_attachments(self):
+        self.handler.attachment_transfer = MagicMock()
+        self.handler.migration_state = MagicMock()
+        self.handler.migration_state.is_done.side_effect = (
+            lambda task_id, step: step == "attachment:1"
+        )
+        failed = MagicMock()
+        failed.result.side_effect = OSError("reset")
+        self.handler.attachment_transfer.submit.side_effect = [
+            MagicMock(),
+            failed,
+        ]
+
+        ticket = get_ticket("1")
+        ticket.attachments = [
+            Attachment("1", "a.txt", "https://a"),
+            Attachment("2", "b.txt", "https://b"),
+            Attachment("3", "c.txt", "https://c"),
+        ]
+        jira_issue = MagicMock()
+
+        output = self.handler.add_attachments(jira_issue, ticket)
+
+        self.assertEqual(output, False)
+        self.handler.attachment_transfer.submit.assert_has_calls(
+            [
+                call(self.handler, jira_issue, ticket.attachments[1]),
+                call(self.handler, jira_issue, ticket.attachments[2]),
+            ]
+        )
+        self.handler.migration_state.record_step.assert_called_once_with(
+            "1", "attachment:2"
+        )
+
+    def test_complete_jira_issue_with_attachments(self):
+        self.handler.attachment_transfer = MagicMock()
+        self.handler.assign_issue_to_user = MagicMock()
+        self.handler.transition_issue_to_proper_status = MagicMock()
+        self.handler.add_comments = MagicMock()
+        self.handler.add_attachments = MagicMock()
+
+        ticket = get_ticket("1")
+        ticket.attachments = [Attachment("1", "a.txt", "https://a")]
+        jira_issue = MagicMock()
+
+        self.handler.complete_jira_issue(jira_issue, ticket)
+
+        self.handler.add_attachments.assert_called_once_with(
+            jira_issue, ticket
+        )
+
     def test_get_issue_from_summary(self):
         self.handler.search_issues = MagicMock()
 
@@ -512,6 +1508,31 @@ class TestJIRAHandler(TestCase):
         output = self.handler.get_issue_from_summary("project", summary)
         self.assertEqual(output, [issue_2])
 
+    def test_get_issue_from_summary_escapes_quotes(self):
+        self.handler.search_issues = MagicMock()
+        self.handler.search_issues.return_value = []
+
+        self.handler.get_issue_from_summary("project", 'A "quoted" story')
+
+        self.handler.search_issues.assert_called_once_with(
+            'project = "project" and summary ~ "A \\"quoted\\" story" '
+            "ORDER BY created DESC"
+        )
+
+    def test_get_issue_from_summary_with_index(self):
+        self.handler.search_issues = MagicMock()
+        issue = MagicMock()
+        issue.fields.summary = "This is a story"
+        self.handler.summary_index = SummaryIndex("project")
+        self.handler.summary_index.add(issue)
+
+        output = self.handler.get_issue_from_summary(
+            "project", "This is a story"
+        )
+
+        self.assertEqual(output, [issue])
+        self.handler.search_issues.assert_not_called()
+
     def test_search_users(self):
         self.handler._fetch_pages = MagicMock()
         response = MagicMock()
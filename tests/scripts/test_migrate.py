@@ -1,7 +1,8 @@
 import os
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from clickup_to_jira.config import ConfigError
 from clickup_to_jira.scripts.migrate import main
 
 
@@ -26,7 +27,7 @@ class TestMigrate(TestCase):
         clickup().get_click_up_tickets.return_value = clickup_tickets
         converter().convert.return_value = converted_tickets
 
-        main()
+        main([])
 
         logging.assert_called_once()
         converter().convert.assert_called_once_with(
@@ -35,3 +36,160 @@ class TestMigrate(TestCase):
         jira().create_jira_issues.assert_called_once_with(
             converted_tickets,
         )
+        clickup().close.assert_called_once_with()
+
+    @patch.dict(os.environ, {"MIGRATION_STREAMING": "True"})
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.MigrationPipeline")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_streaming(self, logging, pipeline, converter, jira, clickup):
+        main([])
+
+        pipeline.assert_called_once_with(clickup(), converter(), jira())
+        pipeline().run.assert_called_once_with()
+        clickup().get_click_up_tickets.assert_not_called()
+        jira().create_jira_issues.assert_not_called()
+
+    @patch.dict(os.environ, {"MIGRATION_CONFIG": "config.toml"})
+    @patch("clickup_to_jira.scripts.migrate.load_config")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_headless(self, logging, converter, jira, clickup, config):
+        main([])
+
+        config.assert_called_once_with("config.toml")
+        self.assertEqual(clickup.call_args.kwargs["config"], config())
+        self.assertEqual(jira.call_args.kwargs["config"], config())
+
+    @patch.dict(
+        os.environ,
+        {"MIGRATION_CONFIG": "config.toml", "MIGRATION_SHARD_WORKERS": "3"},
+    )
+    @patch("clickup_to_jira.scripts.migrate.load_config")
+    @patch("clickup_to_jira.scripts.migrate.migrate_team")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_team(self, logging, jira, clickup, migrate_team, config):
+        main([])
+
+        migrate_team.assert_called_once_with(
+            clickup(), config(), 3, metrics=None
+        )
+        jira.assert_not_called()
+
+    @patch.dict(os.environ, {"MIGRATION_SHARD_WORKERS": "3"})
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_team_without_config(self, logging, clickup):
+        with self.assertRaises(ConfigError):
+            main([])
+
+    @patch.dict(os.environ, {"CLICKUP_ASYNC": "True"})
+    @patch("clickup_to_jira.scripts.migrate.AsyncClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_async_clickup(
+        self, logging, converter, jira, clickup, async_clickup
+    ):
+        clickup_tickets = MagicMock()
+        async_clickup().get_click_up_tickets = AsyncMock(
+            return_value=clickup_tickets
+        )
+
+        main([])
+
+        async_clickup.assert_called_with(clickup())
+        converter().convert.assert_called_once_with(clickup_tickets)
+        clickup().get_click_up_tickets.assert_not_called()
+
+    @patch.dict(os.environ, {"JIRA_ASYNC": "True"})
+    @patch("clickup_to_jira.scripts.migrate.AsyncJIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_async_jira(
+        self, logging, converter, jira, clickup, async_jira
+    ):
+        async_jira().create_jira_issues = AsyncMock()
+
+        main([])
+
+        async_jira.assert_called_with(jira())
+        async_jira().create_jira_issues.assert_awaited_once_with(
+            converter().convert()
+        )
+        jira().create_jira_issues.assert_not_called()
+
+    @patch.dict(os.environ, {"MIGRATION_SYNC": "True"})
+    @patch("clickup_to_jira.scripts.migrate.DeltaSync")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_sync(self, logging, converter, jira, clickup, sync):
+        main([])
+
+        sync.assert_called_once_with(clickup(), converter(), jira())
+        sync().run.assert_called_once_with()
+        clickup().get_click_up_tickets.assert_not_called()
+        jira().create_jira_issues.assert_not_called()
+
+    @patch.dict(
+        os.environ, {"MIGRATION_PLAN": "True", "MIGRATION_PLAN_SAMPLES": "3"}
+    )
+    @patch("clickup_to_jira.scripts.migrate.MigrationPlanner")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_plan(self, logging, converter, jira, clickup, planner):
+        main([])
+
+        planner.assert_called_once_with(jira(), 3)
+        planner().plan.assert_called_once_with(converter().convert())
+        planner().plan().log.assert_called_once_with()
+        jira().create_jira_issues.assert_not_called()
+
+    @patch.dict(
+        os.environ,
+        {"MIGRATION_METRICS": "metrics", "MIGRATION_METRICS_PORT": "9100"},
+    )
+    @patch("clickup_to_jira.scripts.migrate.MigrationMetrics")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_metrics(self, logging, converter, jira, clickup, metrics):
+        jira().create_jira_issues.side_effect = RuntimeError()
+
+        with self.assertRaises(RuntimeError):
+            main([])
+
+        self.assertIs(clickup.call_args.kwargs["metrics"], metrics())
+        self.assertIs(jira.call_args.kwargs["metrics"], metrics())
+        metrics().serve.assert_called_once_with(9100)
+        metrics().close.assert_called_once_with()
+        metrics().report.assert_called_once_with("metrics")
+
+    @patch("clickup_to_jira.scripts.migrate.PhaseProfiler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpHandler")
+    @patch("clickup_to_jira.scripts.migrate.JIRAHandler")
+    @patch("clickup_to_jira.scripts.migrate.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.scripts.migrate.initialize_logging")
+    def test_main_profile(self, logging, converter, jira, clickup, profiler):
+        main(["--profile", "profiles"])
+
+        profiler.assert_called_once_with("profiles")
+        profiler().start().instrument.assert_called_once_with(
+            clickup(), converter(), jira()
+        )
+        profiler().start().close.assert_called_once_with()
+        jira().create_jira_issues.assert_called_once()
@@ -0,0 +1,127 @@
+import os
+from threading import Event
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clickup_to_jira.attachment import Attachment
+from clickup_to_jira.attachment_transfer import AttachmentTransfer
+
+
+def get_response(chunks, etag=None):
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers = {"ETag": etag} if etag else {}
+    response.iter_content.return_value = iter(chunks)
+    return response
+
+
+class TestAttachmentTransfer(TestCase):
+    def setUp(self):
+        self.transfer = AttachmentTransfer(workers=2)
+        self.transfer.session = MagicMock()
+
+    def tearDown(self):
+        self.transfer.close()
+
+    def test_fetch_streams_to_disk(self):
+        self.transfer.session.get.return_value = get_response([b"ab", b"c"])
+
+        path = self.transfer.fetch(Attachment("1", "a.txt", "https://a"))
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"abc")
+        self.transfer.session.get.assert_called_once_with(
+            "https://a", stream=True, timeout=self.transfer.timeout
+        )
+
+    def test_fetch_same_url_once(self):
+        self.transfer.session.get.return_value = get_response([b"abc"])
+
+        path_1 = self.transfer.fetch(Attachment("1", "a.txt", "https://a"))
+        path_2 = self.transfer.fetch(Attachment("2", "a.txt", "https://a"))
+
+        self.assertEqual(path_1, path_2)
+        self.transfer.session.get.assert_called_once()
+
+    def test_fetch_same_etag_downloads_both(self):
+        self.transfer.session.get.side_effect = [
+            get_response([b"abc"], etag='"1"'),
+            get_response([b"def"], etag='"1"'),
+        ]
+
+        path_1 = self.transfer.fetch(Attachment("1", "a.txt", "https://a"))
+        path_2 = self.transfer.fetch(Attachment("2", "b.txt", "https://b"))
+
+        self.assertNotEqual(path_1, path_2)
+        with open(path_2, "rb") as f:
+            self.assertEqual(f.read(), b"def")
+
+    def test_fetch_same_content_kept_once(self):
+        self.transfer.session.get.side_effect = [
+            get_response([b"abc"]),
+            get_response([b"a", b"bc"]),
+        ]
+
+        path_1 = self.transfer.fetch(Attachment("1", "a.txt", "https://a"))
+        path_2 = self.transfer.fetch(Attachment("2", "b.txt", "https://b"))
+
+        self.assertEqual(path_1, path_2)
+        self.assertEqual(len(os.listdir(self.transfer._directory.name)), 1)
+
+    def test_fetch_failure_retried(self):
+        response = get_response([b"abc"])
+        response.raise_for_status.side_effect = [OSError("reset"), None]
+        self.transfer.session.get.return_value = response
+        attachment = Attachment("1", "a.txt", "https://a")
+
+        with self.assertRaises(OSError):
+            self.transfer.fetch(attachment)
+        path = self.transfer.fetch(attachment)
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.transfer.session.get.call_count, 2)
+
+    def test_submit(self):
+        self.transfer.session.get.return_value = get_response([b"abc"])
+        jira = MagicMock()
+        contents = []
+        jira.add_attachment.side_effect = (
+            lambda issue, f, filename: contents.append(f.read())
+        )
+
+        self.transfer.submit(
+            jira, "PROJ-1", Attachment("1", "a.txt", "https://a")
+        ).result()
+
+        self.assertEqual(contents, [b"abc"])
+        self.assertEqual(
+            jira.add_attachment.call_args.kwargs, {"filename": "a.txt"}
+        )
+
+    def test_submit_removes_released_files(self):
+        self.transfer.session.get.side_effect = [
+            get_response([b"abc"]),
+            get_response([b"abc"]),
+            get_response([b"def"]),
+        ]
+        submitted = Event()
+        jira = MagicMock()
+        jira.add_attachment.side_effect = lambda *args, **kwargs: (
+            submitted.wait()
+        )
+        transfers = [
+            self.transfer.submit(jira, "PROJ-1", attachment)
+            for attachment in (
+                Attachment("1", "a.txt", "https://a"),
+                Attachment("2", "a.txt", "https://a"),
+                Attachment("3", "b.txt", "https://b"),
+                Attachment("4", "c.txt", "https://c"),
+            )
+        ]
+        submitted.set()
+        for transfer in transfers:
+            transfer.result()
+
+        self.assertEqual(jira.add_attachment.call_count, 4)
+        self.assertEqual(self.transfer.session.get.call_count, 3)
+        self.assertEqual(os.listdir(self.transfer._directory.name), [])
@@ -0,0 +1,90 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from clickup_to_jira.config import ConfigError, MigrationConfig, load_config
+
+
+class TestLoadConfig(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.toml")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        with open(self.path, "w") as f:
+            f.write(content)
+
+    def test_load_config(self):
+        self.write(
+            """
+[clickup]
+team = "Team"
+space = "Space"
+project = "Project"
+list = "List"
+
+[jira]
+project = "PROJ"
+
+[types]
+bug = "Bug"
+
+[statuses]
+"in progress" = "In Progress"
+
+[defaults]
+type = "Story"
+status = "To Do"
+"""
+        )
+
+        output = load_config(self.path)
+
+        self.assertEqual(
+            output,
+            MigrationConfig(
+                team="Team",
+                space="Space",
+                project="Project",
+                list="List",
+                jira_project="PROJ",
+                type_mappings={"bug": "Bug"},
+                status_mappings={"in progress": "In Progress"},
+                default_type="Story",
+                default_status="To Do",
+            ),
+        )
+
+    def test_load_config_minimal(self):
+        self.write(
+            """
+[clickup]
+team = "Team"
+space = "Space"
+project = "Project"
+
+[jira]
+project = "PROJ"
+"""
+        )
+
+        output = load_config(self.path)
+
+        self.assertEqual(output.list, None)
+        self.assertEqual(output.type_mappings, {})
+        self.assertEqual(output.default_status, None)
+
+    def test_load_config_missing_key(self):
+        self.write('[clickup]\nteam = "Team"\n')
+
+        with self.assertRaises(ConfigError):
+            load_config(self.path)
+
+    def test_load_config_invalid_toml(self):
+        self.write("[clickup\n")
+
+        with self.assertRaises(ConfigError):
+            load_config(self.path)
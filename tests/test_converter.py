@@ -1,6 +1,9 @@
+import os
 from unittest import TestCase
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
+from clickup_to_jira.attachment import Attachment
+from clickup_to_jira.comment import Comment
 from clickup_to_jira.converter import ClickUpToJIRAConverter
 
 
@@ -44,7 +47,7 @@ class TestClickUpToJIRAConverter(TestCase):
         assignees_sub = []
         id_sub = "1"
         parent_sub = "2"
-        comments_sub = ["comment_1_sub"]
+        comments_sub = [Comment(id="1", text="comment_1_sub", commenter="")]
 
         sub_ticket = MagicMock()
         sub_ticket.id = id_sub
@@ -67,7 +70,10 @@ class TestClickUpToJIRAConverter(TestCase):
         assignees = ["assignee_1"]
         id_par = "2"
         parent = None
-        comments = ["comment_1", "comment_2"]
+        comments = [
+            Comment(id="2", text="comment_1", commenter=""),
+            Comment(id="3", text="comment_2", commenter=""),
+        ]
 
         ticket = MagicMock()
         ticket.id = id_par
@@ -103,3 +109,100 @@ class TestClickUpToJIRAConverter(TestCase):
         self.assertEqual(output.subtasks[0].assignee, None)
         self.assertEqual(output.subtasks[0].comments, comments_sub)
         self.assertEqual(output.subtasks[0].parent, parent_sub)
+
+    def test_convert_ticket_converts_markdown(self):
+        ticket = MagicMock()
+        ticket.tags = []
+        ticket.linked_tasks = []
+        ticket.assignees = []
+        ticket.description = "# Title\n\n- **item**"
+        ticket.comments = [
+            Comment(id="1", text="see [docs](https://docs)", commenter="user")
+        ]
+
+        output = self.converter.convert_ticket(ticket)
+
+        self.assertEqual(output.description, "h1. Title\n\n* *item*")
+        self.assertEqual(
+            output.comments,
+            [
+                Comment(
+                    id="1", text="see [docs|https://docs]", commenter="user"
+                )
+            ],
+        )
+        self.assertEqual(ticket.comments[0].text, "see [docs](https://docs)")
+
+    def test_convert_ticket_resolves_mentions(self):
+        self.converter.jira.user_directory.get_account_id.return_value = "123"
+        ticket = MagicMock()
+        ticket.tags = []
+        ticket.linked_tasks = []
+        ticket.assignees = []
+        ticket.description = "ask @user@mail.com"
+        ticket.comments = []
+
+        output = self.converter.convert_ticket(ticket)
+
+        self.assertEqual(output.description, "ask [~accountid:123]")
+        self.converter.jira.user_directory.get_account_id.assert_called_once_with(
+            "user@mail.com"
+        )
+
+    def test_convert_ticket_resolves_member_mentions(self):
+        self.converter.click_up.get_member_email.side_effect = {
+            "john": "john@mail.com"
+        }.get
+        self.converter.jira.user_directory.get_account_id.return_value = "123"
+        ticket = MagicMock()
+        ticket.tags = []
+        ticket.linked_tasks = []
+        ticket.assignees = []
+        ticket.description = "ask @john, not @decorator"
+        ticket.comments = []
+
+        output = self.converter.convert_ticket(ticket)
+
+        self.assertEqual(
+            output.description, "ask [~accountid:123], not @decorator"
+        )
+        self.converter.jira.user_directory.get_account_id.assert_called_once_with(
+            "john@mail.com"
+        )
+
+    @patch.dict(os.environ, {"MIGRATION_ATTACHMENT_WORKERS": "2"})
+    def test_convert_ticket_with_attachments(self):
+        self.converter.click_up.get_task_attachments.return_value = [
+            {"id": "1", "title": "a.png", "url": "https://a", "size": 3},
+            {"id": "2", "title": None, "url": "https://b"},
+        ]
+        ticket = MagicMock()
+        ticket.tags = []
+        ticket.linked_tasks = []
+        ticket.assignees = []
+        ticket.comments = []
+
+        output = self.converter.convert_ticket(ticket)
+
+        self.assertEqual(
+            output.attachments,
+            [
+                Attachment(id="1", title="a.png", url="https://a", size=3),
+                Attachment(id="2", title="2", url="https://b"),
+            ],
+        )
+        self.converter.click_up.get_task_attachments.assert_called_once_with(
+            ticket
+        )
+
+    def test_convert_ticket_without_attachments(self):
+        ticket = MagicMock()
+        ticket.tags = []
+        ticket.linked_tasks = []
+        ticket.assignees = []
+        ticket.comments = []
+
+        output = self.converter.convert_ticket(ticket)
+
+        self.assertEqual(output.attachments, [])
+        self.converter.click_up.get_task_attachments.assert_not_called()
@@ -0,0 +1,103 @@
+from threading import Event
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clickup_to_jira.follow_up import (
+    FollowUpExecutor,
+    FollowUpFailure,
+    FollowUpReport,
+)
+
+
+class TestFollowUpExecutor(TestCase):
+    def test_from_config_single_number(self):
+        executor = FollowUpExecutor.from_config("3")
+
+        self.assertEqual(
+            [e._max_workers for e in executor._executors.values()],
+            [3, 3, 3, 3, 3],
+        )
+        executor.shutdown()
+
+    def test_from_config_per_step(self):
+        executor = FollowUpExecutor.from_config("assign=4, comments=2")
+
+        self.assertEqual(executor._executors["assign"]._max_workers, 4)
+        self.assertEqual(executor._executors["comments"]._max_workers, 2)
+        self.assertEqual(executor._executors["link"]._max_workers, 1)
+        executor.shutdown()
+
+    def test_from_config_unknown_step(self):
+        with self.assertRaises(ValueError):
+            FollowUpExecutor.from_config("delete=4")
+
+    def test_submit_runs_steps_in_background(self):
+        executor = FollowUpExecutor({"assign": 2})
+        started = Event()
+        release = Event()
+
+        def step():
+            started.set()
+            release.wait(5)
+            return True
+
+        executor.submit("assign", "ISSUE-1", MagicMock(), step)
+        started.wait(5)
+        self.assertEqual(executor.report.completed, 0)
+
+        release.set()
+        report = executor.shutdown()
+
+        self.assertEqual(report.completed, 1)
+        self.assertEqual(report.failures, [])
+
+    def test_submit_collects_failures(self):
+        executor = FollowUpExecutor({})
+        ticket = MagicMock()
+        ticket.title = "title"
+
+        executor.submit("assign", "ISSUE-1", ticket, lambda: False)
+        executor.submit(
+            "link", "ISSUE-1", ticket, MagicMock(side_effect=ValueError("X"))
+        )
+        executor.submit("comments", "ISSUE-1", ticket, lambda: None)
+
+        report = executor.shutdown()
+
+        self.assertEqual(report.completed, 1)
+        self.assertCountEqual(
+            report.failures,
+            [
+                FollowUpFailure(
+                    step="assign",
+                    issue="ISSUE-1",
+                    ticket="title",
+                    error="step did not succeed",
+                ),
+                FollowUpFailure(
+                    step="link", issue="ISSUE-1", ticket="title", error="X"
+                ),
+            ],
+        )
+
+
+class TestFollowUpReport(TestCase):
+    @patch("clickup_to_jira.follow_up.logger")
+    def test_log(self, logger):
+        report = FollowUpReport(
+            completed=2,
+            failures=[
+                FollowUpFailure(
+                    step="assign", issue="ISSUE-1", ticket="title", error="X"
+                )
+            ],
+        )
+
+        report.log()
+
+        logger.info.assert_called_once_with(
+            "Completed 2 follow-up steps with 1 failures."
+        )
+        logger.warning.assert_called_once_with(
+            "Failed to assign ISSUE-1 created from title: X"
+        )
@@ -0,0 +1,94 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clickup_to_jira.markup import MarkupConverter
+
+
+class TestMarkupConverter(TestCase):
+    def setUp(self):
+        self.converter = MarkupConverter()
+
+    def test_convert_empty(self):
+        self.assertEqual(self.converter.convert(None), None)
+        self.assertEqual(self.converter.convert(""), "")
+
+    def test_convert_headings(self):
+        self.assertEqual(
+            self.converter.convert("# Title\n### Section ###\n## C# #\n# C#"),
+            "h1. Title\nh3. Section\nh2. C#\nh1. C#",
+        )
+
+    def test_convert_lists(self):
+        text = "- one\n  1. nested\n  2. nested\n- two\n\n* other"
+
+        self.assertEqual(
+            self.converter.convert(text),
+            "* one\n*# nested\n*# nested\n* two\n\n* other",
+        )
+
+    def test_convert_code_block(self):
+        text = "```python\n# not a heading\n**x** = [1]\n```\nafter"
+
+        self.assertEqual(
+            self.converter.convert(text),
+            "{code:python}\n# not a heading\n**x** = [1]\n{code}\nafter",
+        )
+
+    def test_convert_unclosed_code_block(self):
+        self.assertEqual(
+            self.converter.convert("```\ncode"), "{code}\ncode\n{code}"
+        )
+
+    def test_convert_table(self):
+        text = "| a | b |\n|---|:-:|\n| **1** | 2 |"
+
+        self.assertEqual(self.converter.convert(text), "||a||b||\n|*1*|2|")
+
+    def test_convert_quote_and_rule(self):
+        self.assertEqual(
+            self.converter.convert("> quoted\n---"), "bq. quoted\n----"
+        )
+
+    def test_convert_inline(self):
+        text = (
+            "**bold** *italic* _also_ __strong__ ~~gone~~ `a*b*c` "
+            "[link **text**](https://a.b) ![img](https://a.b/i.png) "
+            "<https://a.b>"
+        )
+
+        self.assertEqual(
+            self.converter.convert(text),
+            "*bold* _italic_ _also_ *strong* -gone- {{a*b*c}} "
+            "[link *text*|https://a.b] !https://a.b/i.png! [https://a.b]",
+        )
+
+    def test_convert_inline_keeps_plain_text(self):
+        text = "snake_case_name, 2 * 3 * 4 and user@mail.com"
+
+        self.assertEqual(self.converter.convert(text), text)
+
+    def test_convert_inline_escapes_special_characters(self):
+        self.assertEqual(
+            self.converter.convert("[WIP] {value}"), "\\[WIP] \\{value}"
+        )
+
+    def test_convert_mentions(self):
+        resolve_mention = MagicMock(side_effect={"john": "123"}.get)
+        converter = MarkupConverter(resolve_mention=resolve_mention)
+
+        self.assertEqual(
+            converter.convert("@john and @jane."),
+            "[~accountid:123] and @jane.",
+        )
+
+    def test_convert_large_whitespace_heading(self):
+        text = "#" + " " * 100000 + "x"
+
+        self.assertEqual(self.converter.convert(text), "h1. x")
+
+    def test_convert_large_unclosed_spans(self):
+        text = "[a ![b (c " * 30000
+
+        output = self.converter.convert(text)
+
+        self.assertEqual(output, text.replace("[", "\\["))
@@ -0,0 +1,126 @@
+import json
+import os
+import pickle
+import tempfile
+import urllib.request
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clickup_to_jira.metrics import (
+    Histogram,
+    MigrationMetrics,
+    get_body_size,
+    get_operation,
+)
+
+
+class TestGetOperation(TestCase):
+    def test_get_operation(self):
+        self.assertEqual(
+            get_operation("get", "https://api.clickup.com/api/v1/team/1/task"),
+            "GET team/{id}/task",
+        )
+        self.assertEqual(
+            get_operation(
+                "POST", "https://jira/rest/api/2/issue/PROJ-12/transitions"
+            ),
+            "POST issue/{id}/transitions",
+        )
+        self.assertEqual(
+            get_operation("GET", "https://jira/rest/api/2/search?jql=x"),
+            "GET search",
+        )
+
+
+class TestGetBodySize(TestCase):
+    def test_get_body_size(self):
+        self.assertEqual(get_body_size(None), 0)
+        self.assertEqual(get_body_size("é"), 2)
+        self.assertEqual(get_body_size(b"abc"), 3)
+        self.assertEqual(get_body_size(MagicMock(len=42)), 42)
+
+
+class TestHistogram(TestCase):
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        self.assertEqual(histogram.counts, [1, 2])
+        self.assertEqual(histogram.count, 3)
+        self.assertEqual(histogram.sum, 5.55)
+
+
+class TestMigrationMetrics(TestCase):
+    def setUp(self):
+        self.metrics = MigrationMetrics()
+        self.metrics.observe("jira", "GET search", 0.2, bytes_received=100)
+        self.metrics.observe("jira", "GET search", 0.4, error=True, retries=2)
+        self.metrics.observe_wait("jira", 1.5)
+        self.metrics.observe_wait("clickup", 0)
+
+    def test_to_dict(self):
+        report = self.metrics.to_dict()
+
+        self.assertEqual(list(report), ["jira"])
+        self.assertEqual(report["jira"]["rate_limit_wait_seconds"], 1.5)
+        search = report["jira"]["operations"]["GET search"]
+        self.assertEqual(search["calls"], 2)
+        self.assertEqual(search["errors"], 1)
+        self.assertEqual(search["retries"], 2)
+        self.assertEqual(search["bytes_received"], 100)
+        self.assertEqual(search["latency"]["buckets"]["0.25"], 1)
+        self.assertEqual(search["latency"]["buckets"]["0.5"], 2)
+
+    def test_to_prometheus(self):
+        output = self.metrics.to_prometheus()
+
+        labels = 'api="jira",operation="GET search"'
+        self.assertIn(f"migration_requests_total{{{labels}}} 2", output)
+        self.assertIn(f"migration_request_errors_total{{{labels}}} 1", output)
+        self.assertIn(
+            f'migration_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+            " 2",
+            output,
+        )
+        self.assertIn(
+            'migration_rate_limit_wait_seconds_total{api="jira"} 1.5', output
+        )
+
+    def test_merge_pickled_metrics(self):
+        metrics = MigrationMetrics()
+        metrics.merge(pickle.loads(pickle.dumps(self.metrics)))
+        metrics.merge(self.metrics)
+
+        report = metrics.to_dict()
+        self.assertEqual(report["jira"]["rate_limit_wait_seconds"], 3.0)
+        search = report["jira"]["operations"]["GET search"]
+        self.assertEqual(search["calls"], 4)
+        self.assertEqual(search["latency"]["buckets"]["0.5"], 4)
+        self.assertEqual(search["latency"]["count"], 4)
+
+    def test_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertLogs("clickup_to_jira.metrics", "INFO"):
+                self.metrics.report(directory)
+
+            with open(os.path.join(directory, "metrics.json")) as f:
+                self.assertEqual(json.load(f), self.metrics.to_dict())
+            with open(os.path.join(directory, "metrics.prom")) as f:
+                self.assertEqual(f.read(), self.metrics.to_prometheus())
+
+    def test_serve(self):
+        self.metrics.serve(0)
+        port = self.metrics._server.server_address[1]
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/metrics"
+            ) as response:
+                output = response.read().decode()
+        finally:
+            self.metrics.close()
+
+        self.assertEqual(output, self.metrics.to_prometheus())
+        self.assertIsNone(self.metrics._server)
@@ -0,0 +1,107 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, call
+
+from clickup_to_jira.pipeline import (
+    MigrationPipeline,
+    in_parent_order,
+    prefetch,
+)
+
+
+def get_task(task_id, parent=None):
+    task = MagicMock()
+    task.id = task_id
+    task.name = f"name {task_id}"
+    task.parent = parent
+    return task
+
+
+class TestPrefetch(TestCase):
+    def test_prefetch(self):
+        self.assertEqual(list(prefetch(range(10), size=2)), list(range(10)))
+
+    def test_prefetch_error(self):
+        def produce():
+            yield 1
+            raise ValueError("error")
+
+        items = prefetch(produce())
+
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(ValueError):
+            next(items)
+
+
+class TestInParentOrder(TestCase):
+    def test_in_parent_order(self):
+        subtask = get_task("3", parent="2")
+        task = get_task("2", parent="1")
+        root = get_task("1")
+        other = get_task("4")
+
+        output = list(in_parent_order([subtask, task, root, other]))
+
+        self.assertEqual(output, [root, task, subtask, other])
+        self.assertEqual(task.parent_id, "1")
+        self.assertEqual(task.parent, "name 1")
+        self.assertEqual(subtask.parent, "name 2")
+        self.assertEqual(root.parent, None)
+
+    def test_in_parent_order_missing_parent(self):
+        task = get_task("2", parent="1")
+        subtask = get_task("3", parent="2")
+
+        output = list(in_parent_order([subtask, task]))
+
+        self.assertEqual(output, [task, subtask])
+        self.assertEqual(task.parent_id, None)
+        self.assertEqual(task.parent, None)
+        self.assertEqual(subtask.parent_id, "2")
+
+    def test_in_parent_order_cycle(self):
+        task_1 = get_task("1", parent="2")
+        task_2 = get_task("2", parent="1")
+
+        output = list(in_parent_order([task_1, task_2]))
+
+        self.assertEqual(output, [task_1, task_2])
+        self.assertEqual(task_1.parent, None)
+        self.assertEqual(task_2.parent, "name 1")
+
+
+class TestMigrationPipeline(TestCase):
+    def test_run(self):
+        click_up = MagicMock()
+        converter = MagicMock()
+        jira = MagicMock()
+
+        space = MagicMock()
+        container = MagicMock()
+        task = get_task("2", parent="1")
+        root = get_task("1")
+        ticket = MagicMock()
+        root_ticket = MagicMock()
+        click_up.select_task_container.return_value = (space, container)
+        click_up.iter_tasks_from_click_up.return_value = iter([task, root])
+        click_up.iter_comments_to_tasks.side_effect = lambda tasks: tasks
+        converter.convert_ticket.side_effect = {
+            root: root_ticket,
+            task: ticket,
+        }.get
+        jira.create_jira_issue.side_effect = [MagicMock(), None]
+
+        output = MigrationPipeline(click_up, converter, jira).run()
+
+        self.assertEqual(output, 1)
+        jira.prepare_migration.assert_called_once_with(
+            click_up_labels=click_up.get_space_labels.return_value
+        )
+        click_up.get_space_labels.assert_called_once_with(space)
+        click_up.iter_tasks_from_click_up.assert_called_once_with(container)
+        jira.create_jira_issue.assert_has_calls(
+            [
+                call(root_ticket, jira.prepare_migration.return_value),
+                call(ticket, jira.prepare_migration.return_value),
+            ]
+        )
+        jira.finish_migration.assert_called_once_with()
@@ -0,0 +1,158 @@
+import json
+import os
+from collections import Counter
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clickup_to_jira.attachment import Attachment
+from clickup_to_jira.comment import Comment
+from clickup_to_jira.plan import MigrationPlan, MigrationPlanner
+from clickup_to_jira.ticket import Ticket
+
+
+def get_ticket(ticket_id, parent=None, **kwargs):
+    fields = dict(
+        id=ticket_id,
+        type="bug",
+        project="project",
+        title=ticket_id,
+        description="description",
+        subtasks=[],
+        status="to do",
+        creator="creator@mail.com",
+        assignee=None,
+        parent=parent.title if parent else None,
+        comments=[],
+        url="url",
+        parent_id=parent.id if parent else None,
+    )
+    fields.update(kwargs)
+    return Ticket(**fields)
+
+
+class TestMigrationPlanner(TestCase):
+    def setUp(self):
+        self.jira = MagicMock()
+        self.planner = MigrationPlanner(self.jira)
+        parent = get_ticket(
+            "1",
+            assignee="assignee@mail.com",
+            comments=[
+                Comment(id="1", text="text", commenter="a"),
+                Comment(id="2", text="", commenter="a"),
+            ],
+            attachments=[Attachment("1", "a.png", "https://a")],
+        )
+        self.tickets = [
+            parent,
+            get_ticket("2", parent=parent, status="done"),
+            get_ticket("3"),
+        ]
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_count(self):
+        calls = self.planner.count(self.tickets)
+
+        self.assertEqual(
+            calls,
+            {
+                "jql": 4,
+                "create": 3,
+                "users": 2,
+                "assign": 1,
+                "transition": 5,
+                "comments": 1,
+            },
+        )
+        self.jira.assert_not_called()
+
+    @patch.dict(
+        os.environ,
+        {
+            "JIRA_BULK_CREATE": "True",
+            "JIRA_SUMMARY_INDEX": "True",
+            "JIRACLICKUPLINK": "True",
+            "MIGRATION_ATTACHMENT_WORKERS": "2",
+        },
+        clear=True,
+    )
+    def test_count_configured(self):
+        calls = self.planner.count(self.tickets)
+
+        self.assertEqual(calls["jql"], 1)
+        self.assertEqual(calls["create"], 2)
+        self.assertEqual(calls["transition"], 7)
+        self.assertEqual(calls["attachments"], 1)
+        self.assertEqual(calls["link"], 3)
+
+    def test_count_skips_cached_users(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.json")
+            with open(path, "w") as f:
+                json.dump({"creator@mail.com": "1"}, f)
+
+            with patch.dict(os.environ, {"JIRA_USER_CACHE": path}):
+                calls = self.planner.count(self.tickets)
+
+        self.assertEqual(calls["users"], 1)
+
+    @patch.dict(os.environ, {"JIRA_REQUESTS_PER_MINUTE": "60"}, clear=True)
+    def test_estimate_duration_rate_limited(self):
+        duration = self.planner.estimate_duration(Counter(create=120), 0.1)
+
+        self.assertEqual(duration, 120)
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_estimate_duration_sequential(self):
+        duration = self.planner.estimate_duration(
+            Counter(create=100, comments=100), 1
+        )
+
+        self.assertEqual(duration, 200)
+
+    @patch.dict(
+        os.environ,
+        {"JIRA_FOLLOW_UP_WORKERS": "comments=4"},
+        clear=True,
+    )
+    def test_estimate_duration_follow_ups(self):
+        duration = self.planner.estimate_duration(
+            Counter(jql=50, create=50, comments=800), 1
+        )
+
+        self.assertEqual(duration, 200)
+
+    @patch.dict(
+        os.environ,
+        {"JIRA_ASYNC": "True", "JIRA_MAX_CONNECTIONS": "5"},
+        clear=True,
+    )
+    def test_estimate_duration_async(self):
+        duration = self.planner.estimate_duration(Counter(create=100), 1)
+
+        self.assertEqual(duration, 20)
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("clickup_to_jira.plan.monotonic")
+    def test_plan_samples_latency(self, monotonic):
+        monotonic.side_effect = [0, 0.2, 1, 1.4]
+        self.planner.samples = 2
+
+        plan = self.planner.plan(self.tickets)
+
+        self.assertEqual(self.jira.myself.call_count, 2)
+        self.assertAlmostEqual(plan.latency, 0.3)
+        self.assertTrue(plan.sampled)
+        self.assertEqual(plan.tickets, 3)
+        self.assertAlmostEqual(plan.duration, 16 * 0.3)
+
+    def test_log(self):
+        plan = MigrationPlan(tickets=1, duration=90)
+        plan.calls["create"] = 1
+
+        with self.assertLogs("clickup_to_jira.plan") as logs:
+            plan.log()
+
+        self.assertIn("about 1 JIRA calls", logs.output[0])
+        self.assertIn("0:01:30", logs.output[-1])
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from clickup_to_jira.profiling import PhaseProfiler
+from clickup_to_jira.task_graph import TaskGraph
+
+
+class Handler:
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def get_tasks_from_click_up(self):
+        self.select_task_container()
+        return ["task"]
+
+    def select_task_container(self):
+        return self.profiler._stack[:]
+
+    async def add_comments_to_tasks(self, tasks):
+        return self.profiler._stack[:]
+
+
+class TestPhaseProfiler(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.profiler = PhaseProfiler(self.directory.name).start()
+
+    def tearDown(self):
+        if self.profiler._originals:
+            self.profiler.close()
+        self.directory.cleanup()
+
+    def test_instrument(self):
+        handler = Handler(self.profiler)
+        self.profiler.instrument(handler)
+
+        self.assertEqual(handler.get_tasks_from_click_up(), ["task"])
+        self.assertEqual(handler.select_task_container(), ["hierarchy"])
+        self.assertEqual(self.profiler.calls, {"tasks": 1, "hierarchy": 2})
+
+        self.profiler.close()
+
+        self.assertNotIn("get_tasks_from_click_up", vars(handler))
+        self.assertEqual(handler.select_task_container(), [])
+
+    def test_instrument_coroutines(self):
+        handler = Handler(self.profiler)
+        self.profiler.instrument(handler)
+
+        stack = asyncio.run(handler.add_comments_to_tasks([]))
+
+        self.assertEqual(stack, ["comments"])
+
+    def test_start_profiles_parent_resolution(self):
+        TaskGraph([]).resolve_parents()
+
+        self.assertEqual(self.profiler.calls, {"parents": 1})
+
+        self.profiler.close()
+
+        self.assertNotIn("wrapper", TaskGraph.resolve_parents.__code__.co_name)
+
+    @patch("clickup_to_jira.profiling.perf_counter")
+    def test_phase_excludes_nested_phases(self, perf_counter):
+        perf_counter.side_effect = [0, 1, 2, 5, 6, 8]
+
+        with self.profiler.phase("tasks"):
+            with self.profiler.phase("hierarchy"):
+                pass
+
+        self.assertEqual(self.profiler.seconds, {"tasks": 3, "hierarchy": 3})
+
+    def test_phase_records_allocations(self):
+        with self.profiler.phase("conversion"):
+            data = [str(number) for number in range(10000)]
+
+        self.assertGreater(
+            sum(self.profiler.allocations["conversion"].values()), 0
+        )
+        self.assertTrue(
+            any(
+                __file__ in location
+                for location in self.profiler.allocations["conversion"]
+            )
+        )
+        del data
+
+    def test_close_saves_profiles_and_summary(self):
+        with self.profiler.phase("conversion"):
+            sorted(range(1000), reverse=True)
+
+        with self.assertLogs("clickup_to_jira.profiling", "INFO"):
+            self.profiler.close()
+
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.directory.name, "conversion.prof")
+            )
+        )
+        with open(os.path.join(self.directory.name, "summary.txt")) as f:
+            summary = f.read()
+        self.assertIn("=== conversion:", summary)
+        self.assertIn("Top allocators:", summary)
+        self.assertIn("Slowest functions:", summary)
@@ -0,0 +1,297 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, call, patch
+
+from requests import Session
+from requests.exceptions import (
+    ConnectionError as RequestsConnectionError,
+    ConnectTimeout,
+    ReadTimeout,
+)
+
+from clickup_to_jira.metrics import MigrationMetrics
+from clickup_to_jira.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimitedAdapter,
+    TokenBucket,
+    mount_rate_limiter,
+)
+from clickup_to_jira.retry import CircuitOpenError, RetryPolicy
+
+
+class TestTokenBucket(TestCase):
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_acquire_within_capacity(self, monotonic, sleep):
+        monotonic.return_value = 0
+        bucket = TokenBucket(rate=1, capacity=2)
+
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0)
+        sleep.assert_not_called()
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_acquire_reserves_consecutive_slots(self, monotonic, sleep):
+        monotonic.return_value = 0
+        bucket = TokenBucket(rate=2)
+
+        delays = [bucket.acquire() for _ in range(3)]
+
+        self.assertEqual(delays, [0, 0.5, 1.0])
+        self.assertEqual(sleep.call_count, 2)
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_acquire_refills_over_time(self, monotonic, sleep):
+        monotonic.side_effect = [0, 0, 10]
+        bucket = TokenBucket(rate=1, capacity=1)
+
+        bucket.acquire()
+        self.assertEqual(bucket.acquire(), 0)
+        sleep.assert_not_called()
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_reserve_does_not_block(self, monotonic, sleep):
+        monotonic.return_value = 0
+        bucket = TokenBucket(rate=2)
+
+        delays = [bucket.reserve() for _ in range(3)]
+
+        self.assertEqual(delays, [0.0, 0.5, 1.0])
+        sleep.assert_not_called()
+
+
+class TestAdaptiveRateLimiter(TestCase):
+    @patch("clickup_to_jira.rate_limit.time")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_update_follows_remaining_budget(self, monotonic, time):
+        monotonic.return_value = 0
+        time.return_value = 1000
+        limiter = AdaptiveRateLimiter(rate=1)
+        response = MagicMock()
+        response.headers = {
+            "X-RateLimit-Remaining": "500",
+            "X-RateLimit-Reset": "1050",
+        }
+
+        limiter.update(response)
+
+        self.assertEqual(limiter.rate, 10)
+
+    @patch("clickup_to_jira.rate_limit.time")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_update_follows_share_of_budget(self, monotonic, time):
+        monotonic.return_value = 0
+        time.return_value = 1000
+        limiter = AdaptiveRateLimiter(rate=2, share=0.25)
+        response = MagicMock()
+        response.headers = {
+            "X-RateLimit-Remaining": "500",
+            "X-RateLimit-Reset": "1050",
+        }
+
+        self.assertEqual(limiter.rate, 0.5)
+
+        limiter.update(response)
+
+        self.assertEqual(limiter.rate, 2.5)
+
+    @patch("clickup_to_jira.rate_limit.time")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_update_follows_iso_reset(self, monotonic, time):
+        monotonic.return_value = 0
+        time.return_value = 0
+        limiter = AdaptiveRateLimiter(rate=1)
+        response = MagicMock()
+        response.headers = {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "1970-01-01T00:00:30Z",
+        }
+
+        limiter.update(response)
+
+        self.assertEqual(limiter._paused_until, 30)
+
+    @patch("clickup_to_jira.rate_limit.time")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_update_ignores_malformed_headers(self, monotonic, time):
+        monotonic.return_value = 0
+        time.return_value = 1000
+        limiter = AdaptiveRateLimiter(rate=1)
+        for headers in (
+            {"X-RateLimit-Remaining": "n/a", "X-RateLimit-Reset": "1050"},
+            {"X-RateLimit-Remaining": "500", "X-RateLimit-Reset": "soon"},
+            {"X-RateLimit-Remaining": "nan", "X-RateLimit-Reset": "1050"},
+            {"Retry-After": "inf"},
+        ):
+            response = MagicMock()
+            response.headers = headers
+
+            limiter.update(response)
+
+        self.assertEqual(limiter.rate, 1)
+        self.assertEqual(limiter._paused_until, 0)
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.monotonic")
+    def test_retry_after_pauses_callers(self, monotonic, sleep):
+        monotonic.return_value = 0
+        limiter = AdaptiveRateLimiter(rate=1)
+        response = MagicMock()
+        response.headers = {"Retry-After": "7"}
+
+        limiter.update(response)
+        waited = limiter.acquire()
+
+        self.assertEqual(waited, 7)
+        sleep.assert_called_once_with(7)
+
+
+class TestRateLimitedAdapter(TestCase):
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_retries_rate_limited_requests(self, send):
+        limited = MagicMock(status_code=429)
+        ok = MagicMock(status_code=200)
+        send.side_effect = [limited, ok]
+        rate_limiter = MagicMock()
+        session = Session()
+        adapter = mount_rate_limiter(session, rate_limiter)
+        request = MagicMock(body=None, url="https://host/path")
+
+        output = adapter.send(request)
+
+        self.assertEqual(output, ok)
+        self.assertEqual(rate_limiter.acquire.call_count, 2)
+        rate_limiter.update.assert_has_calls([call(limited), call(ok)])
+        self.assertIs(session.get_adapter("https://host"), adapter)
+
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_does_not_retry_streamed_body(self, send):
+        limited = MagicMock(status_code=429)
+        send.return_value = limited
+        adapter = RateLimitedAdapter(MagicMock())
+        request = MagicMock(body=iter([b"chunk"]), url="https://host/path")
+
+        output = adapter.send(request)
+
+        self.assertEqual(output, limited)
+        send.assert_called_once()
+
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_records_metrics(self, send):
+        limited = MagicMock(status_code=429, headers={})
+        ok = MagicMock(status_code=200, headers={"Content-Length": "12"})
+        send.side_effect = [limited, ok]
+        rate_limiter = MagicMock()
+        rate_limiter.acquire.side_effect = [0.0, 2.0]
+        metrics = MigrationMetrics()
+        adapter = RateLimitedAdapter(rate_limiter, metrics=metrics, api="jira")
+        request = MagicMock(
+            method="POST",
+            url="https://host/rest/api/2/issue/PROJ-1/comment",
+            body=b'{"body": "x"}',
+        )
+
+        adapter.send(request)
+
+        operation = metrics.operations[("jira", "POST issue/{id}/comment")]
+        self.assertEqual(operation.calls, 1)
+        self.assertEqual(operation.errors, 0)
+        self.assertEqual(operation.retries, 1)
+        self.assertEqual(operation.bytes_sent, 13)
+        self.assertEqual(operation.bytes_received, 12)
+        self.assertEqual(metrics.rate_limit_wait, {"jira": 2.0})
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_records_failed_requests(self, send, sleep):
+        send.side_effect = RequestsConnectionError()
+        metrics = MigrationMetrics()
+        adapter = RateLimitedAdapter(
+            MagicMock(**{"acquire.return_value": 0.0}),
+            metrics=metrics,
+            api="clickup",
+        )
+        request = MagicMock(
+            method="GET", url="https://host/api/v2/task/9hz/comment", body=None
+        )
+
+        with self.assertRaises(RequestsConnectionError):
+            adapter.send(request)
+
+        operation = metrics.operations[("clickup", "GET task/{id}/comment")]
+        self.assertEqual(
+            (operation.calls, operation.errors, operation.retries), (1, 1, 5)
+        )
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_retries_server_errors_of_idempotent_requests(
+        self, send, sleep
+    ):
+        failed = MagicMock(status_code=503, headers={})
+        ok = MagicMock(status_code=200, headers={})
+        send.side_effect = [failed, ok]
+        adapter = RateLimitedAdapter(MagicMock())
+        request = MagicMock(method="GET", url="https://host/path", body=None)
+
+        output = adapter.send(request)
+
+        self.assertEqual(output, ok)
+        failed.close.assert_called_once_with()
+        sleep.assert_called_once()
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_does_not_retry_server_errors_of_posts(self, send, sleep):
+        failed = MagicMock(status_code=502, headers={})
+        send.return_value = failed
+        adapter = RateLimitedAdapter(MagicMock())
+        request = MagicMock(method="POST", url="https://host/path", body=b"")
+
+        output = adapter.send(request)
+
+        self.assertEqual(output, failed)
+        send.assert_called_once()
+        sleep.assert_not_called()
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_retries_unsent_posts(self, send, sleep):
+        ok = MagicMock(status_code=201, headers={})
+        send.side_effect = [ConnectTimeout(), ok]
+        adapter = RateLimitedAdapter(MagicMock())
+        request = MagicMock(method="POST", url="https://host/path", body=b"")
+
+        self.assertEqual(adapter.send(request), ok)
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_does_not_retry_lost_posts(self, send, sleep):
+        send.side_effect = ReadTimeout()
+        adapter = RateLimitedAdapter(MagicMock())
+        request = MagicMock(method="POST", url="https://host/path", body=b"")
+
+        with self.assertRaises(ReadTimeout):
+            adapter.send(request)
+
+        send.assert_called_once()
+
+    @patch("clickup_to_jira.rate_limit.sleep")
+    @patch("clickup_to_jira.rate_limit.HTTPAdapter.send")
+    def test_send_fails_fast_once_circuit_opens(self, send, sleep):
+        send.side_effect = RequestsConnectionError()
+        adapter = RateLimitedAdapter(
+            MagicMock(), retry_policy=RetryPolicy(failure_threshold=3)
+        )
+        request = MagicMock(method="GET", url="https://host/path", body=None)
+
+        with self.assertRaises(CircuitOpenError):
+            adapter.send(request)
+
+        self.assertEqual(send.call_count, 3)
+        self.assertIs(
+            adapter.get_circuit_breaker("https://host/other"),
+            adapter.circuit_breakers["host"],
+        )
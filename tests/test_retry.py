@@ -0,0 +1,196 @@
+import os
+from unittest import TestCase, skipIf
+from unittest.mock import MagicMock, patch
+
+from jira.exceptions import JIRAError
+from requests.exceptions import (
+    ConnectionError as RequestsConnectionError,
+    ConnectTimeout,
+    HTTPError,
+    ReadTimeout,
+)
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from clickup_to_jira.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    httpx,
+    is_transient,
+    is_unsent,
+)
+
+
+class TestRetryPolicy(TestCase):
+    @patch.dict(
+        os.environ,
+        {
+            "MIGRATION_RETRIES": "2",
+            "MIGRATION_RETRY_BACKOFF": "1.5",
+            "MIGRATION_RETRY_MAX_ELAPSED": "10",
+            "MIGRATION_CIRCUIT_BREAKER_THRESHOLD": "3",
+            "MIGRATION_CIRCUIT_BREAKER_COOLDOWN": "5",
+            "MIGRATION_RECOVERY_POLLS": "4",
+        },
+    )
+    def test_from_env(self):
+        policy = RetryPolicy.from_env()
+
+        self.assertEqual(policy.retries, 2)
+        self.assertEqual(policy.backoff, 1.5)
+        self.assertEqual(policy.max_elapsed, 10)
+        self.assertEqual(policy.failure_threshold, 3)
+        self.assertEqual(policy.recovery_polls, 4)
+        self.assertEqual(policy.cooldown, 5)
+
+    @patch("clickup_to_jira.retry.monotonic")
+    def test_can_retry(self, monotonic):
+        policy = RetryPolicy(retries=2, max_elapsed=10)
+        monotonic.return_value = 5
+
+        self.assertTrue(policy.can_retry(1, start=0))
+        self.assertFalse(policy.can_retry(2, start=0))
+        self.assertFalse(policy.can_retry(0, start=-5))
+
+    @patch("clickup_to_jira.retry.random.uniform")
+    def test_get_delay(self, uniform):
+        uniform.side_effect = lambda low, high: high
+        policy = RetryPolicy(backoff=0.5, max_backoff=3)
+
+        delays = [policy.get_delay(retries) for retries in range(5)]
+
+        self.assertEqual(delays, [0.5, 1, 2, 3, 3])
+        uniform.assert_called_with(0, 3)
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_run_retries_transient_errors(self, sleep):
+        function = MagicMock(
+            side_effect=[JIRAError(status_code=503), ReadTimeout(), "result"]
+        )
+
+        output = RetryPolicy().run(function, "argument", key="value")
+
+        self.assertEqual(output, "result")
+        self.assertEqual(function.call_count, 3)
+        function.assert_called_with("argument", key="value")
+        self.assertEqual(sleep.call_count, 2)
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_run_raises_other_errors(self, sleep):
+        function = MagicMock(side_effect=JIRAError(status_code=400))
+
+        with self.assertRaises(JIRAError):
+            RetryPolicy().run(function)
+
+        function.assert_called_once()
+        sleep.assert_not_called()
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_run_raises_once_retries_are_exhausted(self, sleep):
+        function = MagicMock(side_effect=JIRAError(status_code=502))
+
+        with self.assertRaises(JIRAError):
+            RetryPolicy(retries=2).run(function)
+
+        self.assertEqual(function.call_count, 3)
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_run_returns_recovered_outcome(self, sleep):
+        function = MagicMock(side_effect=JIRAError(status_code=504))
+        recover = MagicMock(return_value="issue")
+
+        output = RetryPolicy().run(function, recover=recover)
+
+        self.assertEqual(output, "issue")
+        function.assert_called_once()
+        recover.assert_called_once_with()
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_run_retries_when_nothing_is_recovered(self, sleep):
+        function = MagicMock(side_effect=[JIRAError(status_code=504), "issue"])
+        recover = MagicMock(return_value=None)
+
+        output = RetryPolicy().run(function, recover=recover)
+
+        self.assertEqual(output, "issue")
+        self.assertEqual(function.call_count, 2)
+        self.assertEqual(recover.call_count, 3)
+
+    @patch("clickup_to_jira.retry.sleep")
+    def test_run_polls_lagging_recovery(self, sleep):
+        function = MagicMock(side_effect=JIRAError(status_code=504))
+        recover = MagicMock(side_effect=[None, None, "issue"])
+
+        output = RetryPolicy(backoff=1, max_backoff=3).run(
+            function, recover=recover
+        )
+
+        self.assertEqual(output, "issue")
+        function.assert_called_once()
+        self.assertEqual(
+            [delay.args[0] for delay in sleep.call_args_list[1:]], [2, 3]
+        )
+
+
+class TestCircuitBreaker(TestCase):
+    @patch("clickup_to_jira.retry.monotonic")
+    def test_opens_after_consecutive_failures(self, monotonic):
+        monotonic.return_value = 0
+        breaker = CircuitBreaker("host", failure_threshold=2, cooldown=10)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    @patch("clickup_to_jira.retry.monotonic")
+    def test_probes_after_cooldown(self, monotonic):
+        monotonic.return_value = 0
+        breaker = CircuitBreaker("host", failure_threshold=1, cooldown=10)
+        breaker.record_failure()
+
+        monotonic.return_value = 11
+        breaker.before_request()
+        # Other requests fail fast while the probe is in flight
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        breaker.before_request()
+        self.assertEqual(breaker.failures, 0)
+
+
+class TestIsTransient(TestCase):
+    def test_is_transient(self):
+        response = MagicMock(status_code=502)
+
+        self.assertTrue(is_transient(JIRAError(status_code=429)))
+        self.assertTrue(is_transient(JIRAError(status_code=503)))
+        self.assertTrue(is_transient(RequestsConnectionError()))
+        self.assertTrue(is_transient(ReadTimeout()))
+        self.assertTrue(is_transient(HTTPError(response=response)))
+        self.assertFalse(is_transient(JIRAError(status_code=400)))
+        self.assertFalse(is_transient(CircuitOpenError()))
+        self.assertFalse(is_transient(KeyError()))
+
+    def test_is_unsent(self):
+        refused = RequestsConnectionError(
+            MaxRetryError(None, "url", NewConnectionError(None, "refused"))
+        )
+
+        self.assertTrue(is_unsent(ConnectTimeout()))
+        self.assertTrue(is_unsent(refused))
+        self.assertFalse(is_unsent(ReadTimeout()))
+        self.assertFalse(is_unsent(RequestsConnectionError("reset")))
+
+    @skipIf(httpx is None, "requires httpx")
+    def test_httpx_errors(self):
+        self.assertTrue(is_transient(httpx.ReadTimeout("timeout")))
+        self.assertTrue(is_transient(httpx.ConnectError("refused")))
+        self.assertTrue(is_unsent(httpx.ConnectError("refused")))
+        self.assertTrue(is_unsent(httpx.PoolTimeout("timeout")))
+        self.assertFalse(is_unsent(httpx.ReadTimeout("timeout")))
@@ -0,0 +1,153 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clickup_to_jira.config import MigrationConfig
+from clickup_to_jira.metrics import MigrationMetrics
+from clickup_to_jira.shards import (
+    Shard,
+    ShardResult,
+    TeamReport,
+    get_shards,
+    migrate_shard,
+    migrate_team,
+)
+
+
+def get_named(name, **kwargs):
+    item = MagicMock(**kwargs)
+    item.name = name
+    return item
+
+
+def get_config(**kwargs):
+    return MigrationConfig(team="team", jira_project="PROJ", **kwargs)
+
+
+class TestShards(TestCase):
+    def setUp(self):
+        self.click_up = MagicMock()
+        project = get_named(
+            "project", lists=[get_named("list 1"), get_named("list 2")]
+        )
+        other_project = get_named("other", lists=[get_named("list 3")])
+        space = get_named("space", projects=[project, other_project])
+        self.click_up.teams = [get_named("team", spaces=[space])]
+
+    def test_get_shards(self):
+        config = get_config(
+            jira_projects={"space/project/list 2": "LIST", "space": "SPACE"}
+        )
+
+        output = get_shards(self.click_up, config)
+
+        self.assertEqual(
+            output,
+            [
+                Shard("space", "project", "list 1", "SPACE"),
+                Shard("space", "project", "list 2", "LIST"),
+                Shard("space", "other", "list 3", "SPACE"),
+            ],
+        )
+
+    def test_get_shards_of_project(self):
+        output = get_shards(self.click_up, get_config(project="other"))
+
+        self.assertEqual(output, [Shard("space", "other", "list 3", "PROJ")])
+
+    @patch.dict(os.environ, {"CLICKUP_API_KEY": "key"})
+    @patch("clickup_to_jira.shards.ClickUpToJIRAConverter")
+    @patch("clickup_to_jira.shards.JIRAHandler")
+    @patch("clickup_to_jira.shards.ClickUpHandler")
+    def test_migrate_shard(self, click_up, jira, converter):
+        converter().convert.return_value = [MagicMock(), MagicMock()]
+        jira().create_jira_issues.return_value = [MagicMock(), None]
+
+        output = migrate_shard(
+            Shard("space", "project", "list", "LIST"), get_config(), 0.5, True
+        )
+
+        self.assertEqual(output.shard, "space/project/list")
+        self.assertEqual(output.tickets, 2)
+        self.assertEqual(output.created, 1)
+        self.assertEqual(output.error, None)
+        config = click_up.call_args.kwargs["config"]
+        self.assertEqual(
+            (config.space, config.project, config.list, config.jira_project),
+            ("space", "project", "list", "LIST"),
+        )
+        self.assertEqual(click_up.call_args.kwargs["rate_limit_share"], 0.5)
+        self.assertEqual(
+            click_up.call_args.kwargs["shard"], "space/project/list"
+        )
+        self.assertEqual(jira.call_args.kwargs["rate_limit_share"], 0.5)
+        self.assertIs(click_up.call_args.kwargs["metrics"], output.metrics)
+        self.assertIs(jira.call_args.kwargs["metrics"], output.metrics)
+
+    @patch("clickup_to_jira.shards.JIRAHandler")
+    @patch("clickup_to_jira.shards.ClickUpHandler")
+    def test_migrate_shard_error(self, click_up, jira):
+        click_up().get_click_up_tickets.side_effect = ValueError("error")
+
+        output = migrate_shard(
+            Shard("space", "project", "list", "LIST"), get_config()
+        )
+
+        self.assertEqual(output.error, "error")
+        jira().create_jira_issues.assert_not_called()
+        click_up().close.assert_called_once_with()
+
+    @patch("clickup_to_jira.shards.initialize_logging", MagicMock())
+    @patch("clickup_to_jira.shards.ProcessPoolExecutor", ThreadPoolExecutor)
+    @patch("clickup_to_jira.shards.migrate_shard")
+    def test_migrate_team(self, migrate):
+        def migrate_shard(shard, config, share, record_metrics):
+            metrics = MigrationMetrics()
+            metrics.observe("jira", "POST issue", 0.1)
+            return ShardResult(
+                shard=shard.name, tickets=2, created=2, metrics=metrics
+            )
+
+        migrate.side_effect = migrate_shard
+        config = get_config()
+        metrics = MigrationMetrics()
+
+        output = migrate_team(
+            self.click_up, config, workers=2, metrics=metrics
+        )
+
+        self.assertEqual(len(output.results), 3)
+        self.assertEqual(output.created, 6)
+        self.assertEqual(output.failures, [])
+        migrate.assert_any_call(
+            Shard("space", "other", "list 3", "PROJ"), config, 0.5, True
+        )
+        self.assertEqual(metrics.operations[("jira", "POST issue")].calls, 3)
+        self.click_up.close.assert_called_once_with()
+
+    @patch("clickup_to_jira.shards.initialize_logging", MagicMock())
+    @patch("clickup_to_jira.shards.ProcessPoolExecutor", ThreadPoolExecutor)
+    @patch("clickup_to_jira.shards.migrate_shard")
+    def test_migrate_team_with_fewer_shards_than_workers(self, migrate):
+        migrate.return_value = ShardResult(shard="shard")
+        config = get_config()
+
+        migrate_team(self.click_up, config, workers=8)
+
+        migrate.assert_any_call(
+            Shard("space", "other", "list 3", "PROJ"), config, 1 / 3, False
+        )
+
+    def test_team_report(self):
+        report = TeamReport(
+            [
+                ShardResult(shard="a", tickets=3, created=2),
+                ShardResult(shard="b", error="error"),
+            ]
+        )
+
+        self.assertEqual(report.tickets, 3)
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.failures, [report.results[1]])
+        report.log()
@@ -0,0 +1,145 @@
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from clickup_to_jira.snapshot import SnapshotCache, SnapshotMiss
+
+
+def put_shard_comments(directory, shard, count):
+    snapshot = SnapshotCache(directory, shard=shard)
+    for index in range(count):
+        snapshot.put("comments", f"{shard}-{index}", {"comments": [index]})
+    snapshot.close()
+
+
+class TestSnapshotCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.snapshot = SnapshotCache(self.directory.name)
+
+    def tearDown(self):
+        self.snapshot.close()
+        self.directory.cleanup()
+
+    def test_put(self):
+        self.assertIsNone(self.snapshot.get("tasks", "list"))
+
+        self.snapshot.put("tasks", "list", [{"id": "1"}])
+
+        self.assertEqual(self.snapshot.get("tasks", "list"), [{"id": "1"}])
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory.name, "tasks.jsonl.gz"))
+        )
+
+    def test_put_latest_wins_on_reload(self):
+        self.snapshot.put("comments", 1, {"comments": []})
+        self.snapshot.put("comments", 1, {"comments": [{"id": "1"}]})
+        self.snapshot.put("comments", 2, {"comments": []})
+        self.snapshot.close()
+
+        snapshot = SnapshotCache(self.directory.name)
+
+        self.assertEqual(
+            snapshot.get("comments", "1"), {"comments": [{"id": "1"}]}
+        )
+        self.assertEqual(snapshot.get("comments", 2), {"comments": []})
+
+    @patch("clickup_to_jira.snapshot.gzip.open", wraps=gzip.open)
+    def test_put_keeps_writer_open(self, gzip_open):
+        self.snapshot.put("comments", 1, {"comments": []})
+        self.snapshot.put("comments", 2, {"comments": []})
+        self.snapshot.close()
+
+        gzip_open.assert_called_once()
+        self.assertEqual(
+            SnapshotCache(self.directory.name).get("comments", 2),
+            {"comments": []},
+        )
+
+    def test_put_from_shard_processes(self):
+        shards = ["space/project/list 1", "space/project/list 2", "other"]
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            for future in [
+                executor.submit(
+                    put_shard_comments, self.directory.name, shard, 500
+                )
+                for shard in shards
+            ]:
+                future.result()
+
+        snapshot = SnapshotCache(self.directory.name)
+
+        for shard in shards:
+            for index in range(500):
+                self.assertEqual(
+                    snapshot.get("comments", f"{shard}-{index}"),
+                    {"comments": [index]},
+                )
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.directory.name, "comments.jsonl.gz")
+            )
+        )
+
+    @patch("clickup_to_jira.snapshot.time")
+    def test_get_latest_of_shards(self, time):
+        time.return_value = 1000
+        self.snapshot.put("comments", 1, {"comments": []})
+        self.snapshot.close()
+        shard = SnapshotCache(self.directory.name, shard="list")
+        time.return_value = 2000
+        shard.put("comments", 1, {"comments": [{"id": "1"}]})
+        shard.close()
+
+        snapshot = SnapshotCache(self.directory.name)
+
+        self.assertEqual(
+            snapshot.get("comments", 1), {"comments": [{"id": "1"}]}
+        )
+
+    def test_get_truncated(self):
+        self.snapshot.put("comments", 1, {"comments": []})
+        self.snapshot.close()
+        path = os.path.join(self.directory.name, "comments.jsonl.gz")
+        with gzip.open(path, "ab") as f:
+            f.write(b'{"key": "2", "fet')
+
+        snapshot = SnapshotCache(self.directory.name)
+
+        self.assertEqual(snapshot.get("comments", 1), {"comments": []})
+        self.assertIsNone(snapshot.get("comments", 2))
+
+    @patch("clickup_to_jira.snapshot.time")
+    def test_get_stale(self, time):
+        snapshot = SnapshotCache(self.directory.name, max_age=60)
+        time.return_value = 1000
+        snapshot.put("tasks", "list", [])
+
+        time.return_value = 1050
+        self.assertEqual(snapshot.get("tasks", "list"), [])
+        time.return_value = 1061
+        self.assertIsNone(snapshot.get("tasks", "list"))
+
+    @patch("clickup_to_jira.snapshot.time")
+    def test_get_updated(self, time):
+        time.return_value = 1000
+        self.snapshot.put("comments", 1, {"comments": []})
+
+        self.assertEqual(
+            self.snapshot.get("comments", 1, updated_at=999), {"comments": []}
+        )
+        self.assertIsNone(self.snapshot.get("comments", 1, updated_at=1001))
+
+    @patch("clickup_to_jira.snapshot.time")
+    def test_get_offline(self, time):
+        snapshot = SnapshotCache(self.directory.name, max_age=60, offline=True)
+        time.return_value = 1000
+        snapshot.put("tasks", "list", [])
+        time.return_value = 2000
+
+        self.assertEqual(snapshot.get("tasks", "list"), [])
+        with self.assertRaises(SnapshotMiss):
+            snapshot.get("tasks", "other")
@@ -0,0 +1,50 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from clickup_to_jira.state import MigrationState
+
+
+class TestMigrationState(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "state.db")
+        self.state = MigrationState(self.path)
+
+    def tearDown(self):
+        self.state.close()
+        self.directory.cleanup()
+
+    def test_record_issue(self):
+        self.assertEqual(self.state.get_issue_key("1"), None)
+
+        self.state.record_issue("1", "PROJ-1")
+
+        self.assertEqual(self.state.get_issue_key("1"), "PROJ-1")
+
+    def test_record_step(self):
+        self.state.record_step("1", "assign")
+        self.state.record_step("1", "assign")
+
+        self.assertEqual(self.state.is_done("1", "assign"), True)
+        self.assertEqual(self.state.is_done("1", "transition"), False)
+        self.assertEqual(self.state.is_done("2", "assign"), False)
+
+    def test_state_persists(self):
+        self.state.record_issue("1", "PROJ-1")
+        self.state.record_step("1", "comment:5")
+        self.state.close()
+
+        self.state = MigrationState(self.path)
+
+        self.assertEqual(self.state.get_issue_key("1"), "PROJ-1")
+        self.assertEqual(self.state.is_done("1", "comment:5"), True)
+
+    def test_set_watermark(self):
+        self.assertIsNone(self.state.get_watermark("list"))
+
+        self.state.set_watermark("list", 1000)
+        self.state.set_watermark("list", 2000)
+
+        self.assertEqual(self.state.get_watermark("list"), 2000)
+        self.assertIsNone(self.state.get_watermark("other"))
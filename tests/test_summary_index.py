@@ -0,0 +1,53 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from jira.client import ResultList
+
+from clickup_to_jira.summary_index import SummaryIndex
+
+
+def get_issue(summary):
+    issue = MagicMock()
+    issue.fields.summary = summary
+    return issue
+
+
+class TestSummaryIndex(TestCase):
+    def test_load(self):
+        issue_1 = get_issue("Story")
+        issue_2 = get_issue("Story")
+        issue_3 = get_issue("Bug")
+        jira = MagicMock()
+        jira.search_issues.side_effect = [
+            ResultList([issue_1, issue_2], _total=3),
+            ResultList([issue_3], _total=3),
+        ]
+
+        index = SummaryIndex("10000").load(jira, page_size=2)
+
+        self.assertEqual(index.get("Story"), [issue_1, issue_2])
+        self.assertEqual(index.get("Bug"), [issue_3])
+        self.assertEqual(index.get("Story I want"), [])
+        jira.search_issues.assert_called_with(
+            'project = "10000" ORDER BY created ASC',
+            startAt=2,
+            maxResults=2,
+            fields="summary,parent",
+        )
+
+    def test_load_empty_project(self):
+        jira = MagicMock()
+        jira.search_issues.return_value = ResultList([], _total=0)
+
+        index = SummaryIndex("10000").load(jira)
+
+        self.assertEqual(index.get("Story"), [])
+        jira.search_issues.assert_called_once()
+
+    def test_add(self):
+        issue = get_issue('A "quoted" story')
+        index = SummaryIndex("10000")
+
+        index.add(issue)
+
+        self.assertEqual(index.get('A "quoted" story'), [issue])
@@ -0,0 +1,133 @@
+import os
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clickup_to_jira.config import ConfigError
+from clickup_to_jira.handlers import ClickUpHandler
+from clickup_to_jira.state import MigrationState
+from clickup_to_jira.sync import DeltaSync
+from clickup_to_jira.ticket import Ticket
+
+
+def get_task(task_id, parent=None, updated=1):
+    task = MagicMock()
+    task.id = task_id
+    task.name = f"Task {task_id}"
+    task.parent = parent
+    task.date_updated = datetime(2022, 1, updated)
+    return task
+
+
+def convert_ticket(task):
+    return Ticket(
+        id=task.id,
+        type="",
+        project=None,
+        title=task.name,
+        description="description",
+        subtasks=[],
+        status="open",
+        creator="creator@mail.com",
+        assignee=None,
+        parent=task.parent,
+        comments=[],
+        url="url",
+        parent_id=task.parent_id,
+    )
+
+
+class TestDeltaSync(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "state.db")
+        self.container = MagicMock()
+        self.container.id = "list"
+        self.click_up = MagicMock()
+        self.click_up.select_task_container.return_value = (
+            MagicMock(),
+            self.container,
+        )
+        self.click_up.add_comments_to_tasks.side_effect = lambda tasks: tasks
+        self.click_up.get_updated_at = ClickUpHandler.get_updated_at
+        self.converter = MagicMock()
+        self.converter.convert.side_effect = lambda tasks: [
+            convert_ticket(task) for task in tasks
+        ]
+        self.jira = MagicMock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_sync(self):
+        with patch.dict(os.environ, {"MIGRATION_STATE_DB": self.path}):
+            return DeltaSync(self.click_up, self.converter, self.jira)
+
+    def test_run_without_state(self):
+        with patch.dict(os.environ, {"MIGRATION_STATE_DB": ""}):
+            sync = DeltaSync(self.click_up, self.converter, self.jira)
+
+        with self.assertRaises(ConfigError):
+            sync.run()
+
+    def test_run_moves_watermark(self):
+        self.click_up.get_updated_tasks.return_value = [
+            get_task("1", updated=3),
+            get_task("2", parent="1", updated=2),
+        ]
+
+        output = self.get_sync().run()
+
+        self.assertEqual(output, 2)
+        self.click_up.get_updated_tasks.assert_called_once_with(
+            self.container, None
+        )
+        tickets = self.jira.sync_jira_issues.call_args.args[0]
+        self.assertEqual(
+            [ticket.parent for ticket in tickets], [None, "Task 1"]
+        )
+        state = MigrationState(self.path)
+        self.assertEqual(state.get_watermark("list"), 1641168000000)
+        state.close()
+
+    def test_run_from_watermark(self):
+        state = MigrationState(self.path)
+        state.set_watermark("list", 1000)
+        state.close()
+        self.click_up.get_updated_tasks.return_value = []
+
+        output = self.get_sync().run()
+
+        self.assertEqual(output, 0)
+        self.click_up.get_updated_tasks.assert_called_once_with(
+            self.container, 1000
+        )
+        self.jira.sync_jira_issues.assert_not_called()
+
+    def test_run_keeps_watermark_on_failure(self):
+        self.click_up.get_updated_tasks.return_value = [get_task("1")]
+        self.jira.sync_jira_issues.side_effect = RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            self.get_sync().run()
+
+        state = MigrationState(self.path)
+        self.assertIsNone(state.get_watermark("list"))
+        state.close()
+
+    def test_run_attaches_migrated_parent(self):
+        state = MigrationState(self.path)
+        state.record_issue("1", "PROJ-1")
+        state.close()
+        self.click_up.get_updated_tasks.return_value = [
+            get_task("2", parent="1")
+        ]
+        self.jira.issue.return_value.fields.summary = "Task 1"
+
+        self.get_sync().run()
+
+        ticket = self.jira.sync_jira_issues.call_args.args[0][0]
+        self.assertEqual(ticket.parent, "Task 1")
+        self.assertEqual(ticket.parent_id, "1")
+        self.jira.issue.assert_called_once_with("PROJ-1", fields="summary")
@@ -0,0 +1,85 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clickup_to_jira.task_graph import TaskGraph
+
+
+def get_task(task_id, parent=None):
+    task = MagicMock(id=task_id)
+    task.parent = parent
+    task.name = f"Task {task_id}"
+    return task
+
+
+class TestTaskGraph(TestCase):
+    def setUp(self) -> None:
+        self.grandchild = get_task("4", parent="2")
+        self.child_1 = get_task("2", parent="1")
+        self.child_2 = get_task("3", parent="1")
+        self.root = get_task("1")
+        self.orphan = get_task("5", parent="missing")
+        self.graph = TaskGraph(
+            [
+                self.grandchild,
+                self.child_1,
+                self.child_2,
+                self.root,
+                self.orphan,
+            ]
+        )
+
+    def test_index(self):
+        self.assertEqual(self.graph.index["2"], self.child_1)
+        self.assertEqual(self.graph.roots, [self.root, self.orphan])
+        self.assertEqual(
+            self.graph.children["1"], [self.child_1, self.child_2]
+        )
+
+    def test_parent_of(self):
+        self.assertEqual(self.graph.parent_of(self.grandchild), self.child_1)
+        self.assertEqual(self.graph.parent_of(self.orphan), None)
+
+    def test_depth(self):
+        self.assertEqual(self.graph.depth(self.root), 0)
+        self.assertEqual(self.graph.depth(self.child_2), 1)
+        self.assertEqual(self.graph.depth(self.grandchild), 2)
+
+    def test_ordered(self):
+        self.assertEqual(
+            self.graph.ordered(),
+            [
+                self.root,
+                self.orphan,
+                self.child_1,
+                self.child_2,
+                self.grandchild,
+            ],
+        )
+
+    def test_ordered_with_cycle(self):
+        task_1 = get_task("1", parent="2")
+        task_2 = get_task("2", parent="1")
+        root = get_task("3")
+
+        graph = TaskGraph([task_1, task_2, root])
+
+        self.assertEqual(graph.ordered(), [root, task_1, task_2])
+        self.assertEqual(graph.depth(task_1), 0)
+
+    def test_resolve_parents(self):
+        self.graph.resolve_parents()
+
+        self.assertEqual(self.grandchild.parent, "Task 2")
+        self.assertEqual(self.grandchild.parent_id, "2")
+        self.assertEqual(self.orphan.parent, None)
+        self.assertEqual(self.orphan.parent_id, None)
+
+    def test_resolve_parents_twice(self):
+        self.graph.resolve_parents()
+        tasks = TaskGraph(self.graph.tasks).resolve_parents()
+
+        self.assertEqual(self.grandchild.parent, "Task 2")
+        self.assertEqual(self.grandchild.parent_id, "2")
+        self.assertEqual(self.child_1.parent, "Task 1")
+        self.assertEqual(self.orphan.parent, None)
+        self.assertEqual(len(tasks), 5)
@@ -0,0 +1,90 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clickup_to_jira.user_directory import UserDirectory
+
+
+class TestUserDirectory(TestCase):
+    def setUp(self) -> None:
+        self.jira = MagicMock()
+        self.directory = UserDirectory(self.jira)
+
+    def test_get_account_id_searches_once(self):
+        user = MagicMock()
+        user.accountId = "account"
+        self.jira.search_users.return_value = [user]
+
+        output = [
+            self.directory.get_account_id("user@mail.com") for _ in range(3)
+        ]
+
+        self.assertEqual(output, ["account"] * 3)
+        self.jira.search_users.assert_called_once_with(user="user@mail.com")
+
+    def test_get_account_id_caches_misses(self):
+        self.jira.search_users.return_value = []
+
+        output = [
+            self.directory.get_account_id("user@mail.com") for _ in range(3)
+        ]
+
+        self.assertEqual(output, [None] * 3)
+        self.jira.search_users.assert_called_once_with(user="user@mail.com")
+
+    def test_get_account_id_of_clickup_user(self):
+        user = MagicMock()
+        user.accountId = "account"
+        self.jira.search_users.return_value = [user]
+        clickup_user = MagicMock()
+        clickup_user.email = "user@mail.com"
+
+        output = self.directory.get_account_id(clickup_user)
+
+        self.assertEqual(output, "account")
+        self.jira.search_users.assert_called_once_with(user="user@mail.com")
+
+    def test_get_account_id_no_user(self):
+        self.assertEqual(self.directory.get_account_id(None), None)
+        self.jira.search_users.assert_not_called()
+
+    def test_preload(self):
+        self.jira._get_json.side_effect = [
+            [
+                {"accountId": "1", "emailAddress": "one@mail.com"},
+                {"accountId": "2"},
+            ],
+            [{"accountId": "3", "emailAddress": "three@mail.com"}],
+        ]
+
+        self.directory.preload(page_size=2)
+
+        self.assertEqual(self.directory.get_account_id("one@mail.com"), "1")
+        self.assertEqual(self.directory.get_account_id("three@mail.com"), "3")
+        self.jira.search_users.assert_not_called()
+        self.jira._get_json.assert_called_with(
+            "users/search", params={"startAt": 2, "maxResults": 2}
+        )
+
+    def test_save_and_load(self):
+        user = MagicMock()
+        user.accountId = "account"
+        self.jira.search_users.side_effect = [[user], []]
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.json")
+            user_directory = UserDirectory(self.jira, path)
+            user_directory.get_account_id("user@mail.com")
+            user_directory.get_account_id("missing@mail.com")
+            user_directory.save()
+
+            with open(path) as f:
+                self.assertEqual(json.load(f), {"user@mail.com": "account"})
+
+            loaded_directory = UserDirectory(self.jira, path)
+            self.assertEqual(
+                loaded_directory.get_account_id("user@mail.com"), "account"
+            )
+        self.assertEqual(self.jira.search_users.call_count, 2)
@@ -1,7 +1,9 @@
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
+from clickup_to_jira.config import ConfigError
 from clickup_to_jira.utils import (
+    get_item_by_name,
     get_item_from_user_input,
     get_with_to_specify_outcome,
 )
@@ -103,3 +105,20 @@ class TestUtils(TestCase):
 
         self.assertEqual(output, True)
         self.assertEqual(get_input.call_count, 2)
+
+    def test_get_item_by_name(self):
+        item_1 = MagicMock()
+        item_1.name = "Item 1"
+        item_2 = MagicMock()
+        item_2.name = "Item"
+
+        output = get_item_by_name("item", [item_1, item_2], "Item")
+
+        self.assertEqual(output, item_2)
+
+    def test_get_item_by_name_not_found(self):
+        item = MagicMock()
+        item.name = "Item 1"
+
+        with self.assertRaises(ConfigError):
+            get_item_by_name("item", [item], "Item")
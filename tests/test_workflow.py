@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from clickup_to_jira.workflow import Workflow
+
+
+class TestWorkflow(TestCase):
+    def setUp(self) -> None:
+        self.workflow = Workflow("To Do")
+        self.workflow.add_transitions(
+            "To Do",
+            [
+                {"id": "11", "to": {"name": "In Progress"}},
+                {"id": "12", "to": {"name": "Blocked"}},
+            ],
+        )
+        self.workflow.add_transitions(
+            "In Progress",
+            [
+                {"id": "21", "to": {"name": "In Review"}},
+                {"id": "22", "to": {"name": "To Do"}},
+            ],
+        )
+        self.workflow.add_transitions(
+            "In Review", [{"id": "31", "to": {"name": "Done"}}]
+        )
+
+    def test_is_explored(self):
+        self.assertEqual(self.workflow.is_explored("To Do"), True)
+        self.assertEqual(self.workflow.is_explored("Blocked"), False)
+
+    def test_statuses(self):
+        self.assertEqual(
+            self.workflow.statuses(),
+            ["Blocked", "Done", "In Progress", "In Review", "To Do"],
+        )
+
+    def test_shortest_path(self):
+        self.assertEqual(
+            self.workflow.shortest_path("To Do", "Done"),
+            [("11", "In Progress"), ("21", "In Review"), ("31", "Done")],
+        )
+        self.assertEqual(self.workflow.shortest_path("To Do", "To Do"), [])
+        self.assertEqual(self.workflow.shortest_path("Done", "To Do"), None)
+
+    def test_path_to_unexplored(self):
+        self.assertEqual(
+            self.workflow.path_to_unexplored("To Do"), [("12", "Blocked")]
+        )
+        self.assertEqual(
+            self.workflow.path_to_unexplored("In Review"), [("31", "Done")]
+        )
+
+        self.workflow.add_transitions("Blocked", [])
+        self.workflow.add_transitions("Done", [])
+
+        self.assertEqual(self.workflow.path_to_unexplored("To Do"), None)